@@ -0,0 +1,244 @@
+# Per-question analytics over KBC session journals (no Qt imports).
+#
+# Streams journal files (see journal.py) from any number of kiosks, one game
+# at a time, and aggregates per question: times shown, accuracy, answer
+# option spread, lifeline use, time to answer and how often it ended a game,
+# rolled up by difficulty to spot miscalibrated questions. Memory is bounded
+# by the number of distinct questions, not by the number of events.
+#
+#   python analytics.py logs/ --checkpoint stats.json --workers 8 --bank questions.db
+#
+# With --checkpoint, a later run only reads records appended since the last
+# one. Partial results from separate runs or machines combine with
+# Stats.merge (python analytics.py --merge a.json b.json --checkpoint all.json).
+
+from __future__ import annotations
+import os, json, argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bank import DIFFICULTIES, open_bank
+from engine import EV_GAME_START, EV_QUESTION, EV_ANSWER, EV_LIFELINE, EV_GAME_END
+from journal import Record, iter_records, read_epoch
+
+# Per-question counters, stored as one flat list of ints per question.
+FIELDS = ["shown", "answered", "correct", "opt_a", "opt_b", "opt_c", "opt_d",
+          "ll_5050", "ll_assist", "ll_extra", "ll_audience", "ended_game", "time_n", "time_sum_ms", "time_sq_ms"]
+TIME_BUCKETS = [1000, 2000, 4000, 8000, 15000, 30000, 60000]  # ms upper bounds; last bucket open
+FIELDS += [f"time_le_{b}" for b in TIME_BUCKETS] + ["time_gt_max"]
+F = {name: i for i, name in enumerate(FIELDS)}
+MIN_SAMPLES = 30  # answers needed before a question is judged
+
+class Stats:
+    def __init__(self):
+        self.questions: Dict[int, List[int]] = {}
+        self.difficulty: Dict[int, int] = {}
+        self.games = 0
+        self.events = 0
+
+    def _row(self, qid: int, diff: int) -> List[int]:
+        row = self.questions.get(qid)
+        if row is None:
+            row = self.questions[qid] = [0] * len(FIELDS)
+            self.difficulty[qid] = diff
+        return row
+
+    def add_game(self, game: List[Record]):
+        self.games += 1
+        self.events += len(game)
+        row = None
+        shown_at = 0
+        wrong_last = False
+        for kind, a, b, value, t in game:
+            if kind == EV_QUESTION:
+                row = self._row(value, b)
+                row[F["shown"]] += 1
+                shown_at = t
+                wrong_last = False
+            elif row is None:
+                continue
+            elif kind == EV_ANSWER:
+                row[F["answered"]] += 1
+                row[F["opt_a"] + b] += 1
+                row[F["correct"]] += value
+                wrong_last = not value
+                ms = max(0, t - shown_at)
+                row[F["time_n"]] += 1
+                row[F["time_sum_ms"]] += ms
+                row[F["time_sq_ms"]] += ms * ms
+                for i, bound in enumerate(TIME_BUCKETS):
+                    if ms <= bound:
+                        row[F["time_le_1000"] + i] += 1
+                        break
+                else:
+                    row[F["time_gt_max"]] += 1
+            elif kind == EV_LIFELINE:
+                row[F["ll_5050"] + b] += 1
+            elif kind == EV_GAME_END and not a and wrong_last:
+                row[F["ended_game"]] += 1
+
+    def merge(self, other: "Stats") -> "Stats":
+        for qid, row in other.questions.items():
+            mine = self._row(qid, other.difficulty[qid])
+            for i, v in enumerate(row):
+                mine[i] += v
+        self.games += other.games
+        self.events += other.events
+        return self
+
+    def by_difficulty(self) -> Dict[str, List[int]]:
+        out = {d: [0] * len(FIELDS) for d in DIFFICULTIES}
+        for qid, row in self.questions.items():
+            agg = out[DIFFICULTIES[self.difficulty[qid]]]
+            for i, v in enumerate(row):
+                agg[i] += v
+        return out
+
+    def to_json(self) -> dict:
+        return {"fields": FIELDS, "games": self.games, "events": self.events,
+                "questions": {str(q): [self.difficulty[q]] + row for q, row in self.questions.items()}}
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Stats":
+        fields = data["fields"]
+        if not set(fields) <= set(FIELDS):
+            raise ValueError("checkpoint was written with different fields")
+        # Older checkpoints lack counters added since (e.g. ll_audience): start those at 0
+        cols = None if fields == FIELDS else [F[name] for name in fields]
+        stats = cls()
+        stats.games, stats.events = data["games"], data["events"]
+        for q, row in data["questions"].items():
+            stats.difficulty[int(q)] = row[0]
+            if cols is None:
+                stats.questions[int(q)] = row[1:]
+            else:
+                full = stats.questions[int(q)] = [0] * len(FIELDS)
+                for i, v in zip(cols, row[1:]):
+                    full[i] = v
+        return stats
+
+def accuracy(row: List[int]) -> float:
+    return row[F["correct"]] / row[F["answered"]] if row[F["answered"]] else 0.0
+
+# ----------------------------- Streaming -----------------------------
+def process_file(args: Tuple[str, int]) -> Tuple[str, Stats, int]:
+    """Aggregate complete games from record ``offset`` on. Returns the
+    offset of the first unfinished game, where the next run resumes."""
+    path, offset = args
+    stats = Stats()
+    game: List[Record] = []
+    pos = resume = offset
+    for rec in iter_records(path, offset):
+        pos += 1
+        if rec[0] == EV_GAME_START:
+            if game:  # abandoned without GAME_END: count what was played
+                stats.add_game(game)
+            game = []
+            resume = pos - 1
+        game.append(rec)
+        if rec[0] == EV_GAME_END:
+            stats.add_game(game)
+            game = []
+            resume = pos
+    return path, stats, resume
+
+def journal_files(paths: Iterable[str]) -> List[str]:
+    out = []
+    for p in paths:
+        if os.path.isdir(p):
+            for root, _, files in os.walk(p):
+                out += [os.path.join(root, f) for f in sorted(files) if f.endswith(".kbcj")]
+        else:
+            out.append(p)
+    return out
+
+def file_key(path: str) -> str:
+    # A journal keeps its epoch when archived under a new name, so key on
+    # folder + epoch rather than on the file name.
+    return f"{os.path.dirname(os.path.abspath(path))}|{read_epoch(path)}"
+
+def run(paths: Iterable[str], checkpoint: Optional[dict] = None, workers: Optional[int] = None) -> dict:
+    checkpoint = checkpoint or {}
+    stats = Stats.from_json(checkpoint["stats"]) if "stats" in checkpoint else Stats()
+    offsets: Dict[str, int] = dict(checkpoint.get("offsets", {}))
+    jobs, keys = [], {}
+    for path in journal_files(paths):
+        key = file_key(path)
+        keys[path] = key
+        jobs.append((path, offsets.get(key, 0)))
+    if workers == 1:
+        results = map(process_file, jobs)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(process_file, jobs, chunksize=4)
+    for path, part, resume in results:
+        stats.merge(part)
+        offsets[keys[path]] = resume
+    if workers != 1:
+        pool.shutdown()
+    return {"offsets": offsets, "stats": stats.to_json()}
+
+# ----------------------------- Report -----------------------------
+def report(stats: Stats, bank=None, top: int = 10) -> str:
+    lines = [f"{stats.games:,} games, {stats.events:,} events, {len(stats.questions):,} questions"]
+    diff = stats.by_difficulty()
+    lines.append("difficulty    shown  answered  accuracy  avg time  5050/assist/extra/audience  ended")
+    for d in DIFFICULTIES:
+        row = diff[d]
+        avg = row[F["time_sum_ms"]] / row[F["time_n"]] / 1000 if row[F["time_n"]] else 0
+        lines.append(f"{d:<10}{row[F['shown']]:>9,}{row[F['answered']]:>10,}{accuracy(row):>10.1%}"
+                     f"{avg:>9.1f}s  {row[F['ll_5050']]:>5}/{row[F['ll_assist']]}/{row[F['ll_extra']]}/"
+                     f"{row[F['ll_audience']]:<12}"
+                     f"{row[F['ended_game']]:>7,}")
+    # A question is suspect when its accuracy looks like another pool's.
+    mean = {d: accuracy(diff[d]) for d in DIFFICULTIES}
+    suspects = []
+    for qid, row in stats.questions.items():
+        if row[F["answered"]] < MIN_SAMPLES:
+            continue
+        d = DIFFICULTIES[stats.difficulty[qid]]
+        acc = accuracy(row)
+        closest = min(DIFFICULTIES, key=lambda k: abs(mean[k] - acc))
+        if closest != d:
+            suspects.append((abs(acc - mean[d]), qid, d, closest, acc, row))
+    suspects.sort(reverse=True)
+    if suspects:
+        lines.append("possibly miscalibrated (labelled -> plays like):")
+    for _, qid, d, closest, acc, row in suspects[:top]:
+        spread = "/".join(str(row[F["opt_a"] + i]) for i in range(4))
+        text = f"  {bank.get(qid).q[:60]}" if bank is not None else ""
+        lines.append(f"  #{qid:<7} {d:>6} -> {closest:<6} acc {acc:6.1%}  A/B/C/D {spread}  "
+                     f"ended {row[F['ended_game']]}{text}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-question analytics over KBC session journals")
+    parser.add_argument("paths", nargs="*", help="journal files or folders of *.kbcj")
+    parser.add_argument("--checkpoint", metavar="JSON", help="resume from / save to this file")
+    parser.add_argument("--merge", nargs="+", metavar="JSON", help="merge partial checkpoints instead of reading journals")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--bank", metavar="PATH", help="question bank, to print question text")
+    args = parser.parse_args()
+
+    if args.merge:
+        stats, offsets = Stats(), {}
+        for path in args.merge:
+            with open(path) as f:
+                part = json.load(f)
+            stats.merge(Stats.from_json(part["stats"]))
+            offsets.update(part["offsets"])
+        result = {"offsets": offsets, "stats": stats.to_json()}
+    else:
+        if not args.paths:
+            parser.error("no journals given")
+        previous = None
+        if args.checkpoint and os.path.exists(args.checkpoint):
+            with open(args.checkpoint) as f:
+                previous = json.load(f)
+        result = run(args.paths, previous, args.workers)
+    if args.checkpoint:
+        tmp = args.checkpoint + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(result, f)
+        os.replace(tmp, args.checkpoint)
+    print(report(Stats.from_json(result["stats"]), open_bank(args.bank) if args.bank else None))
@@ -0,0 +1,289 @@
+# Retrieval-backed Computer Assist for KBC Tollywood Quiz (no Qt imports).
+#
+# Scores the four options of a question against a local corpus of Tollywood
+# facts (assets/facts.txt, one fact per line) with BM25. The index is built
+# once into a directory of .npy files:
+#
+#   terms.npy    sorted vocabulary (normalized as in ingest.normalize)
+#   ptr.npy      postings of term t are docs[ptr[t]:ptr[t+1]]
+#   docs.npy     fact numbers, grouped by term
+#   weights.npy  BM25 weight of the term in that fact (idf and length norm applied)
+#
+# and opened memory-mapped, so startup reads only the pages a query touches.
+# A query gathers the postings of the question and of every option in one
+# vectorized pass; an option scores by its best fact that also matches the
+# question. Relation words ("played", "role", "directed") are kept and
+# lightly stemmed, so a fact saying how the option relates to the film
+# outweighs one that merely names both. When no fact mentions any option,
+# or the best option does not clear the runner-up by MIN_MARGIN, suggest()
+# returns None and the engine falls back to the canned assist. No network,
+# no model files.
+#
+#   python assist.py build                  # index assets/facts.txt into assist-index/
+#   python assist.py ask "Who composed the music for 'RRR'?" Thaman "M. M. Keeravani" DSP Anirudh
+#   python assist.py bench --synthetic 200000
+
+from __future__ import annotations
+import sys, os, json, time, random, hashlib, argparse, tempfile
+from collections import Counter
+from functools import lru_cache
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from bank import QA, QUESTIONS
+from ingest import normalize
+
+FORMAT = 2
+K1, B = 1.2, 0.75             # BM25 term saturation and length normalization
+MAX_CONFIDENCE = 95           # percent; the computer is never certain
+MIN_MARGIN = 1.6              # best score over the runner-up needed to suggest anything
+CACHE_SIZE = 1024             # questions whose scores are kept
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "facts.txt")
+FILES = ("terms", "ptr", "docs", "weights")
+
+_SUFFIXES = ("ing", "ed", "s")
+
+def _stem(tok: str) -> str:
+    """played/plays/playing -> play, so questions and facts agree on the relation."""
+    for suffix in _SUFFIXES:
+        if tok.endswith(suffix) and len(tok) - len(suffix) >= 3:
+            return tok[:-len(suffix)]
+    return tok
+
+# Question words carry no evidence; stored normalized so they match tokens
+STOPWORDS = frozenset(_stem(normalize(w)) for w in (
+    "a an and as at by for from in is it its of on or the to was were with which who whom whose what when "
+    "where why how did does do movie film films movies character name named known "
+    "following among these this that has have had be been also called his her their they").split())
+
+def tokens(text: str) -> List[str]:
+    return [t for t in map(_stem, normalize(text).split()) if t not in STOPWORDS]
+
+def read_corpus(path: str) -> Iterator[str]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+def corpus_key(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+# ----------------------------- Building -----------------------------
+def build_index(facts: Sequence[str], out_dir: str, key: str = "") -> dict:
+    """Write the BM25 index of ``facts`` to ``out_dir``; returns its meta.
+
+    Each file is written aside and renamed into place, so processes that
+    have the old index mapped keep reading the old one."""
+    vocab: dict = {}
+    term_ids: List[int] = []
+    doc_ids: List[int] = []
+    tfs: List[int] = []
+    lengths = np.zeros(len(facts), dtype=np.float32)
+    for d, fact in enumerate(facts):
+        toks = tokens(fact)
+        lengths[d] = len(toks)
+        for tok, tf in Counter(toks).items():
+            term_ids.append(vocab.setdefault(tok, len(vocab)))
+            doc_ids.append(d)
+            tfs.append(tf)
+    n_docs = max(1, len(facts))
+    avgdl = float(lengths.mean()) if len(facts) else 1.0
+
+    # Renumber terms in sorted order so queries can binary-search the vocabulary
+    terms = np.array(sorted(vocab), dtype=str) if vocab else np.zeros(0, dtype="<U1")
+    remap = np.empty(len(vocab), dtype=np.int64)
+    remap[np.fromiter(vocab.values(), dtype=np.int64, count=len(vocab))] = \
+        np.searchsorted(terms, np.array(list(vocab), dtype=str))
+    t = remap[np.asarray(term_ids, dtype=np.int64)]
+    docs = np.asarray(doc_ids, dtype=np.int32)
+    tf = np.asarray(tfs, dtype=np.float32)
+    order = np.lexsort((docs, t))
+    t, docs, tf = t[order], docs[order], tf[order]
+
+    counts = np.bincount(t, minlength=len(terms))
+    ptr = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum(counts, out=ptr[1:])
+    df = counts.astype(np.float64)
+    idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+    norm = K1 * (1 - B + B * lengths[docs] / avgdl)
+    weights = (idf[t] * tf * (K1 + 1) / (tf + norm)).astype(np.float32)
+
+    os.makedirs(out_dir, exist_ok=True)
+    for name, arr in zip(FILES, (terms, ptr, docs, weights)):
+        _replace(os.path.join(out_dir, name + ".npy"), lambda f, a=arr: np.save(f, a))
+    meta = {"format": FORMAT, "docs": len(facts), "terms": len(terms), "postings": len(docs),
+            "avgdl": avgdl, "corpus": key}
+    _replace(os.path.join(out_dir, "meta.json"), lambda f: f.write(json.dumps(meta, indent=2).encode()))
+    return meta
+
+def _replace(path: str, write):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def index_size(index_dir: str) -> int:
+    return sum(os.path.getsize(os.path.join(index_dir, f)) for f in os.listdir(index_dir)
+               if f.endswith((".npy", ".json")))
+
+# ----------------------------- Querying -----------------------------
+class Assistant:
+    """Memory-mapped BM25 index over the fact corpus."""
+
+    def __init__(self, index_dir: str, cache_size: int = CACHE_SIZE):
+        with open(os.path.join(index_dir, "meta.json")) as f:
+            self.meta = json.load(f)
+        if self.meta.get("format") != FORMAT:
+            raise ValueError(f"{index_dir}: index format {self.meta.get('format')}, expected {FORMAT}")
+        self.terms, self.ptr, self.docs, self.weights = (
+            np.load(os.path.join(index_dir, name + ".npy"), mmap_mode="r") for name in FILES)
+        self.n_docs = self.meta["docs"]
+        # Options repeat across a session (and replay), so keep whole score rows
+        self.scores = lru_cache(maxsize=cache_size)(self._scores)
+
+    def _ids(self, text: str) -> np.ndarray:
+        toks = np.array(tokens(text), dtype=str)
+        if not len(toks) or not len(self.terms):
+            return np.zeros(0, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(self.terms, toks), len(self.terms) - 1)
+        return pos[self.terms[pos] == toks]
+
+    def _scores(self, q: str, options: Tuple[str, ...]) -> np.ndarray:
+        """Evidence per option: the best fact's question score times its
+        option score, so facts naming the option alone do not count."""
+        rows = [self._ids(q)] + [self._ids(o) for o in options]
+        row_of = np.repeat(np.arange(len(rows)), [len(r) for r in rows])
+        ids = np.concatenate(rows)
+        starts = np.asarray(self.ptr[ids])
+        lens = np.asarray(self.ptr[ids + 1]) - starts
+        total = int(lens.sum())
+        if total == 0:
+            return np.zeros(len(options))
+        # Flatten every posting slice into one index array (no Python loop over terms)
+        offsets = np.repeat(starts - np.cumsum(lens) + lens, lens) + np.arange(total)
+        cells = np.asarray(self.docs[offsets], dtype=np.int64) + np.repeat(row_of, lens) * self.n_docs
+        grid = np.bincount(cells, weights=self.weights[offsets], minlength=len(rows) * self.n_docs)
+        grid = grid.reshape(len(rows), self.n_docs)
+        # Average over each option's terms, so a two-word name does not
+        # outweigh a one-word one just by having more terms to match
+        opts = grid[1:] / np.maximum([len(r) for r in rows[1:]], 1)[:, None]
+        return (opts * grid[0]).max(axis=1)
+
+    def suggest(self, qa: QA, removed: Sequence[int] = ()) -> Optional[Tuple[int, int]]:
+        """(option, confidence %) from the corpus, or None if it has no
+        clear evidence for one open option."""
+        scores = self.scores(qa.q, tuple(qa.options)).copy()
+        scores[list(removed)] = 0.0
+        total = scores.sum()
+        runner_up, top = np.sort(scores)[-2:]
+        if total <= 0 or top < MIN_MARGIN * runner_up:
+            return None
+        best = int(scores.argmax())
+        return best, min(MAX_CONFIDENCE, int(round(100 * scores[best] / total)))
+
+def open_assistant(index_dir: str, corpus: str = DEFAULT_CORPUS) -> Optional[Assistant]:
+    """The index in ``index_dir``, rebuilt first if ``corpus`` changed;
+    None if there is no corpus to build from."""
+    try:
+        key = corpus_key(corpus)
+    except OSError:
+        key = None
+    meta_path = os.path.join(index_dir, "meta.json")
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        stale = key is not None and (meta.get("corpus") != key or meta.get("format") != FORMAT)
+    except (OSError, ValueError):
+        if key is None:
+            return None
+        stale = True
+    if stale:
+        build_index(list(read_corpus(corpus)), index_dir, key)
+    return Assistant(index_dir)
+
+# ----------------------------- Benchmark -----------------------------
+def synthetic_facts(n: int, seed: int = 1) -> List[str]:
+    """Filler facts shaped like the real ones, to time larger indexes."""
+    rng = random.Random(seed)
+    people = max(50, n // 20)
+    out = []
+    for i in range(n):
+        film, year = f"film{i}", rng.randrange(1940, 2025)
+        cast = " and ".join(f"actor{rng.randrange(people)}" for _ in range(rng.randint(1, 3)))
+        out.append(f"Film{i} ({year}) was directed by director{rng.randrange(people)} "
+                   f"and stars {cast}; music by composer{rng.randrange(people // 5)}.")
+    return out
+
+def bench(corpus: str, index_dir: str, synthetic: int, repeat: int) -> str:
+    facts = list(read_corpus(corpus)) + synthetic_facts(synthetic)
+    t0 = time.perf_counter()
+    meta = build_index(facts, index_dir)
+    t_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    assistant = Assistant(index_dir)
+    t_open = time.perf_counter() - t0
+
+    def timed(qas) -> List[float]:
+        out = []
+        for qa in qas:
+            t = time.perf_counter()
+            assistant.suggest(qa)
+            out.append((time.perf_counter() - t) * 1000)
+        return sorted(out)
+
+    cold: List[float] = []
+    for _ in range(repeat):
+        assistant.scores.cache_clear()
+        cold += timed(QUESTIONS)
+    cold.sort()
+    warm = timed(QUESTIONS * repeat)
+    pick = lambda s, q: s[min(len(s) - 1, int(len(s) * q))]
+    hints = [assistant.suggest(qa) for qa in QUESTIONS]
+    answered = [(h, qa) for h, qa in zip(hints, QUESTIONS) if h is not None]
+    right = sum(h[0] == qa.answer_idx for h, qa in answered)
+    return (f"{meta['docs']:,} facts, {meta['terms']:,} terms, {meta['postings']:,} postings\n"
+            f"  build  {t_build:8.2f} s   size {index_size(index_dir) / 2**20:.2f} MB   open {t_open * 1000:.2f} ms\n"
+            f"  query  miss p50 {pick(cold, 0.5):.3f} ms  p99 {pick(cold, 0.99):.3f} ms  max {cold[-1]:.3f} ms\n"
+            f"         hit  p50 {pick(warm, 0.5):.3f} ms  p99 {pick(warm, 0.99):.3f} ms\n"
+            f"  built-in bank: {len(answered)}/{len(QUESTIONS)} answered from the index, "
+            f"{right} of them right; the rest fall back to the canned assist")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fact-index Computer Assist")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="index a fact corpus")
+    b.add_argument("--corpus", default=DEFAULT_CORPUS)
+    b.add_argument("--index", default="assist-index", metavar="DIR")
+    a = sub.add_parser("ask", help="score four options against the index")
+    a.add_argument("question")
+    a.add_argument("options", nargs=4)
+    a.add_argument("--index", default="assist-index", metavar="DIR")
+    a.add_argument("--corpus", default=DEFAULT_CORPUS)
+    m = sub.add_parser("bench", help="time index build and queries")
+    m.add_argument("--corpus", default=DEFAULT_CORPUS)
+    m.add_argument("--index", default="bench-assist-index", metavar="DIR")
+    m.add_argument("--synthetic", type=int, default=0, help="extra generated facts, to time larger indexes")
+    m.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    if args.cmd == "build":
+        meta = build_index(list(read_corpus(args.corpus)), args.index, corpus_key(args.corpus))
+        print(f"indexed {meta['docs']:,} facts ({meta['terms']:,} terms) into {args.index}")
+    elif args.cmd == "ask":
+        assistant = open_assistant(args.index, args.corpus)
+        if assistant is None:
+            sys.exit(f"no index in {args.index} and no corpus at {args.corpus}; run 'python assist.py build'")
+        qa = QA(args.question, tuple(args.options), 0, "medium")
+        scores = assistant.scores(qa.q, qa.options)
+        for letter, option, s in zip("ABCD", qa.options, scores):
+            print(f"  {letter}  {option:<30}{s:10.2f}")
+        hint = assistant.suggest(qa)
+        print(f"suggests {'ABCD'[hint[0]]} (~{hint[1]}%)" if hint else "no evidence; canned assist would answer")
+    else:
+        print(bench(args.corpus, args.index, args.synthetic, args.repeat))
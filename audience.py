@@ -0,0 +1,186 @@
+# Ask-the-Audience polls for KBC Tollywood Quiz (needs NumPy, no Qt imports).
+#
+# A poll is a crowd of VOTERS people. Each voter knows the answer with the
+# player accuracy of the question's difficulty (simulate.DEFAULT_ACCURACY)
+# and otherwise guesses among the open options. Where session journals have
+# recorded real answers to the question (analytics.py), their spread over
+# A-D outweighs that prior as the answer count grows. Every show's crowd is
+# a little different: its vote shares are drawn from a Dirichlet around the
+# expected shares, then the votes from a multinomial. Both draws carry a
+# leading batch axis, so a whole bank is polled in one pass:
+#
+#   python audience.py poll "In which year was 'Mayabazar' released?" 1955 1957 1960 1962 --answer 1 --difficulty hard
+#   python audience.py batch --bank questions.db --analytics stats.json --out polls.npy
+#
+# A batch file is an (N, 4) uint8 array of percentages by question id; the
+# game maps it read-only (main.py --polls polls.npy) and skips simulation.
+# Beside it, polls.npy.json records the bank it was made for (size and a
+# hash of a sample of its questions), and load_polls refuses another bank.
+
+from __future__ import annotations
+import json, time, hashlib, argparse
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from bank import DIFFICULTIES, QA, QuestionBank, open_bank
+from simulate import DEFAULT_ACCURACY
+
+VOTERS = 10_000
+PRIOR_VOTES = 30      # recorded answers that count as much as the difficulty prior
+CONCENTRATION = 60.0  # show-to-show spread of a crowd's shares; lower is noisier
+BATCH = 1 << 16       # questions per draw in batch mode
+HASH_SAMPLE = 4096    # questions hashed to tie a batch file to its bank
+
+KNOW = np.array([DEFAULT_ACCURACY[d] for d in DIFFICULTIES])
+
+# ----------------------------- Model -----------------------------
+def expected_shares(difficulty: np.ndarray, answer: np.ndarray, open_mask: np.ndarray,
+                    counts: Optional[np.ndarray] = None) -> np.ndarray:
+    """(B, 4) expected vote shares. ``difficulty`` and ``answer`` are (B,)
+    indices, ``open_mask`` (B, 4) booleans, ``counts`` (B, 4) recorded
+    answers per option (zeros where nothing was recorded)."""
+    open_f = open_mask.astype(np.float64)
+    guess = open_f / open_f.sum(axis=1, keepdims=True)
+    know = KNOW[difficulty][:, None]
+    shares = (1 - know) * guess
+    shares[np.arange(len(answer)), answer] += know[:, 0]
+    if counts is not None:
+        counts = counts * open_f
+        shares = (shares * PRIOR_VOTES + counts) / (PRIOR_VOTES + counts.sum(axis=1, keepdims=True))
+    return shares
+
+def simulate(shares: np.ndarray, rng: np.random.Generator, voters: int = VOTERS) -> np.ndarray:
+    """(B, 4) vote counts: one Dirichlet draw per crowd (via gammas, which
+    batch where rng.dirichlet does not), then one multinomial per crowd."""
+    mood = rng.standard_gamma(shares * CONCENTRATION)
+    total = mood.sum(axis=1, keepdims=True)
+    mood = np.divide(mood, total, out=shares.copy(), where=total > 0)
+    return rng.multinomial(voters, mood)
+
+def percentages(votes: np.ndarray) -> np.ndarray:
+    """(B, 4) whole percentages summing to 100 (largest remainder)."""
+    exact = votes * 100.0 / np.maximum(votes.sum(axis=1, keepdims=True), 1)
+    pct = np.floor(exact).astype(np.int64)
+    short = 100 - pct.sum(axis=1, keepdims=True)
+    rank = np.argsort(np.argsort(pct - exact, axis=1, kind="stable"), axis=1)  # 0 = largest remainder
+    return pct + (rank < short) * (votes.sum(axis=1, keepdims=True) > 0)
+
+def renormalize(pct: np.ndarray, open_mask: np.ndarray) -> np.ndarray:
+    """A precomputed poll with the options 50-50 removed taken out; all
+    zeros where nobody voted for any option still open."""
+    return percentages(pct * open_mask)
+
+# ----------------------------- Audience -----------------------------
+def load_answers(checkpoint: str) -> Dict[int, List[int]]:
+    """Recorded A-D answer counts per question id from an analytics.py checkpoint."""
+    from analytics import F, Stats
+    with open(checkpoint) as f:
+        stats = Stats.from_json(json.load(f)["stats"])
+    a = F["opt_a"]
+    return {qid: row[a:a + 4] for qid, row in stats.questions.items() if any(row[a:a + 4])}
+
+class Audience:
+    """Polls the studio audience for one question at a time, from a
+    precomputed batch file when one covers the question."""
+
+    def __init__(self, seed: Optional[int] = None, answers: Optional[Dict[int, Sequence[int]]] = None,
+                 polls: Optional[np.ndarray] = None, voters: int = VOTERS):
+        self.rng = np.random.default_rng(seed)
+        self.answers = answers or {}
+        self.polls = polls
+        self.voters = voters
+
+    def poll(self, qa: QA, removed: Sequence[int] = ()) -> List[int]:
+        """Percent of the audience voting for each option A-D."""
+        open_mask = np.ones((1, 4), dtype=bool)
+        open_mask[0, list(removed)] = False
+        if self.polls is not None and 0 <= qa.qid < len(self.polls):
+            pct = renormalize(np.asarray(self.polls[qa.qid:qa.qid + 1], dtype=np.int64), open_mask)[0]
+            if pct.any():
+                return pct.tolist()
+            # The stored crowd all picked removed options; ask a live one
+        counts = self.answers.get(qa.qid)
+        shares = expected_shares(np.array([DIFFICULTIES.index(qa.difficulty)]), np.array([qa.answer_idx]),
+                                 open_mask, None if counts is None else np.array([counts], dtype=np.float64))
+        return percentages(simulate(shares, self.rng, self.voters))[0].tolist()
+
+# ----------------------------- Batch -----------------------------
+def bank_hash(bank: QuestionBank) -> str:
+    """Hash of up to HASH_SAMPLE evenly spaced questions (text, answer and
+    difficulty), cheap enough to check on every start even for big banks."""
+    h = hashlib.blake2b(digest_size=16)
+    for qid in range(0, len(bank), max(1, len(bank) // HASH_SAMPLE)):
+        qa = bank.get(qid)
+        h.update(json.dumps([qid, qa.q, qa.answer_idx, qa.difficulty]).encode())
+    return h.hexdigest()
+
+def save_polls(path: str, polls: np.ndarray, bank: QuestionBank):
+    if not path.endswith(".npy"):
+        path += ".npy"  # as np.save would
+    np.save(path, polls)
+    with open(path + ".json", "w") as f:
+        json.dump({"questions": len(bank), "bank": bank_hash(bank)}, f)
+
+def load_polls(path: str, bank: QuestionBank) -> np.ndarray:
+    """The batch file at ``path``, mapped read-only; ValueError if it was
+    made for another bank."""
+    try:
+        with open(path + ".json") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        raise ValueError(f"{path}: no {path}.json; rerun 'python audience.py batch' for this bank") from None
+    if meta.get("questions") != len(bank) or meta.get("bank") != bank_hash(bank):
+        raise ValueError(f"{path}: made for another question bank "
+                         f"({meta.get('questions')} questions, this one has {len(bank)})")
+    polls = np.load(path, mmap_mode="r")
+    if polls.shape != (len(bank), 4):
+        raise ValueError(f"{path}: shape {polls.shape}, expected ({len(bank)}, 4)")
+    return polls
+
+def poll_bank(bank: QuestionBank, answers: Optional[Dict[int, Sequence[int]]] = None,
+              seed: Optional[int] = None, voters: int = VOTERS) -> np.ndarray:
+    """(len(bank), 4) uint8 percentages, one poll per question id."""
+    rng = np.random.default_rng(seed)
+    answers = answers or {}
+    out = np.zeros((len(bank), 4), dtype=np.uint8)
+    for start in range(0, len(bank), BATCH):
+        qas = [bank.get(qid) for qid in range(start, min(len(bank), start + BATCH))]
+        difficulty = np.array([DIFFICULTIES.index(qa.difficulty) for qa in qas])
+        answer = np.array([qa.answer_idx for qa in qas])
+        counts = np.zeros((len(qas), 4))
+        for i, qa in enumerate(qas):
+            if qa.qid in answers:
+                counts[i] = answers[qa.qid]
+        shares = expected_shares(difficulty, answer, np.ones((len(qas), 4), dtype=bool), counts)
+        out[start:start + len(qas)] = percentages(simulate(shares, rng, voters))
+    return out
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ask-the-Audience crowd simulator")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("poll", help="poll the audience on one question")
+    p.add_argument("question")
+    p.add_argument("options", nargs=4)
+    p.add_argument("--answer", type=int, required=True, help="index of the right option (0-3)")
+    p.add_argument("--difficulty", choices=DIFFICULTIES, default="medium")
+    p.add_argument("--seed", type=int)
+    b = sub.add_parser("batch", help="precompute a poll for every question of a bank")
+    b.add_argument("--bank", metavar="PATH", help="question bank (default: built-in)")
+    b.add_argument("--analytics", metavar="JSON", help="analytics.py checkpoint with recorded answers")
+    b.add_argument("--out", default="polls.npy")
+    b.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    if args.cmd == "poll":
+        qa = QA(args.question, tuple(args.options), args.answer, args.difficulty)
+        for letter, option, pct in zip("ABCD", qa.options, Audience(args.seed).poll(qa)):
+            print(f"  {letter}  {option:<30}{pct:>4}%  {'#' * (pct // 2)}")
+    else:
+        bank = open_bank(args.bank)
+        answers = load_answers(args.analytics) if args.analytics else None
+        t0 = time.perf_counter()
+        polls = poll_bank(bank, answers, args.seed)
+        dt = time.perf_counter() - t0
+        save_polls(args.out, polls, bank)
+        print(f"polled {len(polls):,} questions x {VOTERS:,} voters in {dt:.2f} s "
+              f"({len(answers or {}):,} with recorded answers) -> {args.out}")
@@ -0,0 +1,102 @@
+# Audio for KBC Tollywood Quiz: gapless BGM loop and pooled SFX voices.
+#
+# Importing this module pulls in QtMultimedia, so KBCWindow only imports it
+# after the first frame is painted. Raises ImportError when the multimedia
+# backend is missing; the window then stays silent.
+
+from __future__ import annotations
+import os, time
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import QObject, QUrl
+from PyQt6.QtMultimedia import QAudioOutput, QMediaPlayer, QSoundEffect
+
+SFX_VOICES = 3  # concurrent plays per effect before the oldest is reused
+
+class VoicePool(QObject):
+    """Several QSoundEffects preloaded with the same sample.
+
+    Rapid triggers (keyboard A-D) get a free voice instead of restarting the
+    one already playing. Trigger-to-playing latency is sampled per play.
+    """
+    def __init__(self, path: str, voices: int = SFX_VOICES, volume: float = 0.8, parent=None):
+        super().__init__(parent)
+        url = QUrl.fromLocalFile(path)
+        self.voices: List[QSoundEffect] = []
+        self._triggered: List[Optional[int]] = []
+        self.latencies_ms: List[float] = []
+        self._next = 0
+        for i in range(voices):
+            fx = QSoundEffect(self)
+            fx.setSource(url)
+            fx.setVolume(volume)
+            fx.playingChanged.connect(lambda i=i: self._on_playing(i))
+            self.voices.append(fx)
+            self._triggered.append(None)
+
+    def play(self):
+        n = len(self.voices)
+        for k in range(n):
+            i = (self._next + k) % n
+            if not self.voices[i].isPlaying():
+                break
+        else:
+            i = self._next  # all busy: steal the oldest
+            self.voices[i].stop()
+        self._next = (i + 1) % n
+        self._triggered[i] = time.perf_counter_ns()
+        self.voices[i].play()
+
+    def _on_playing(self, i: int):
+        t0 = self._triggered[i]
+        if t0 is not None and self.voices[i].isPlaying():
+            self.latencies_ms.append((time.perf_counter_ns() - t0) / 1e6)
+            del self.latencies_ms[:-256]  # keep a recent window
+            self._triggered[i] = None
+
+class AudioEngine(QObject):
+    def __init__(self, assets_dir: str, parent=None):
+        super().__init__(parent)
+        self.bgm: Optional[QMediaPlayer] = None
+        self.sfx: Dict[str, VoicePool] = {}
+        bgm = os.path.join(assets_dir, "bgm.mp3")
+        if os.path.exists(bgm):
+            self.audio_out = QAudioOutput(self)
+            self.audio_out.setVolume(0.35)
+            self.bgm = QMediaPlayer(self)
+            self.bgm.setAudioOutput(self.audio_out)
+            self.bgm.setSource(QUrl.fromLocalFile(bgm))
+            if hasattr(self.bgm, "setLoops"):  # Qt >= 6.4 loops in the backend, gaplessly
+                self.bgm.setLoops(QMediaPlayer.Loops.Infinite)
+            else:
+                self.bgm.mediaStatusChanged.connect(self._rewind_bgm)
+        for name in ("correct", "wrong"):
+            path = os.path.join(assets_dir, f"{name}.wav")
+            if os.path.exists(path):
+                self.sfx[name] = VoicePool(path, parent=self)
+
+    def start_bgm(self):
+        if self.bgm is not None:
+            self.bgm.play()
+
+    def _rewind_bgm(self, status):
+        if status == QMediaPlayer.MediaStatus.EndOfMedia:
+            self.bgm.setPosition(0)
+            self.bgm.play()
+
+    def play(self, name: str):
+        pool = self.sfx.get(name)
+        if pool is not None:
+            pool.play()
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """Trigger-to-playing latency per effect: samples, mean, p50, p95,
+        p99, max (ms), as reported by benchmarks/bench_ui.py --audio."""
+        stats = {}
+        for name, pool in self.sfx.items():
+            lat = sorted(pool.latencies_ms)
+            if lat:
+                pick = lambda q: lat[min(len(lat) - 1, int(len(lat) * q))]
+                stats[name] = {"n": len(lat), "mean": sum(lat) / len(lat), "p50": pick(0.5),
+                               "p95": pick(0.95), "p99": pick(0.99), "max": lat[-1]}
+        return stats
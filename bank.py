@@ -0,0 +1,266 @@
+# Question banks for KBC Tollywood Quiz (no Qt imports).
+#
+# The built-in QUESTIONS list is the default bank. Larger banks live in an
+# SQLite file indexed by id and by (difficulty, position), so opening one
+# costs the same whatever its size and rows are read only when asked for.
+#
+# Build a bank:
+#   python bank.py export questions.db              (built-in questions)
+#   python bank.py build questions.jsonl questions.db
+#
+# JSON lines format, one question per line:
+#   {"q": "...", "options": ["A", "B", "C", "D"], "answer_idx": 1, "difficulty": "easy"}
+
+from __future__ import annotations
+import sys, os, json, zlib, sqlite3
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+# ----------------------------- Data -----------------------------
+@dataclass(slots=True)
+class QA:
+    q: str
+    options: Tuple[str, str, str, str]
+    answer_idx: int  # 0..3
+    difficulty: str  # "easy" | "medium" | "hard"
+    qid: int = -1    # stable id within its bank
+
+# 20 questions: 8 easy, 7 medium, 5 hard
+QUESTIONS: List[QA] = [
+    # Easy (1-8)
+    QA("In which movie did Mahesh Babu play the character 'Pokiri'?",
+       ("Athadu", "Pokiri", "Okkadu", "Businessman"), 1, "easy"),
+    QA("Which actor is known as 'Megastar' in Tollywood?",
+       ("Chiranjeevi", "Balakrishna", "Nagarjuna", "Pawan Kalyan"), 0, "easy"),
+    QA("The song 'Butta Bomma' is from which movie?",
+       ("Ala Vaikunthapurramuloo", "DJ", "Sarrainodu", "Race Gurram"), 0, "easy"),
+    QA("Who played the role of Baahubali in the Baahubali series?",
+       ("Rana Daggubati", "Prabhas", "NTR Jr.", "Allu Arjun"), 1, "easy"),
+    QA("In 'Arjun Reddy', who played the lead role?",
+       ("Vijay Deverakonda", "Nani", "Sharwanand", "Varun Tej"), 0, "easy"),
+    QA("'Pushpa: The Rise' stars which actor as Pushpa Raj?",
+       ("Mahesh Babu", "Allu Arjun", "Ram Charan", "NTR Jr."), 1, "easy"),
+    QA("The movie 'Magadheera' was directed by?",
+       ("S. S. Rajamouli", "Trivikram", "Puri Jagannadh", "Sukumar"), 0, "easy"),
+    QA("Which movie popularly uses the chant 'Jai Balayya'?",
+       ("Simha", "Legend", "Akhanda", "Gautamiputra Satakarni"), 2, "easy"),
+
+    # Medium (9-15)
+    QA("In 'Srimanthudu', Mahesh Babu's character name is?",
+       ("Harsha", "Ramesh", "Gopi", "Surya"), 0, "medium"),
+    QA("Which Tollywood movie was a major sleeper hit and praised in 2023 for its rural drama?",
+       ("RRR", "Dasara", "Balagam", "Karthikeya 2"), 2, "medium"),
+    QA("'Eega' features which actor as the main villain?",
+        ("Kichcha Sudeep", "Jagapathi Babu", "Sonu Sood", "Suman"), 0, "medium"),
+    QA("Who composed the music for 'RRR'?",
+       ("Devi Sri Prasad", "M. M. Keeravani", "Thaman S", "Anirudh"), 1, "medium"),
+    QA("In 'Temper', which actor played the antagonist Daya's foil?",
+       ("Prakash Raj", "Sonu Sood", "Posani", "Ajay"), 1, "medium"),
+    QA("'Legend' is a film of which actor?",
+       ("Chiranjeevi", "Nandamuri Balakrishna", "Venkatesh", "Ravi Teja"), 1, "medium"),
+    QA("In 'Sye', students clash using which sport?",
+       ("Cricket", "Football", "Rugby", "Kabaddi"), 2, "medium"),
+
+    # Hard (16-20)
+    QA("In which year was the classic 'Mayabazar' released?",
+       ("1955", "1957", "1960", "1962"), 1, "hard"),
+    QA("Who portrayed 'Kattappa' in Baahubali?",
+       ("Sathyaraj", "Nassar", "Prabhakar", "Subbaraju"), 0, "hard"),
+    QA("Which was among the earliest Telugu films to win National Award (Feature Film category) recognition?",
+       ("Shankarabharanam", "Maa Bhoomi", "Pathala Bhairavi", "Bhuvan Shome"), 1, "hard"),
+    QA("Who directed the classic 'Sankarabharanam'?",
+       ("K. Viswanath", "Bapu", "K. Raghavendra Rao", "Dasari Narayana Rao"), 0, "hard"),
+    QA("Which movie features the Brahmanandam character 'Galeejam'?",
+       ("Ready", "Dhee", "King", "Race Gurram"), 1, "hard"),
+]
+
+for _i, _qa in enumerate(QUESTIONS):
+    _qa.qid = _i
+
+# ----------------------------- Banks -----------------------------
+class QuestionBank(ABC):
+    """Read-only question source. Position ``i`` is the default play order."""
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    @abstractmethod
+    def __getitem__(self, i: int) -> QA: ...
+
+    @abstractmethod
+    def get(self, qid: int) -> QA: ...
+
+    @abstractmethod
+    def count(self, difficulty: str) -> int: ...
+
+    @abstractmethod
+    def nth(self, difficulty: str, k: int) -> QA:
+        """The k-th question (0-based) of a difficulty pool."""
+
+class ListBank(QuestionBank):
+    def __init__(self, questions: List[QA]):
+        self.questions = questions
+        self.pools: Dict[str, List[QA]] = {d: [] for d in DIFFICULTIES}
+        for qa in questions:
+            self.pools[qa.difficulty].append(qa)
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def __getitem__(self, i: int) -> QA:
+        return self.questions[i]
+
+    def get(self, qid: int) -> QA:
+        return self.questions[qid]
+
+    def count(self, difficulty: str) -> int:
+        return len(self.pools[difficulty])
+
+    def nth(self, difficulty: str, k: int) -> QA:
+        return self.pools[difficulty][k]
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE questions (
+    id INTEGER PRIMARY KEY,
+    difficulty INTEGER NOT NULL,
+    pos INTEGER NOT NULL,
+    answer INTEGER NOT NULL,
+    q TEXT NOT NULL, a TEXT NOT NULL, b TEXT NOT NULL, c TEXT NOT NULL, d TEXT NOT NULL
+);
+CREATE UNIQUE INDEX questions_by_difficulty ON questions (difficulty, pos);
+"""
+
+class SQLiteBank(QuestionBank):
+    """Lazily loaded bank file; only the counts are read on open."""
+
+    def __init__(self, path: str, cache_size: int = 256):
+        self.path = path
+        self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+        self.size = meta["count"]
+        self.counts = {d: meta.get(f"count_{d}", 0) for d in DIFFICULTIES}
+        self._cached = lru_cache(maxsize=cache_size)(self._get)
+
+    def close(self):
+        self.conn.close()
+
+    def _row(self, sql: str, args: tuple) -> QA:
+        row = self.conn.execute(sql, args).fetchone()
+        if row is None:
+            raise IndexError(args)
+        qid, diff, answer, q, a, b, c, d = row
+        return QA(q, (a, b, c, d), answer, DIFFICULTIES[diff], qid)
+
+    def _get(self, qid: int) -> QA:
+        return self._row("SELECT id, difficulty, answer, q, a, b, c, d FROM questions WHERE id = ?", (qid,))
+
+    def get(self, qid: int) -> QA:
+        return self._cached(qid)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, i: int) -> QA:
+        if not 0 <= i < self.size:
+            raise IndexError(i)
+        return self.get(i)
+
+    def count(self, difficulty: str) -> int:
+        return self.counts[difficulty]
+
+    def nth(self, difficulty: str, k: int) -> QA:
+        return self._row("SELECT id, difficulty, answer, q, a, b, c, d FROM questions "
+                         "WHERE difficulty = ? AND pos = ?", (DIFFICULTIES.index(difficulty), k))
+
+def write_bank(path: str, questions: Iterable[QA], batch: int = 5000) -> int:
+    """Write ``questions`` to a new bank file at ``path``; returns the row
+    count. The bank is built aside and renamed into place, so a bad row
+    leaves any existing bank at ``path`` untouched."""
+    tmp = f"{path}.{os.getpid()}.tmp"  # same directory, so the rename is atomic
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript(SCHEMA)
+        counts = [0] * len(DIFFICULTIES)
+        rows = []
+        n = 0
+        for qa in questions:
+            diff = DIFFICULTIES.index(qa.difficulty)
+            rows.append((n, diff, counts[diff], qa.answer_idx, qa.q, *qa.options))
+            counts[diff] += 1
+            n += 1
+            if len(rows) >= batch:
+                conn.executemany("INSERT INTO questions VALUES (?,?,?,?,?,?,?,?,?)", rows)
+                rows.clear()
+        conn.executemany("INSERT INTO questions VALUES (?,?,?,?,?,?,?,?,?)", rows)
+        meta = [("count", n)] + [(f"count_{d}", counts[i]) for i, d in enumerate(DIFFICULTIES)]
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", meta)
+        conn.commit()
+        conn.close()
+        os.replace(tmp, path)
+    except BaseException:
+        conn.close()
+        os.unlink(tmp)
+        raise
+    return n
+
+def _parse_row(d) -> QA:
+    """One JSON lines record as a QA; ValueError if it is malformed."""
+    if not isinstance(d, dict):
+        raise ValueError("expected an object")
+    missing = [k for k in ("q", "options", "answer_idx", "difficulty") if k not in d]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    q, options, answer, difficulty = d["q"], d["options"], d["answer_idx"], d["difficulty"]
+    if not isinstance(q, str) or not q.strip():
+        raise ValueError("q must be a non-empty string")
+    if not isinstance(options, list) or len(options) != 4 or not all(isinstance(o, str) for o in options):
+        raise ValueError("options must be a list of 4 strings")
+    if isinstance(answer, bool) or not isinstance(answer, int) or not 0 <= answer <= 3:
+        raise ValueError(f"answer_idx must be 0-3, got {answer!r}")
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f"difficulty must be one of {', '.join(DIFFICULTIES)}, got {difficulty!r}")
+    return QA(q, tuple(options), answer, difficulty)
+
+def read_jsonl(path: str) -> Iterator[QA]:
+    """Questions from a JSON lines file; ValueError naming the first bad line."""
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            if line.strip():
+                try:
+                    yield _parse_row(json.loads(line))
+                except ValueError as e:  # json.JSONDecodeError is one too
+                    raise ValueError(f"{path}:{lineno}: {e}") from None
+
+def bank_id(bank: QuestionBank) -> int:
+    """32-bit identity of a bank: its pool sizes and its first, middle and
+    last questions. Cheap enough for every start; journals record it so a
+    game is never resumed on another bank."""
+    n = len(bank)
+    key = [n] + [bank.count(d) for d in DIFFICULTIES]
+    for qid in sorted({0, n // 2, n - 1}) if n else ():
+        qa = bank.get(qid)
+        key += [qa.q, qa.answer_idx, qa.difficulty]
+    return zlib.crc32(json.dumps(key).encode())
+
+def open_bank(path: Optional[str] = None) -> QuestionBank:
+    return SQLiteBank(path) if path else ListBank(QUESTIONS)
+
+# ----------------------------- CLI -----------------------------
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "export":
+        n = write_bank(sys.argv[2], QUESTIONS)
+    elif len(sys.argv) == 4 and sys.argv[1] == "build":
+        try:
+            n = write_bank(sys.argv[3], read_jsonl(sys.argv[2]))
+        except ValueError as e:
+            sys.exit(str(e))
+    else:
+        sys.exit("usage: python bank.py export OUT.db | build IN.jsonl OUT.db")
+    print(f"wrote {n} questions to {sys.argv[-1]}")
@@ -0,0 +1,214 @@
+# Headless benchmarks for KBCWindow hot paths.
+#
+# Runs the real window on Qt's offscreen platform with media disabled and
+# records a latency distribution per operation. Results are written as
+# JSON; compared against a baseline, any path whose p50 regresses by more
+# than the threshold fails the run.
+#
+#   python benchmarks/bench_ui.py --out results.json
+#   python benchmarks/bench_ui.py --save-baseline benchmarks/baseline.json
+#   python benchmarks/bench_ui.py --baseline benchmarks/baseline.json --threshold 0.25
+#   python benchmarks/bench_ui.py --trace trace.json   # same runs with tracing on
+#   python benchmarks/bench_ui.py --audio              # also sound-effect trigger latency
+
+from __future__ import annotations
+import os, sys, json, time, platform, argparse
+from typing import Callable, Dict, List, Optional
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtWidgets import QApplication
+
+MIN_REGRESSION_MS = 0.05  # ignore p50 changes smaller than this (timer noise)
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    s = sorted(samples)
+    pick = lambda q: s[min(len(s) - 1, int(len(s) * q))]
+    return {"n": len(s), "mean": sum(s) / len(s), "p50": pick(0.5), "p95": pick(0.95),
+            "p99": pick(0.99), "max": s[-1]}
+
+def measure(fn: Callable[[int], None], n: int, setup: Optional[Callable[[int], None]] = None) -> List[float]:
+    """Times ``fn(i)`` n times (ms); ``setup(i)`` runs untimed before each."""
+    out = []
+    for i in range(n):
+        if setup is not None:
+            setup(i)
+        t0 = time.perf_counter_ns()
+        fn(i)
+        out.append((time.perf_counter_ns() - t0) / 1e6)
+    return out
+
+def run(repeat: int, trace: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    import main
+    if trace:  # measure with tracing on, to see its overhead
+        from tracing import Tracer
+        main.TRACER = Tracer()
+        app = main.TracingApplication([], main.TRACER)
+    else:
+        app = QApplication.instance() or QApplication([])
+
+    def make():
+        w = main.KBCWindow(media=False)
+        w._end_game = lambda completed: None  # no modal dialog in benchmarks
+        return w
+
+    results: Dict[str, Dict[str, float]] = {}
+    results["construct"] = summarize(measure(lambda i: make().deleteLater(), max(5, repeat // 20)))
+    app.processEvents()
+
+    win = make()
+    win.show()
+    app.processEvents()
+    engine = win.engine
+    nq = engine.num_questions
+
+    results["load_question"] = summarize(measure(lambda i: win.load_question(i % nq), repeat))
+    # The swap after a correct answer, with the question prepared during the delay
+    results["load_question.prefetched"] = summarize(measure(
+        lambda i: win.load_question(i % nq), repeat, lambda i: setattr(win, "_prepared", win._prepare(i % nq))))
+
+    def fresh(i):
+        engine.reset()
+        win.load_question(0)
+        win.animations.clear()
+    results["select_option.correct"] = summarize(measure(
+        lambda i: win.select_option(engine.question.answer_idx), repeat, fresh))
+
+    def fresh_wrong(i):
+        fresh(i)
+        engine.lifelines["extra"] = bool(i % 2)  # alternate forgiven / game over
+    results["select_option.wrong"] = summarize(measure(
+        lambda i: win.select_option((engine.question.answer_idx + 1) % 4), repeat, fresh_wrong))
+    win.animations.clear()
+    win.confetti.hide()
+
+    # Ask the Audience: 10k simulated voters plus the chart, as one frame
+    def fresh_poll(i):
+        fresh(i)
+        if i % 2:
+            win.use_5050()
+    win._setup_audience()
+    results["use_audience"] = summarize(measure(lambda i: (win.use_audience(), win.poll_chart.repaint()),
+                                                repeat, fresh_poll))
+    win.animations.clear()
+
+    results["highlight_ladder"] = summarize(measure(lambda i: win._highlight_ladder(i % nq), repeat))
+    # A 100-rung tournament ladder, climbing (scrolls to follow the current rung)
+    win.ladder.set_levels([1000 * (k + 1) for k in range(100)], {9, 19, 29, 49, 74})
+    app.processEvents()
+    results["highlight_ladder.100"] = summarize(measure(
+        lambda i: (win._highlight_ladder(i % 100), win.ladder.repaint()), repeat))
+    win.ladder.set_levels(main.PRICE_LADDER, main.SAFE_LEVELS)
+    win._highlight_ladder(engine.current_index)
+    results["flash_button"] = summarize(measure(lambda i: win._flash_button(i % 4, "accent"), repeat))
+    # One flash step as the user sees it: state change plus synchronous repaint
+    results["button_repaint"] = summarize(measure(
+        lambda i: (win.btnA.set_state("accent" if i % 2 else "neutral"), win.btnA.repaint()), repeat))
+    # A glow step repaints the halo around the button too, i.e. part of its parent
+    halo = lambda b: b.geometry().adjusted(-40, -40, 40, 40)
+    results["button_glow_repaint"] = summarize(measure(
+        lambda i: (win.btnB.set_glow((i % 10) / 10, main.RIGHT), win.btnB.parentWidget().repaint(halo(win.btnB))),
+        repeat))
+    win.btnB.set_glow(0.0)
+    deadline = time.perf_counter() + 1.2  # let the flash sequences run out
+    while win.animations and time.perf_counter() < deadline:
+        app.processEvents()
+
+    # Resize bursts: 60 size changes, then wait for the coalesced relayout.
+    def burst(i):
+        for k in range(60):
+            win.resize(950 + (i * 7 + k * 5) % 400, 650 + (k * 3) % 200)
+            app.processEvents()
+        start = time.perf_counter()
+        while win._relayout_timer.isActive() and time.perf_counter() - start < 0.5:
+            app.processEvents()
+    before = win.relayout_count
+    n_bursts = max(3, repeat // 20)
+    results["resize_burst"] = summarize(measure(burst, n_bursts))
+    results["resize_burst"]["relayouts_per_burst"] = (win.relayout_count - before) / n_bursts
+    win.resize(1100, 720)
+    app.processEvents()
+
+    # Confetti: one tick (step + paint of the dirty region) at several counts.
+    confetti = win.confetti
+    confetti.setGeometry(win.rect())
+    for count in (50, 200, 500, 1000):
+        confetti.start(count)
+        win.animations.clear()  # drive ticks by hand
+        for _ in range(20):  # let particles fall into view
+            confetti.update_particles()
+        app.processEvents()
+        def tick(i):
+            confetti.update_particles()
+            app.processEvents()
+        ticks = min(repeat, 60)
+        results[f"confetti.tick.{count}"] = summarize(measure(tick, ticks))
+    win.animations.clear()
+    confetti.hide()
+    win.close()
+    if trace:
+        main.TRACER.dump(trace)
+    return results
+
+def run_audio(repeat: int) -> Dict[str, Dict[str, float]]:
+    """Trigger-to-playing latency of each sound effect (AudioEngine.latency_stats),
+    or nothing when the multimedia backend is missing."""
+    app = QApplication.instance() or QApplication([])
+    try:
+        from audio import AudioEngine
+    except ImportError as e:
+        print(f"audio: skipped ({e})")
+        return {}
+    audio = AudioEngine(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets"))
+    for name in audio.sfx:
+        for _ in range(min(repeat, 40)):
+            audio.play(name)
+            deadline = time.perf_counter() + 0.15  # long enough for the voice to start
+            while time.perf_counter() < deadline:
+                app.processEvents()
+    stats = audio.latency_stats()
+    if not stats:
+        print("audio: no effect started playing (no output device?)")
+    return {f"sfx.{name}": s for name, s in stats.items()}
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> List[str]:
+    failures = []
+    for name, base in baseline.items():
+        cur = results.get(name)
+        if cur is None:
+            continue
+        limit = base["p50"] * (1 + threshold)
+        if cur["p50"] > limit and cur["p50"] - base["p50"] > MIN_REGRESSION_MS:
+            failures.append(f"{name}: p50 {cur['p50']:.3f} ms > {limit:.3f} ms "
+                            f"(baseline {base['p50']:.3f} ms +{threshold:.0%})")
+    return failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless KBCWindow benchmarks")
+    parser.add_argument("--repeat", type=int, default=200, help="samples per operation")
+    parser.add_argument("--out", metavar="JSON", help="write results here")
+    parser.add_argument("--baseline", metavar="JSON", help="fail if a path regresses against this file")
+    parser.add_argument("--save-baseline", metavar="JSON", help="write results as the new baseline")
+    parser.add_argument("--trace", metavar="JSON", help="run with tracing on and dump the trace here")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed p50 slowdown (0.25 = 25%%)")
+    parser.add_argument("--audio", action="store_true", help="also time sound effects (needs an audio device)")
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.trace)
+    if args.audio:
+        results.update(run_audio(args.repeat))
+    print(f"{'operation':<26}{'n':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}   (ms)")
+    for name, r in results.items():
+        print(f"{name:<26}{r['n']:>6}{r['p50']:>10.3f}{r['p95']:>10.3f}{r['p99']:>10.3f}{r['max']:>10.3f}")
+    doc = {"python": platform.python_version(), "platform": platform.platform(), "results": results}
+    for path in filter(None, (args.out, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(doc, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = compare(results, json.load(f)["results"], args.threshold)
+        if failures:
+            print("REGRESSIONS:\n  " + "\n  ".join(failures))
+            sys.exit(1)
+        print("no regressions against", args.baseline)
@@ -0,0 +1,223 @@
+# Game rules for KBC Tollywood Quiz, free of any Qt imports.
+#
+# KBCWindow drives a GameEngine and only renders what it reports; the
+# simulator (simulate.py) drives the same engine headlessly.
+
+from __future__ import annotations
+import random
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from bank import DIFFICULTIES, QA, QuestionBank, bank_id, open_bank
+
+if TYPE_CHECKING:
+    from assist import Assistant
+    from audience import Audience
+    from scheduler import Scheduler
+
+PRICE_LADDER = [
+    1000, 2000, 3000, 5000, 10000,
+    20000, 40000, 80000, 160000, 320000,
+    640000, 1250000, 2500000, 5000000, 10000000,
+    20000000, 30000000, 40000000, 50000000, 100000000
+]
+
+SAFE_LEVELS = {4, 9, 14}  # after Q5, Q10, Q15 (0-indexed) — optional checkpoints
+
+# Computer Assist certainty by difficulty: easier → higher certainty
+ASSIST_CONFIDENCE = {"easy": 0.75, "medium": 0.6, "hard": 0.5}
+
+# Game events reported to GameEngine.listener as (kind, a, b, value):
+#   GAME_START   value=bank_id(bank), so a journal is only replayed on its bank
+#   QUESTION     a=index, b=difficulty (DIFFICULTIES position), value=qid
+#   ANSWER       a=index, b=choice, value=1 if correct
+#   LIFELINE     a=index, b=LIFELINES position, value=detail (50-50: removed
+#                options as a bitmask, assist: suggested option, audience:
+#                the poll's percentages, one byte per option, A lowest)
+#   GAME_END     a=1 if completed, value=total amount
+EV_GAME_START, EV_QUESTION, EV_ANSWER, EV_LIFELINE, EV_GAME_END = range(1, 6)
+LIFELINES = ("5050", "assist", "extra", "audience")
+
+def pack_poll(percent: List[int]) -> int:
+    return sum(p << 8 * i for i, p in enumerate(percent))
+
+def unpack_poll(value: int) -> List[int]:
+    return [value >> 8 * i & 0xFF for i in range(4)]
+
+@dataclass
+class AnswerResult:
+    correct: bool
+    answer_idx: int        # the right option, for highlighting
+    extra_life_used: bool  # wrong answer forgiven by the Extra Life
+    game_over: bool        # wrong answer with no protection left
+
+class GameEngine:
+    def __init__(self, bank: Optional[QuestionBank] = None, rng: Optional[random.Random] = None,
+                 scheduler: Optional["Scheduler"] = None, assistant: Optional["Assistant"] = None,
+                 audience: Optional["Audience"] = None):
+        self.bank = bank if bank is not None else open_bank()
+        self.num_questions = min(len(self.bank), len(PRICE_LADDER))
+        self.bank_id = bank_id(self.bank)
+        self.rng = rng or random.Random()
+        # Without a scheduler every game plays the bank in order
+        self.scheduler = scheduler
+        # Without an assistant (or when its fact index knows nothing about the
+        # question) Computer Assist falls back to the canned guess
+        self.assistant = assistant
+        self.audience = audience  # created on first poll (it needs NumPy)
+        self.listener: Optional[Callable[[int, int, int, int], None]] = None
+        self.reset()
+
+    def _emit(self, kind: int, a: int = 0, b: int = 0, value: int = 0):
+        if self.listener is not None:
+            self.listener(kind, a, b, value)
+
+    def _emit_question(self):
+        qa = self.question
+        self._emit(EV_QUESTION, self.current_index, DIFFICULTIES.index(qa.difficulty), max(qa.qid, 0))
+
+    def reset(self, qids: Optional[Dict[int, int]] = None):
+        """Start a new game. ``qids`` pins rungs to questions by id (used by
+        journal replay); other rungs are drawn when first needed."""
+        if self.scheduler is not None:
+            self.scheduler.new_game()
+        self._questions: Dict[int, QA] = {i: self.bank.get(q) for i, q in (qids or {}).items()}
+        self.current_index = 0
+        self.total_amount = 0
+        self.safe_amount = 0
+        self.extra_life_available = True
+        self.lifelines = {
+            "5050": True,
+            "assist": True,
+            "extra": True,
+            "audience": True,
+        }
+        self.removed: List[int] = []  # options taken away by 50-50 on this question
+        self.poll: Optional[List[int]] = None  # audience poll taken on this question
+        self.answered = False         # locked until advance()
+        self.finished = False
+        self.completed = False
+        self._emit(EV_GAME_START, value=self.bank_id)
+        self._emit_question()
+
+    def question_at(self, index: int) -> QA:
+        """The question for rung ``index`` in this game (drawn on first use,
+        so the UI can prefetch the next one)."""
+        qa = self._questions.get(index)
+        if qa is None:
+            if self.scheduler is not None:
+                qa = self.scheduler.draw(index, self.num_questions)
+            else:
+                qa = self.bank[index]
+            self._questions[index] = qa
+        return qa
+
+    @property
+    def question(self) -> QA:
+        return self.question_at(self.current_index)
+
+    def mark_shown(self, index: Optional[int] = None):
+        """Tell the scheduler the player has seen rung ``index`` (default:
+        the current one). Called when a question is displayed, not when it
+        is drawn, so throwaway resets leave the player's history alone."""
+        if self.scheduler is not None:
+            self.scheduler.mark(self.question_at(self.current_index if index is None else index))
+
+    def is_open(self, idx: int) -> bool:
+        return not (self.answered or self.finished or idx in self.removed)
+
+    # -------------- Play --------------
+    def answer(self, idx: int) -> Optional[AnswerResult]:
+        """Lock in option ``idx``; returns None if it cannot be chosen now."""
+        if not self.is_open(idx):
+            return None
+        qa = self.question
+        self.mark_shown()  # headless drivers never display it
+        self.answered = True
+        self._emit(EV_ANSWER, self.current_index, idx, int(idx == qa.answer_idx))
+        if idx == qa.answer_idx:
+            self.total_amount += PRICE_LADDER[self.current_index]
+            if self.current_index in SAFE_LEVELS:
+                self.safe_amount = self.total_amount
+            return AnswerResult(True, qa.answer_idx, False, False)
+        if self.lifelines["extra"] and self.extra_life_available:
+            self.extra_life_available = False
+            self.lifelines["extra"] = False
+            return AnswerResult(False, qa.answer_idx, True, False)
+        self._finish(False)
+        return AnswerResult(False, qa.answer_idx, False, True)
+
+    def advance(self) -> bool:
+        """Move past an answered question; False once the game has ended."""
+        if self.finished:
+            return False
+        if self.current_index + 1 >= self.num_questions:
+            self._finish(True)
+            return False
+        self.current_index += 1
+        self.removed = []
+        self.poll = None
+        self.answered = False
+        self._emit_question()
+        return True
+
+    def _finish(self, completed: bool):
+        self.finished = True
+        self.completed = completed
+        if not completed:
+            self.total_amount = max(self.safe_amount, 0)
+        if self.scheduler is not None:
+            self.scheduler.save()
+        self._emit(EV_GAME_END, int(completed), 0, self.total_amount)
+
+    # -------------- Lifelines --------------
+    def use_5050(self, removed: Optional[List[int]] = None) -> Optional[List[int]]:
+        """Remove two wrong options (``removed`` replays a recorded draw);
+        returns their indices."""
+        if not self.lifelines["5050"] or self.answered or self.finished:
+            return None
+        qa = self.question
+        wrongs = [i for i in range(4) if i != qa.answer_idx]
+        self.removed = list(removed) if removed is not None else self.rng.sample(wrongs, 2)
+        self.lifelines["5050"] = False
+        self._emit(EV_LIFELINE, self.current_index, 0, sum(1 << i for i in self.removed))
+        return self.removed
+
+    def use_assist(self) -> Optional[Tuple[int, int]]:
+        """Returns the suggested option and its confidence in percent."""
+        if not self.lifelines["assist"] or self.answered or self.finished:
+            return None
+        qa = self.question
+        hint = self.assistant.suggest(qa, self.removed) if self.assistant is not None else None
+        if hint is None:
+            base = ASSIST_CONFIDENCE[qa.difficulty]
+            probs = [(1-base)/3] * 4
+            probs[qa.answer_idx] = base
+            suggestion = max(range(4), key=lambda i: probs[i] + self.rng.uniform(0, 0.05))
+            hint = suggestion, int(probs[suggestion]*100)
+        self.lifelines["assist"] = False
+        self._emit(EV_LIFELINE, self.current_index, 1, hint[0])
+        return hint
+
+    def use_audience(self, poll: Optional[List[int]] = None) -> Optional[List[int]]:
+        """Poll the audience (``poll`` replays a recorded one); returns the
+        percent voting for each option."""
+        if not self.lifelines["audience"] or self.answered or self.finished:
+            return None
+        if poll is None:
+            if self.audience is None:
+                from audience import Audience
+                self.audience = Audience(self.rng.getrandbits(64))
+            poll = self.audience.poll(self.question, self.removed)
+        self.poll = list(poll)
+        self.lifelines["audience"] = False
+        self._emit(EV_LIFELINE, self.current_index, 3, pack_poll(self.poll))
+        return self.poll
+
+    def use_extra(self) -> bool:
+        if not self.lifelines["extra"]:
+            return False
+        self.extra_life_available = True
+        self.lifelines["extra"] = True  # mark as armed; will be consumed on wrong
+        self._emit(EV_LIFELINE, self.current_index, 2, 0)
+        return True
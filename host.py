@@ -0,0 +1,358 @@
+# Host mode for KBC Tollywood Quiz: the audience plays along over the LAN.
+#
+# One asyncio server holds the audience state for the question on the big
+# screen. Players connect with WebSocket (phones/browsers) or plain TCP
+# with newline-delimited JSON (the load generator), both on one port:
+#
+#   -> {"type": "join", "player": "ravi"}
+#   -> {"type": "answer", "player": "ravi", "index": 3, "choice": 2}
+#   <- {"type": "ack", "ok": true}
+#   <- {"type": "question", "index": 3, "q": "...", "options": [...], "prize": 5000}
+#   <- {"type": "result", "index": 3, "answer_idx": 1, "tally": [..], "top": [[player, score], ..]}
+#
+# A player may change their answer until the question closes; the last one
+# counts and earns the rung's PRICE_LADDER prize if right. No Qt imports:
+# KBCWindow runs the server on a background thread (main.py --host).
+#
+#   python host.py serve --auto-advance 5          # standalone, cycles the bank
+#   python host.py loadgen --players 2000 --spawn  # load test, in-process server
+
+from __future__ import annotations
+import sys, time, json, base64, hashlib, asyncio, argparse, threading, random
+from typing import Callable, Dict, List, Optional, Set
+
+from bank import QA, open_bank
+from engine import PRICE_LADDER
+
+DEFAULT_PORT = 8765
+WS_MAGIC = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+UPDATE_INTERVAL = 0.1  # s between audience tally pushes to the UI
+MAX_LINE = 4096
+
+# ----------------------------- State -----------------------------
+class HostSession:
+    """Audience answers and per-player scores; pure state, no I/O."""
+
+    def __init__(self):
+        self.scores: Dict[str, int] = {}
+        self.index = -1
+        self.answer_idx = -1
+        self.prize = 0
+        self.open = False
+        self.answers: Dict[str, int] = {}
+        self.tally = [0, 0, 0, 0]
+        self.submissions = 0
+        self.question: Optional[dict] = None  # current question message, for late joiners
+
+    def open_question(self, index: int, qa: QA) -> dict:
+        self.index = index
+        self.answer_idx = qa.answer_idx
+        self.prize = PRICE_LADDER[index]
+        self.open = True
+        self.answers = {}
+        self.tally = [0, 0, 0, 0]
+        self.question = {"type": "question", "index": index, "q": qa.q,
+                         "options": list(qa.options), "prize": self.prize}
+        return self.question
+
+    def join(self, player: str):
+        self.scores.setdefault(player, 0)
+
+    def submit(self, player: str, index: int, choice: int) -> bool:
+        if not self.open or index != self.index or not 0 <= choice < 4:
+            return False
+        prev = self.answers.get(player)
+        if prev is not None:
+            self.tally[prev] -= 1
+        self.answers[player] = choice
+        self.tally[choice] += 1
+        self.submissions += 1
+        self.scores.setdefault(player, 0)
+        return True
+
+    def close_question(self, top: int = 10) -> dict:
+        self.open = False
+        for player, choice in self.answers.items():
+            if choice == self.answer_idx:
+                self.scores[player] += self.prize
+        best = sorted(self.scores.items(), key=lambda kv: kv[1], reverse=True)[:top]
+        return {"type": "result", "index": self.index, "answer_idx": self.answer_idx,
+                "tally": list(self.tally), "top": best}
+
+    def snapshot(self) -> dict:
+        return {"index": self.index, "open": self.open, "answers": len(self.answers),
+                "tally": list(self.tally), "players": len(self.scores)}
+
+# ----------------------------- WebSocket -----------------------------
+def ws_frame(payload: bytes) -> bytes:
+    n = len(payload)
+    if n < 126:
+        header = bytes((0x81, n))
+    elif n < 65536:
+        header = bytes((0x81, 126)) + n.to_bytes(2, "big")
+    else:
+        header = bytes((0x81, 127)) + n.to_bytes(8, "big")
+    return header + payload
+
+async def ws_read(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """Next text/binary message; None on close. Control frames are skipped."""
+    while True:
+        b0, b1 = await reader.readexactly(2)
+        op, n = b0 & 0x0F, b1 & 0x7F
+        if n == 126:
+            n = int.from_bytes(await reader.readexactly(2), "big")
+        elif n == 127:
+            n = int.from_bytes(await reader.readexactly(8), "big")
+        if n > MAX_LINE:
+            return None
+        mask = await reader.readexactly(4) if b1 & 0x80 else b"\0\0\0\0"
+        data = bytes(c ^ mask[i & 3] for i, c in enumerate(await reader.readexactly(n)))
+        if op == 0x8:
+            return None
+        if op in (0x1, 0x2):
+            return data
+
+class Client:
+    __slots__ = ("writer", "ws")
+
+    def __init__(self, writer: asyncio.StreamWriter, ws: bool):
+        self.writer = writer
+        self.ws = ws
+
+    def send(self, line: bytes, frame: bytes):
+        if not self.writer.is_closing():
+            self.writer.write(frame if self.ws else line)
+
+# ----------------------------- Server -----------------------------
+class HostServer:
+    def __init__(self, host: str = "0.0.0.0", port: int = DEFAULT_PORT,
+                 on_update: Optional[Callable[[dict], None]] = None):
+        self.host, self.port = host, port
+        self.session = HostSession()
+        self.clients: Set[Client] = set()
+        self.on_update = on_update
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.server: Optional[asyncio.base_events.Server] = None
+        self._dirty = False
+        self._thread: Optional[threading.Thread] = None
+        self._handlers: Set[asyncio.Task] = set()
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.server = await asyncio.start_server(self._handle, self.host, self.port,
+                                                 limit=MAX_LINE, backlog=4096)
+        self.port = self.server.sockets[0].getsockname()[1]
+        if self.on_update is not None:
+            self.loop.create_task(self._push_updates())
+
+    async def stop(self):
+        self.server.close()
+        for c in list(self.clients):
+            c.writer.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self.server.wait_closed()
+
+    # -------------- Game hooks (loop thread) --------------
+    def open_question(self, index: int, qa: QA):
+        self.broadcast(self.session.open_question(index, qa))
+        self._dirty = True
+
+    def close_question(self):
+        result = self.session.close_question()
+        self.broadcast(result)
+        self._dirty = False  # the result snapshot supersedes any pending tally
+        if self.on_update is not None:
+            self.on_update(dict(self.session.snapshot(), result=result))
+
+    def broadcast(self, msg: dict):
+        payload = json.dumps(msg, separators=(",", ":")).encode()
+        line, frame = payload + b"\n", ws_frame(payload)
+        for c in self.clients:
+            c.send(line, frame)
+
+    async def _push_updates(self):
+        while True:
+            await asyncio.sleep(UPDATE_INTERVAL)
+            if self._dirty:
+                self._dirty = False
+                self.on_update(self.session.snapshot())
+
+    # -------------- Connections --------------
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = None
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            first = await reader.readline()
+            if first.startswith(b"GET "):
+                client = Client(writer, True)
+                await self._ws_handshake(reader, writer)
+                read = lambda: ws_read(reader)
+            else:
+                client = Client(writer, False)
+                pending = [first]
+                async def read():
+                    line = pending.pop() if pending else await reader.readline()
+                    return line or None
+            self.clients.add(client)
+            ack_ok, ack_no = b'{"type":"ack","ok":true}', b'{"type":"ack","ok":false}'
+            while True:
+                data = await read()
+                if data is None:
+                    break
+                try:
+                    msg = json.loads(data)
+                    kind = msg.get("type")
+                    if kind == "answer":
+                        ok = self.session.submit(str(msg["player"]), int(msg["index"]), int(msg["choice"]))
+                    elif kind == "join":
+                        self.session.join(str(msg["player"]))
+                        if self.session.open:
+                            payload = json.dumps(self.session.question, separators=(",", ":")).encode()
+                            client.send(payload + b"\n", ws_frame(payload))
+                        ok = True
+                    else:
+                        ok = False
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    ok = False
+                if ok:
+                    self._dirty = True
+                ack = ack_ok if ok else ack_no
+                client.send(ack + b"\n", ws_frame(ack))
+                if writer.transport.get_write_buffer_size() > 65536:
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self.clients.discard(client)
+            self._handlers.discard(task)
+            writer.close()
+
+    async def _ws_handshake(self, reader, writer):
+        key = None
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "sec-websocket-key":
+                key = value.strip().encode()
+        if key is None:
+            raise ValueError("not a websocket upgrade")
+        accept = base64.b64encode(hashlib.sha1(key + WS_MAGIC).digest())
+        writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                     b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+
+    # -------------- Background thread (used by the Qt window) --------------
+    def start_in_thread(self):
+        started = threading.Event()
+        error: List[BaseException] = []
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.start())
+            except BaseException as e:  # e.g. the port is taken
+                error.append(e)
+                loop.close()
+                return
+            finally:
+                started.set()
+            loop.run_forever()
+        self._thread = threading.Thread(target=run, name="kbc-host", daemon=True)
+        self._thread.start()
+        started.wait()
+        if error:
+            self._thread = None
+            raise error[0]
+
+    def call(self, fn: Callable, *args):
+        """Run ``fn(*args)`` on the server loop from any thread."""
+        self.loop.call_soon_threadsafe(fn, *args)
+
+    def shutdown(self):
+        if self._thread is not None:
+            asyncio.run_coroutine_threadsafe(self.stop(), self.loop).result(timeout=2)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+# ----------------------------- Standalone + load generator -----------------------------
+async def auto_advance(server: HostServer, seconds: float):
+    bank = open_bank()
+    n = min(len(bank), len(PRICE_LADDER))
+    i = 0
+    while True:
+        server.open_question(i, bank[i])
+        await asyncio.sleep(seconds)
+        server.close_question()
+        i = (i + 1) % n
+
+async def serve(args):
+    server = HostServer(args.host, args.port)
+    await server.start()
+    print(f"host mode listening on {args.host}:{server.port}")
+    await auto_advance(server, args.auto_advance)
+
+async def player(host: str, port: int, name: str, deadline: float, latencies: List[float], rng: random.Random):
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 16)
+    writer.write(json.dumps({"type": "join", "player": name}).encode() + b"\n")
+    index = -1
+    try:
+        while time.perf_counter() < deadline:
+            if index < 0:
+                msg = json.loads(await reader.readline())
+                if msg["type"] == "question":
+                    index = msg["index"]
+                continue
+            t0 = time.perf_counter()
+            writer.write(json.dumps({"type": "answer", "player": name, "index": index,
+                                     "choice": rng.randrange(4)}).encode() + b"\n")
+            while True:  # broadcasts may arrive before our ack
+                msg = json.loads(await reader.readline())
+                if msg["type"] == "ack":
+                    latencies.append(time.perf_counter() - t0)
+                    break
+                if msg["type"] == "question":
+                    index = msg["index"]
+    finally:
+        writer.close()
+
+async def loadgen(args):
+    server = None
+    if args.spawn:
+        server = HostServer("127.0.0.1", 0)
+        await server.start()
+        args.port = server.port
+        advance = asyncio.get_running_loop().create_task(auto_advance(server, args.auto_advance))
+    latencies: List[float] = []
+    rng = random.Random(0)
+    t0 = time.perf_counter()
+    deadline = t0 + args.duration
+    tasks = [player(args.host, args.port, f"p{i}", deadline, latencies, rng) for i in range(args.players)]
+    await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed = time.perf_counter() - t0
+    if server is not None:
+        advance.cancel()
+        await server.stop()
+    if not latencies:
+        sys.exit("no answers acknowledged")
+    latencies.sort()
+    p = lambda q: latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000
+    print(f"players: {args.players}  answers: {len(latencies):,}  "
+          f"{len(latencies) / elapsed:,.0f} answers/s  p50 {p(0.5):.1f} ms  p99 {p(0.99):.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="KBC host mode server and load generator")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("serve", help="run a standalone host that cycles through the bank")
+    s.add_argument("--host", default="0.0.0.0")
+    s.add_argument("--port", type=int, default=DEFAULT_PORT)
+    s.add_argument("--auto-advance", type=float, default=10.0, metavar="SECONDS")
+    g = sub.add_parser("loadgen", help="simulate many players submitting answers")
+    g.add_argument("--host", default="127.0.0.1")
+    g.add_argument("--port", type=int, default=DEFAULT_PORT)
+    g.add_argument("--players", type=int, default=1000)
+    g.add_argument("--duration", type=float, default=10.0, metavar="SECONDS")
+    g.add_argument("--spawn", action="store_true", help="run the server in-process")
+    g.add_argument("--auto-advance", type=float, default=2.0, metavar="SECONDS")
+    args = parser.parse_args()
+    asyncio.run(serve(args) if args.cmd == "serve" else loadgen(args))
@@ -0,0 +1,521 @@
+# Bulk question-bank ingestion for KBC Tollywood Quiz (no Qt imports).
+#
+# Reads contributor dumps (CSV, JSON lines or a JSON array) as a stream,
+# validates rows into the QA shape across a process pool and removes
+# duplicates before writing an SQLite bank (see bank.py):
+#
+#   exact  same question and option set once normalized (case, accents,
+#          punctuation, spacing and common transliterations folded away);
+#          later copies are dropped
+#   near   MinHash signatures of question + option shingles, bucketed by
+#          LSH and confirmed by signature agreement; reported, and dropped
+#          with --drop-near
+#
+# Rows, signatures and LSH buckets are staged in a temporary SQLite file and
+# grouped with SQL, so memory stays flat however large the dumps are.
+#
+#   python ingest.py dumps/*.csv dumps/*.jsonl --out questions.db --report report.json
+#   python ingest.py more.csv --base questions.db --out merged.db --drop-near
+#   python ingest.py --base builtin            # just check a bank for duplicates
+#
+# CSV columns: question, options ("A|B|C|D") or a, b, c, d, answer (0-3, A-D
+# or the option text) and difficulty (easy/medium/hard, e/m/h or 1-3).
+
+from __future__ import annotations
+import os, re, csv, json, time, hashlib, sqlite3, argparse, tempfile, unicodedata
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from bank import DIFFICULTIES, QA, open_bank, write_bank
+
+CHUNK = 2000                 # rows per worker task
+MAX_QUESTION = 300           # characters; longer text no longer fits the question card
+MAX_OPTION = 100
+PERMUTATIONS = 64            # MinHash signature length
+BANDS, BAND_ROWS = 16, 4     # LSH: pairs with similarity ~0.5+ share a bucket
+NEAR_THRESHOLD = 0.7         # signature agreement that counts as a near duplicate
+BUCKET_COMPARE = 8           # earlier bucket members each row is checked against
+SHINGLE = 4                  # characters per shingle
+EXAMPLES = 50                # duplicate pairs listed per kind in the report
+
+# ----------------------------- Normalization -----------------------------
+# Telugu names are romanized many ways (Sankarabharanam / Shankarabharanam,
+# Seetha / Sita); fold the common variants so they hash alike.
+_ASPIRATE = re.compile(r"([bcdgjkpst])h")
+_DOUBLE = re.compile(r"([a-z])\1")
+_PUNCT = re.compile(r"[^\w\s]")
+
+def clean(text) -> str:
+    """Display form: trimmed, single-spaced."""
+    return " ".join(str(text).split()) if text is not None else ""
+
+@lru_cache(maxsize=1 << 16)  # option texts (names, years) repeat across rows
+def normalize(text: str) -> str:
+    """Matching form: no accents, case, punctuation or spelling variants."""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c))
+    text = " ".join(_PUNCT.sub(" ", text.lower()).split())
+    text = _ASPIRATE.sub(r"\1", text).replace("ee", "i").replace("oo", "u")
+    return _DOUBLE.sub(r"\1", text)
+
+def exact_key(q: str, options: List[str]) -> int:
+    h = hashlib.blake2b("\x1f".join([q] + sorted(options)).encode(), digest_size=8)
+    return int.from_bytes(h.digest(), "little", signed=True)
+
+# Fixed hash family (multiply-shift) so signatures agree across worker
+# processes and runs
+_rng = np.random.default_rng(0x4B4243)
+_A = (_rng.integers(0, 1 << 63, PERMUTATIONS, dtype=np.uint64) | np.uint64(1))[:, None]
+_B = _rng.integers(0, 1 << 63, PERMUTATIONS, dtype=np.uint64)[:, None]
+_BAND_MUL = np.uint64(0x9E3779B97F4A7C15)
+
+def shingles(q: str, options: List[str]) -> np.ndarray:
+    """Every 4-byte window of question + options, as one integer each."""
+    # Options are shingled too, so templated questions ("Which film is
+    # this song from?") only match when their options do.
+    data = np.frombuffer(" ".join([q] + sorted(options)).encode().ljust(SHINGLE), dtype=np.uint8)
+    grams = np.zeros(len(data) - SHINGLE + 1, dtype=np.uint64)
+    for k in range(SHINGLE):
+        grams = grams << np.uint64(8) | data[k:len(data) - SHINGLE + 1 + k]
+    return grams
+
+def minhash(grams: np.ndarray) -> np.ndarray:
+    return ((_A * grams[None, :] + _B) >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+def band_keys(sig: np.ndarray) -> List[int]:
+    """One signed 64-bit bucket key per LSH band."""
+    rows = sig.astype(np.uint64).reshape(BANDS, BAND_ROWS)
+    key = np.zeros(BANDS, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for j in range(BAND_ROWS):
+            key = (key ^ rows[:, j]) * _BAND_MUL
+    return key.view(np.int64).tolist()
+
+# ----------------------------- Validation -----------------------------
+Q_KEYS = ("q", "question", "text")
+OPTION_KEYS = (("a", "option_a", "option1", "opt1"), ("b", "option_b", "option2", "opt2"),
+               ("c", "option_c", "option3", "opt3"), ("d", "option_d", "option4", "opt4"))
+ANSWER_KEYS = ("answer_idx", "answer", "correct")
+DIFFICULTY_KEYS = ("difficulty", "level")
+DIFFICULTY_ALIASES = {"e": "easy", "1": "easy", "m": "medium", "2": "medium", "h": "hard", "3": "hard",
+                      **{d: d for d in DIFFICULTIES}}
+
+def _first(d: dict, keys) -> Optional[object]:
+    for k in keys:
+        if d.get(k) not in (None, ""):
+            return d[k]
+    return None
+
+def parse_row(raw, header: Optional[List[str]]) -> QA:
+    """A raw row (JSON line, CSV fields or dict) as a QA; raises ValueError
+    with the rejection reason."""
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except json.JSONDecodeError:
+            raise ValueError("bad json")
+    elif isinstance(raw, list):
+        if len(raw) != len(header):
+            raise ValueError("wrong column count")
+        raw = dict(zip(header, raw))
+    if not isinstance(raw, dict):
+        raise ValueError("not an object")
+    d = {str(k).strip().lower(): v for k, v in raw.items()}
+
+    q = clean(_first(d, Q_KEYS))
+    if not q:
+        raise ValueError("no question")
+    if len(q) > MAX_QUESTION:
+        raise ValueError("question too long")
+    options = d.get("options")
+    if isinstance(options, str):
+        options = options.split("|")
+    elif options is None:
+        options = [_first(d, keys) for keys in OPTION_KEYS]
+    options = [clean(o) for o in options]
+    if len(options) != 4:
+        raise ValueError("not 4 options")
+    if not all(options):
+        raise ValueError("empty option")
+    if max(map(len, options)) > MAX_OPTION:
+        raise ValueError("option too long")
+    if len({normalize(o) for o in options}) != 4:
+        raise ValueError("repeated option")
+
+    answer = _first(d, ANSWER_KEYS)
+    if isinstance(answer, bool) or answer is None:
+        raise ValueError("no answer")
+    text = clean(answer)
+    if text.isdigit() and int(text) < 4:
+        answer_idx = int(text)
+    elif len(text) == 1 and text.upper() in "ABCD":
+        answer_idx = "ABCD".index(text.upper())
+    else:
+        matches = [i for i, o in enumerate(options) if normalize(o) == normalize(text)]
+        if len(matches) != 1:
+            raise ValueError("bad answer")
+        answer_idx = matches[0]
+
+    difficulty = DIFFICULTY_ALIASES.get(clean(_first(d, DIFFICULTY_KEYS)).lower())
+    if difficulty is None:
+        raise ValueError("bad difficulty")
+    return QA(q, tuple(options), answer_idx, difficulty)
+
+def check_chunk(args: Tuple[int, Optional[List[str]], List[Tuple[int, object]]]) -> Tuple[int, list]:
+    """Worker task: validate and fingerprint one chunk of a source. Rows come
+    back as (line, reason) when rejected, else as staging row values."""
+    src, header, rows = args
+    out = []
+    for line, raw in rows:
+        try:
+            qa = parse_row(raw, header)
+        except ValueError as e:
+            out.append((line, str(e)))
+            continue
+        q = normalize(qa.q)
+        options = [normalize(o) for o in qa.options]
+        sig = minhash(shingles(q, options))
+        out.append((line, DIFFICULTIES.index(qa.difficulty), qa.answer_idx, qa.q, *qa.options,
+                    exact_key(q, options), sig.tobytes(), band_keys(sig)))
+    return src, out
+
+# ----------------------------- Sources -----------------------------
+def read_source(path: str) -> Tuple[Optional[List[str]], Iterator[Tuple[int, object]]]:
+    """(CSV header or None, iterator of (line/row number, raw row))."""
+    ext = os.path.splitext(path)[1].lower()
+    f = open(path, encoding="utf-8-sig", newline="")
+    if ext in (".csv", ".tsv"):
+        reader = csv.reader(f, delimiter="\t" if ext == ".tsv" else ",")
+        header = [h.strip().lower() for h in next(reader, [])]
+        return header, ((reader.line_num, row) for row in reader if any(row))
+    if ext == ".json":
+        return None, _json_array(f)
+    return None, ((i, line) for i, line in enumerate(f, 1) if line.strip())
+
+def _json_array(f, block: int = 1 << 20) -> Iterator[Tuple[int, object]]:
+    """Items of a top-level JSON array, decoded incrementally; numbered by item."""
+    decoder = json.JSONDecoder()
+    buf, pos, n = f.read(block).lstrip(), 0, 0
+    if not buf.startswith("["):
+        raise ValueError(f"{f.name}: expected a JSON array")
+    pos = 1
+    while True:
+        while True:  # skip separators, topping up the buffer as needed
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf):
+                break
+            more = f.read(block)
+            if not more:
+                return
+            buf, pos = more, 0
+        if buf[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            more = f.read(block)
+            if not more:
+                raise
+            buf, pos = buf[pos:] + more, 0
+            continue
+        n += 1
+        yield n, item
+        pos = end
+
+def base_rows(spec: str) -> Iterator[Tuple[int, dict]]:
+    bank = open_bank(None if spec == "builtin" else spec)
+    for i in range(len(bank)):
+        qa = bank[i]
+        yield i, {"q": qa.q, "options": list(qa.options), "answer_idx": qa.answer_idx,
+                  "difficulty": qa.difficulty}
+
+def chunks(rows: Iterator, size: int) -> Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+# ----------------------------- Staging -----------------------------
+STAGING_SCHEMA = """
+CREATE TABLE rows (
+    id INTEGER PRIMARY KEY,      -- input order; base rows first
+    src INTEGER NOT NULL, line INTEGER NOT NULL,
+    difficulty INTEGER NOT NULL, answer INTEGER NOT NULL,
+    q TEXT NOT NULL, a TEXT NOT NULL, b TEXT NOT NULL, c TEXT NOT NULL, d TEXT NOT NULL,
+    exact INTEGER NOT NULL, sig BLOB NOT NULL,
+    status INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE lsh (key INTEGER NOT NULL, id INTEGER NOT NULL);
+CREATE TABLE pairs (kind INTEGER NOT NULL, keep INTEGER NOT NULL, dup INTEGER NOT NULL, sim REAL NOT NULL);
+"""
+KEPT, EXACT, NEAR = 0, 1, 2
+KIND_NAMES = {EXACT: "exact", NEAR: "near"}
+
+class Ingest:
+    """One ingestion run: sources are staged, then deduplicated, then written."""
+
+    def __init__(self, staging: str, workers: Optional[int] = None):
+        self.staging = staging
+        self.workers = workers
+        self.conn = sqlite3.connect(staging)
+        for pragma in ("journal_mode=OFF", "synchronous=OFF", "temp_store=FILE", "cache_size=-32768"):
+            self.conn.execute(f"PRAGMA {pragma}")
+        self.conn.executescript(STAGING_SCHEMA)
+        self.sources: List[str] = []
+        self.base_sources = 0
+        self.rows = 0
+        self.invalid: Counter = Counter()
+        self.invalid_examples: Dict[str, List[str]] = {}
+        self.conflicts = 0  # duplicates that disagree on the answer
+        self.timings: Dict[str, float] = {}
+
+    # -------------- Stage --------------
+    def stage(self, paths: List[str], base: Optional[str] = None):
+        t0 = time.perf_counter()
+        jobs = []
+        if base:
+            self.sources.append("builtin" if base == "builtin" else base)
+            self.base_sources = 1
+            jobs.append((0, None, base_rows(base)))
+        for path in paths:
+            header, rows = read_source(path)
+            jobs.append((len(self.sources), header, rows))
+            self.sources.append(path)
+        tasks = ((src, header, batch) for src, header, rows in jobs for batch in chunks(rows, CHUNK))
+        if self.workers == 1:
+            for result in map(check_chunk, tasks):
+                self._store(*result)
+        else:
+            # Keep a bounded window of chunks in flight; results are stored in
+            # submission order so row ids follow the input order.
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                window = deque()
+                limit = 2 * (self.workers or os.cpu_count() or 1)
+                for task in tasks:
+                    window.append(pool.submit(check_chunk, task))
+                    if len(window) >= limit:
+                        self._store(*window.popleft().result())
+                while window:
+                    self._store(*window.popleft().result())
+        self.conn.commit()
+        self.timings["stage"] = time.perf_counter() - t0
+
+    def _store(self, src: int, results: list):
+        rows, lsh = [], []
+        for r in results:
+            if len(r) == 2:
+                line, reason = r
+                self.invalid[reason] += 1
+                examples = self.invalid_examples.setdefault(reason, [])
+                if len(examples) < 5:
+                    examples.append(f"{self.sources[src]}:{line}")
+                continue
+            rid = self.rows
+            self.rows += 1
+            rows.append((rid, src) + r[:-1])
+            lsh += [(key, rid) for key in r[-1]]
+        self.conn.executemany("INSERT INTO rows (id, src, line, difficulty, answer, q, a, b, c, d, exact, sig) "
+                              "VALUES (?,?,?,?,?,?,?,?,?,?,?,?)", rows)
+        self.conn.executemany("INSERT INTO lsh VALUES (?, ?)", lsh)
+
+    # -------------- Deduplicate --------------
+    def dedupe(self, near: bool = True):
+        """Cluster duplicates; each cluster keeps its earliest row."""
+        t0 = time.perf_counter()
+        parent = array("q", range(self.rows))  # union-find; each cluster's root is its first row
+
+        def find(i: int) -> int:
+            root = i
+            while parent[root] != root:
+                root = parent[root]
+            while parent[i] != root:
+                parent[i], i = root, parent[i]
+            return root
+
+        def answer_text(rid: int) -> str:
+            row = self.conn.execute("SELECT answer, a, b, c, d FROM rows WHERE id = ?", (rid,)).fetchone()
+            return normalize(row[1 + row[0]])
+
+        pairs = []
+        self.conn.execute("CREATE INDEX rows_by_exact ON rows (exact, id)")
+        first, first_key = -1, None
+        for key, rid in self.conn.execute("SELECT exact, id FROM rows ORDER BY exact, id"):
+            if key != first_key:
+                first, first_key = rid, key
+                continue
+            parent[rid] = first
+            pairs.append((EXACT, first, rid, 1.0))
+            if answer_text(first) != answer_text(rid):
+                self.conflicts += 1
+            if len(pairs) >= CHUNK:
+                self._pairs(pairs)
+        self._pairs(pairs)
+        self.timings["exact"] = time.perf_counter() - t0
+
+        if near:
+            t0 = time.perf_counter()
+            need = int(np.ceil(NEAR_THRESHOLD * PERMUTATIONS))
+
+            def check_bucket(ids: List[int], sigs: List[bytes], head: np.ndarray) -> np.ndarray:
+                """Match each row against the bucket's first BUCKET_COMPARE rows."""
+                block = np.frombuffer(b"".join(sigs), dtype=np.uint32).reshape(len(ids), PERMUTATIONS)
+                if head is None:
+                    head = block[:BUCKET_COMPARE]
+                agree = (block[:, None, :] == head[None, :, :]).sum(axis=2)
+                hit = (agree >= need) & (np.array(head_ids)[None, :] < np.array(ids)[:, None])
+                for j in np.flatnonzero(hit.any(axis=1)).tolist():
+                    k = int(hit[j].argmax())  # earliest matching head row
+                    rid, other = ids[j], head_ids[k]
+                    root, other_root = find(rid), find(other)
+                    if root != other_root:
+                        keep, dup = sorted((other_root, root))
+                        parent[dup] = keep
+                        pairs.append((NEAR, other, rid, int(agree[j, k]) / PERMUTATIONS))
+                        if answer_text(other) != answer_text(rid):
+                            self.conflicts += 1
+                if len(pairs) >= CHUNK:
+                    self._pairs(pairs)
+                return head
+
+            # Only buckets with two or more rows hold candidates; a hot bucket
+            # is checked in slices of CHUNK rows.
+            ids: List[int] = []
+            sigs: List[bytes] = []
+            head_ids: List[int] = []
+            head, last = None, None
+            for key, rid, sig in self.conn.execute(
+                    "SELECT l.key, l.id, r.sig FROM lsh l JOIN rows r ON r.id = l.id "
+                    "WHERE l.key IN (SELECT key FROM lsh GROUP BY key HAVING count(*) > 1) ORDER BY l.key, l.id"):
+                if key != last or len(ids) >= CHUNK:
+                    if ids:
+                        head = check_bucket(ids, sigs, head)
+                    if key != last:
+                        head, head_ids, last = None, [], key
+                    ids, sigs = [], []
+                ids.append(rid)
+                sigs.append(sig)
+                if len(head_ids) < BUCKET_COMPARE:
+                    head_ids.append(rid)
+            if ids:
+                check_bucket(ids, sigs, head)
+            self._pairs(pairs)
+            self.timings["near"] = time.perf_counter() - t0
+
+        # Every row but the first of its cluster is a duplicate
+        self.conn.execute("UPDATE rows SET status = ? WHERE id IN (SELECT dup FROM pairs WHERE kind = ?)",
+                          (EXACT, EXACT))
+        dups = np.flatnonzero(np.frombuffer(parent, dtype=np.int64) != np.arange(self.rows))
+        self.conn.executemany("UPDATE rows SET status = ? WHERE id = ? AND status = ?",
+                              ((NEAR, rid, KEPT) for rid in dups.tolist()))
+        self.conn.commit()
+
+    def _pairs(self, pairs: list):
+        self.conn.executemany("INSERT INTO pairs VALUES (?, ?, ?, ?)", pairs)
+        pairs.clear()
+
+    # -------------- Write --------------
+    def write(self, out: str, drop_near: bool = False) -> int:
+        t0 = time.perf_counter()
+        base = self.base_sources
+        dropped = (EXACT, NEAR) if drop_near else (EXACT,)
+        cursor = self.conn.execute(
+            "SELECT difficulty, answer, q, a, b, c, d FROM rows "
+            f"WHERE src < ? OR status NOT IN ({','.join('?' * len(dropped))}) ORDER BY id", (base, *dropped))
+        n = write_bank(out, (QA(q, (a, b, c, d), answer, DIFFICULTIES[diff]) for diff, answer, q, a, b, c, d in cursor))
+        self.timings["write"] = time.perf_counter() - t0
+        return n
+
+    # -------------- Report --------------
+    def report(self, examples: int = EXAMPLES) -> dict:
+        count = lambda sql, *args: self.conn.execute(sql, args).fetchone()[0]
+        # base rows are located by question id, dump rows by line
+        where = lambda row: f"{self.sources[row[0]]}{'#' if row[0] < self.base_sources else ':'}{row[1]}"
+        out = {"sources": self.sources, "rows": self.rows + sum(self.invalid.values()), "valid": self.rows,
+               "invalid": dict(self.invalid.most_common()), "invalid_examples": self.invalid_examples,
+               "exact_duplicates": count("SELECT count(*) FROM rows WHERE status = ?", EXACT),
+               "near_duplicates": count("SELECT count(*) FROM rows WHERE status = ?", NEAR),
+               "answer_conflicts": self.conflicts,
+               "new_by_difficulty": {d: count("SELECT count(*) FROM rows WHERE difficulty = ? AND status = ? "
+                                              "AND src >= ?", i, KEPT, self.base_sources)
+                                     for i, d in enumerate(DIFFICULTIES)},
+               "timings": {k: round(v, 3) for k, v in self.timings.items()}, "pairs": []}
+        for kind in (EXACT, NEAR):
+            for keep, dup, sim in self.conn.execute(
+                    "SELECT keep, dup, sim FROM pairs WHERE kind = ? ORDER BY dup LIMIT ?", (kind, examples)).fetchall():
+                a, b = (self.conn.execute("SELECT src, line, q, a, b, c, d, answer FROM rows WHERE id = ?", (r,))
+                        .fetchone() for r in (keep, dup))
+                out["pairs"].append({"kind": KIND_NAMES[kind], "similarity": round(sim, 3),
+                                     "keep": {"at": where(a), "q": a[2], "answer": a[3 + a[7]]},
+                                     "duplicate": {"at": where(b), "q": b[2], "answer": b[3 + b[7]]}})
+        return out
+
+    def close(self):
+        self.conn.close()
+        if os.path.exists(self.staging):
+            os.remove(self.staging)
+
+def format_report(r: dict, drop_near: bool, written: Optional[int], out: Optional[str]) -> str:
+    total = sum(r["timings"].values())
+    lines = [f"{r['rows']:,} rows from {len(r['sources'])} sources in {total:.1f} s "
+             f"({r['rows'] / max(total, 1e-9):,.0f} rows/s)",
+             f"  valid          {r['valid']:>12,}",
+             f"  invalid        {sum(r['invalid'].values()):>12,}"]
+    for reason, n in r["invalid"].items():
+        lines.append(f"    {reason:<18}{n:>10,}  e.g. {', '.join(r['invalid_examples'][reason][:3])}")
+    lines += [f"  exact dups     {r['exact_duplicates']:>12,}  (dropped)",
+              f"  near dups      {r['near_duplicates']:>12,}  ({'dropped' if drop_near else 'kept'})",
+              f"  answer differs {r['answer_conflicts']:>12,}  (duplicates with another correct answer)"]
+    if written is not None:
+        spread = "/".join(f"{n:,}" for n in r["new_by_difficulty"].values())
+        lines.append(f"  written        {written:>12,}  to {out} (new unique easy/medium/hard {spread})")
+    for p in r["pairs"]:
+        tag = "exact" if p["kind"] == "exact" else f"near {p['similarity']:.2f}"
+        lines.append(f"  {tag:<10} {p['duplicate']['at']} ~ {p['keep']['at']}")
+        lines.append(f"      {p['duplicate']['q'][:70]!r} -> {p['duplicate']['answer']!r}")
+        lines.append(f"      {p['keep']['q'][:70]!r} -> {p['keep']['answer']!r}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate and deduplicate question dumps into a bank")
+    parser.add_argument("paths", nargs="*", help="CSV/TSV, JSON lines (.jsonl) or JSON array (.json) dumps")
+    parser.add_argument("--out", metavar="PATH", help="bank file to write (base questions first, then new ones)")
+    parser.add_argument("--base", metavar="PATH|builtin", help="existing bank to merge into and dedupe against")
+    parser.add_argument("--drop-near", action="store_true", help="drop near duplicates too, not just report them")
+    parser.add_argument("--no-near", action="store_true", help="skip near-duplicate detection")
+    parser.add_argument("--report", metavar="JSON", help="write the merge report here")
+    parser.add_argument("--examples", type=int, default=EXAMPLES, help="duplicate pairs listed per kind")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--staging", metavar="PATH", help="staging file (default: a temporary file)")
+    args = parser.parse_args()
+    if not args.paths and not args.base:
+        parser.error("no dumps given")
+
+    staging = args.staging
+    if staging is None:
+        fd, staging = tempfile.mkstemp(suffix=".db", prefix="ingest-",
+                                       dir=os.path.dirname(os.path.abspath(args.out)) if args.out else None)
+        os.close(fd)
+        os.remove(staging)
+    job = Ingest(staging, args.workers)
+    try:
+        job.stage(args.paths, args.base)
+        job.dedupe(near=not args.no_near)
+        written = job.write(args.out, args.drop_near) if args.out else None
+        result = job.report(args.examples)
+    finally:
+        job.close()
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(result, f, indent=1, ensure_ascii=False)
+    print(format_report(result, args.drop_near, written, args.out))
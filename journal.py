@@ -0,0 +1,264 @@
+# Crash-safe session journal for KBC Tollywood Quiz (no Qt imports).
+#
+# Every GameEngine event is appended as a fixed 16-byte record:
+#
+#   kind:u8  a:u8  b:u16  value:u32  t_ms:u32  crc32:u32
+#
+# after a 16-byte header (magic, version, wall-clock epoch). t_ms counts from
+# the epoch. The UI thread only packs records into a buffer; a writer thread
+# flushes the buffer every FLUSH_INTERVAL and fsyncs at most every
+# FSYNC_INTERVAL, so a crash loses well under a second of play. Replay stops
+# at the first torn or corrupt record.
+#
+#   python journal.py session.kbcj      # dump records
+
+from __future__ import annotations
+import sys, os, time, struct, zlib, threading
+from typing import Iterator, List, Optional, Tuple
+
+from engine import (GameEngine, EV_GAME_START, EV_QUESTION, EV_ANSWER, EV_LIFELINE,
+                    EV_GAME_END, LIFELINES, unpack_poll)
+
+MAGIC = b"KBCJ"
+VERSION = 1
+HEADER = struct.Struct("<4sIq")     # magic, version, epoch (ms since 1970)
+RECORD = struct.Struct("<BBHIII")   # kind, a, b, value, t_ms, crc32
+BODY = struct.Struct("<BBHII")      # the crc covers these 12 bytes
+FLUSH_INTERVAL = 0.05               # s
+FSYNC_INTERVAL = 1.0                # s
+ROTATE_BYTES = 4 << 20              # archive the journal past this size at game start
+
+EVENT_NAMES = {EV_GAME_START: "game_start", EV_QUESTION: "question", EV_ANSWER: "answer",
+               EV_LIFELINE: "lifeline", EV_GAME_END: "game_end"}
+
+Record = Tuple[int, int, int, int, int]  # kind, a, b, value, t_ms
+
+# ----------------------------- Writing -----------------------------
+class JournalWriter:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()     # guards _buf; held only to swap it
+        self._io_lock = threading.Lock()  # guards the file: writes, fsync, rotation
+        self._buf = bytearray()
+        self._rotation: Optional[Tuple[bytes, str, int]] = None  # old-file tail, archive, new epoch
+        self._wake = threading.Event()
+        self._closed = False
+        self._open()
+        self._thread = threading.Thread(target=self._run, name="kbc-journal", daemon=True)
+        self._thread.start()
+
+    def _open(self, epoch_ms: Optional[int] = None):
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self.f = open(self.path, "ab")
+        if self.f.tell() == 0:
+            self.epoch_ms = epoch_ms or int(time.time() * 1000)
+            self.f.write(HEADER.pack(MAGIC, VERSION, self.epoch_ms))
+            self.f.flush()
+        else:
+            self.epoch_ms, view = _load(self.path)
+            # Drop a torn or zero-filled tail so new records stay aligned.
+            good = HEADER.size + _valid_length(view)
+            if good != self.f.tell():
+                self.f.truncate(good)
+                self.f.seek(good)
+        self._size = self.f.tell()  # bytes in the file, kept by the writer
+        self._last_sync = time.monotonic()
+
+    def append(self, kind: int, a: int = 0, b: int = 0, value: int = 0):
+        """Queue one event; cheap enough for the UI thread."""
+        t = int(time.time() * 1000) - self.epoch_ms
+        body = BODY.pack(kind, a, b, value & 0xFFFFFFFF, t & 0xFFFFFFFF)
+        with self._lock:
+            self._buf += body
+            self._buf += struct.pack("<I", zlib.crc32(body))
+
+    def rotate(self, archive: Optional[str] = None) -> Optional[str]:
+        """Move a journal past ROTATE_BYTES aside (for analytics) and start
+        a fresh one; returns the archive path if it will rotate. Only the
+        size is checked here; the writer thread does the file work, so this
+        is safe to call from the UI thread."""
+        with self._lock:
+            if self._rotation is not None or self._size + len(self._buf) < ROTATE_BYTES:
+                return None
+            stem, ext = os.path.splitext(self.path)
+            archive = archive or f"{stem}-{time.strftime('%Y%m%d-%H%M%S')}{ext}"
+            # Records queued so far belong to the old file; later ones are
+            # timed from the new file's epoch
+            self.epoch_ms = int(time.time() * 1000)
+            self._rotation = (bytes(self._buf), archive, self.epoch_ms)
+            self._buf = bytearray()
+        self._wake.set()
+        return archive
+
+    def flush(self, sync: bool = False):
+        with self._io_lock:
+            self._write(sync)
+
+    def _write(self, sync: bool):
+        # The buffer is swapped out under the append lock; the write and
+        # fsync happen outside it so append() never waits on the disk.
+        with self._lock:
+            rotation, self._rotation = self._rotation, None
+            data, self._buf = self._buf, bytearray()
+        if rotation is not None:
+            tail, archive, epoch_ms = rotation
+            self.f.write(tail)
+            self.f.flush()
+            os.fsync(self.f.fileno())
+            self.f.close()
+            os.replace(self.path, archive)
+            self._open(epoch_ms)
+        if data:
+            self.f.write(data)
+            self.f.flush()
+            self._size += len(data)
+        now = time.monotonic()
+        if sync or (data and now - self._last_sync >= FSYNC_INTERVAL):
+            os.fsync(self.f.fileno())
+            self._last_sync = now
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(FLUSH_INTERVAL)
+            self._wake.clear()
+            self.flush()
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush(sync=True)
+        self.f.close()
+
+# ----------------------------- Reading -----------------------------
+def _load(path: str) -> Tuple[int, memoryview]:
+    """(epoch_ms, whole records) of a journal file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        return 0, memoryview(b"")
+    magic, version, epoch = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path}: not a KBC journal")
+    end = HEADER.size + (len(data) - HEADER.size) // RECORD.size * RECORD.size
+    return epoch, memoryview(data)[HEADER.size:end]
+
+def _valid_length(view: memoryview) -> int:
+    """Byte length of ``view`` up to the last record with a good crc."""
+    end = len(view)
+    while end:
+        rec = view[end - RECORD.size:end]
+        if zlib.crc32(rec[:12]) == RECORD.unpack(rec)[5]:
+            break
+        end -= RECORD.size
+    return end
+
+def _decode(view: memoryview) -> List[Record]:
+    records = []
+    append = records.append
+    crc32 = zlib.crc32
+    for i, (kind, a, b, value, t, crc) in enumerate(RECORD.iter_unpack(view)):
+        pos = i * RECORD.size
+        if crc32(view[pos:pos + 12]) != crc:
+            break
+        append((kind, a, b, value, t))
+    return records
+
+def read_records(path: str, offset: int = 0) -> Tuple[int, List[Record]]:
+    """Returns (epoch_ms, records) from record number ``offset`` on, stopping
+    at the first torn or corrupt record."""
+    epoch, view = _load(path)
+    return epoch, _decode(view[offset * RECORD.size:])
+
+def iter_records(path: str, offset: int = 0, chunk: int = 1 << 16) -> Iterator[Record]:
+    """Stream records from record number ``offset`` on in bounded memory,
+    stopping at the first torn or corrupt record."""
+    with open(path, "rb") as f:
+        head = f.read(HEADER.size)
+        if len(head) < HEADER.size or HEADER.unpack(head)[:2] != (MAGIC, VERSION):
+            raise ValueError(f"{path}: not a KBC journal")
+        f.seek(HEADER.size + offset * RECORD.size)
+        crc32 = zlib.crc32
+        while True:
+            data = f.read(chunk * RECORD.size)
+            data = memoryview(data)[:len(data) // RECORD.size * RECORD.size]
+            if not data:
+                return
+            for i, (kind, a, b, value, t, crc) in enumerate(RECORD.iter_unpack(data)):
+                pos = i * RECORD.size
+                if crc32(data[pos:pos + 12]) != crc:
+                    return
+                yield kind, a, b, value, t
+
+def read_epoch(path: str) -> int:
+    with open(path, "rb") as f:
+        return HEADER.unpack(f.read(HEADER.size))[2]
+
+def read_last_game(path: str) -> List[Record]:
+    """Records of the newest game only. The kind bytes are scanned with one
+    C-level rfind, so cost does not grow with the number of past games."""
+    _, view = _load(path)
+    kinds = bytes(view[0::RECORD.size])
+    start = kinds.rfind(bytes((EV_GAME_START,)))
+    return _decode(view[start * RECORD.size:]) if start >= 0 else []
+
+def iter_games(records: List[Record]) -> Iterator[List[Record]]:
+    """Split a record list into games, each starting at GAME_START."""
+    game: List[Record] = []
+    for rec in records:
+        if rec[0] == EV_GAME_START and game:
+            yield game
+            game = []
+        game.append(rec)
+    if game:
+        yield game
+
+def replay(engine: GameEngine, records: List[Record]) -> bool:
+    """Rebuild ``engine`` from the last game in ``records``. Returns True if
+    that game was still in progress (i.e. there is something to resume);
+    False too if it was played on another bank."""
+    start = None
+    for i in range(len(records) - 1, -1, -1):
+        if records[i][0] == EV_GAME_START:
+            start = i
+            break
+    if start is None or records[start][3] != engine.bank_id:
+        return False
+    # Pin every rung to the question that was actually shown
+    qids = {a: value for kind, a, _, value, _ in records[start + 1:] if kind == EV_QUESTION}
+    listener, engine.listener = engine.listener, None
+    try:
+        engine.reset(qids)
+        for kind, a, b, value, _ in records[start + 1:]:
+            if kind == EV_QUESTION:
+                while engine.current_index < a and engine.advance():
+                    pass
+            elif kind == EV_ANSWER:
+                engine.answer(b)
+            elif kind == EV_LIFELINE:
+                name = LIFELINES[b]
+                if name == "5050":
+                    engine.use_5050([i for i in range(4) if value >> i & 1])
+                elif name == "assist":
+                    engine.use_assist()
+                elif name == "audience":
+                    engine.use_audience(unpack_poll(value))
+                else:
+                    engine.use_extra()
+            elif kind == EV_GAME_END:
+                engine.finished = True
+                engine.completed = bool(a)
+                engine.total_amount = value
+    finally:
+        engine.listener = listener
+    return not engine.finished
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python journal.py JOURNAL")
+    epoch, recs = read_records(sys.argv[1])
+    print(f"epoch {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(epoch / 1000))}, {len(recs)} records")
+    for kind, a, b, value, t in recs:
+        print(f"{t/1000:10.3f}s  {EVENT_NAMES.get(kind, kind):<10} a={a} b={b} value={value}")
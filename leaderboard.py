@@ -0,0 +1,384 @@
+# Persistent leaderboard for KBC Tollywood Quiz (no Qt imports).
+#
+# Every finished game is one row in an SQLite file (WAL mode) shared by all
+# kiosk processes on the machine. The UI thread only queues scores; a writer
+# thread commits them in batches, so a busy database never stalls a frame.
+# Each batch also keeps small summary tables up to date (games per amount,
+# per day, and each player's best), which is what makes rank queries a sum
+# over at most a ladder's worth of rows instead of a count over millions.
+#
+#   python leaderboard.py top --db leaderboard.db [--day 20261017] [--players]
+#   python leaderboard.py rank --db leaderboard.db PLAYER
+#   python leaderboard.py stress --db stress.db --prefill 2000000 --writers 8 --seconds 10
+
+from __future__ import annotations
+import sys, os, time, random, sqlite3, argparse, threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+FLUSH_INTERVAL = 0.25   # s between writer commits
+MAX_BATCH = 1000        # scores per transaction
+BUSY_TIMEOUT_MS = 5000  # wait this long for another process's write lock
+READ_TIMEOUT_MS = 50    # the UI's queries give up sooner; WAL readers rarely wait at all
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    questions INTEGER NOT NULL,   -- questions answered correctly
+    day INTEGER NOT NULL,         -- local date as YYYYMMDD
+    ts INTEGER NOT NULL           -- ms since 1970
+);
+CREATE INDEX IF NOT EXISTS scores_by_amount ON scores (amount DESC, ts);
+CREATE INDEX IF NOT EXISTS scores_by_day ON scores (day, amount DESC, ts);
+CREATE TABLE IF NOT EXISTS amount_counts (amount INTEGER PRIMARY KEY, n INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS day_counts (
+    day INTEGER NOT NULL, amount INTEGER NOT NULL, n INTEGER NOT NULL,
+    PRIMARY KEY (day, amount)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS best (
+    player TEXT PRIMARY KEY, amount INTEGER NOT NULL, ts INTEGER NOT NULL, games INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS best_by_amount ON best (amount DESC, ts);
+CREATE TABLE IF NOT EXISTS best_counts (amount INTEGER PRIMARY KEY, n INTEGER NOT NULL);
+"""
+
+@dataclass(slots=True)
+class Score:
+    player: str
+    amount: int
+    completed: bool = False
+    questions: int = 0
+    ts: int = 0  # ms since 1970; 0 = now
+
+def today(ts_ms: Optional[int] = None) -> int:
+    t = time.localtime(ts_ms / 1000 if ts_ms else None)
+    return t.tm_year * 10000 + t.tm_mon * 100 + t.tm_mday
+
+def connect(path: str) -> sqlite3.Connection:
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")  # WAL + NORMAL: durable across app crashes, one fsync per checkpoint
+    conn.executescript(SCHEMA)
+    return conn
+
+# ----------------------------- Writing -----------------------------
+def write_scores(conn: sqlite3.Connection, scores: List[Score]):
+    """Insert ``scores`` and update the summary tables in one transaction."""
+    now = int(time.time() * 1000)
+    rows, amounts, days = [], {}, {}
+    top: Dict[str, Tuple[int, Tuple[int, int]]] = {}  # player -> (games, (best amount, ts)) in this batch
+    for s in scores:
+        ts = s.ts or now
+        day = today(ts)
+        rows.append((s.player, s.amount, int(s.completed), s.questions, day, ts))
+        amounts[s.amount] = amounts.get(s.amount, 0) + 1
+        days[day, s.amount] = days.get((day, s.amount), 0) + 1
+        games, prev = top.get(s.player, (0, None))
+        top[s.player] = (games + 1, (s.amount, ts) if prev is None or s.amount > prev[0] else prev)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany("INSERT INTO scores (player, amount, completed, questions, day, ts) "
+                         "VALUES (?, ?, ?, ?, ?, ?)", rows)
+        conn.executemany("INSERT INTO amount_counts VALUES (?, ?) "
+                         "ON CONFLICT (amount) DO UPDATE SET n = n + excluded.n", amounts.items())
+        conn.executemany("INSERT INTO day_counts VALUES (?, ?, ?) "
+                         "ON CONFLICT (day, amount) DO UPDATE SET n = n + excluded.n",
+                         ((d, a, n) for (d, a), n in days.items()))
+        moves: Dict[int, int] = {}  # best_counts deltas
+        for player, (games, (amount, ts)) in top.items():
+            old = conn.execute("SELECT amount FROM best WHERE player = ?", (player,)).fetchone()
+            if old is None:
+                conn.execute("INSERT INTO best VALUES (?, ?, ?, ?)", (player, amount, ts, games))
+                moves[amount] = moves.get(amount, 0) + 1
+            elif amount > old[0]:
+                conn.execute("UPDATE best SET amount = ?, ts = ?, games = games + ? WHERE player = ?",
+                             (amount, ts, games, player))
+                moves[old[0]] = moves.get(old[0], 0) - 1
+                moves[amount] = moves.get(amount, 0) + 1
+            else:
+                conn.execute("UPDATE best SET games = games + ? WHERE player = ?", (games, player))
+        conn.executemany("INSERT INTO best_counts VALUES (?, ?) "
+                         "ON CONFLICT (amount) DO UPDATE SET n = n + excluded.n",
+                         ((a, n) for a, n in moves.items() if n))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+class ScoreWriter:
+    """Queues scores from the UI thread; a thread commits them in batches."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending: List[Score] = []
+        self._wake = threading.Event()
+        self._closed = False
+        self.batches = 0
+        self.errors = 0   # failed commits, retried or dropped
+        self.dropped = 0  # scores lost to errors a retry would not fix
+        self._thread = threading.Thread(target=self._run, name="kbc-leaderboard", daemon=True)
+        self._thread.start()
+
+    def submit(self, score: Score):
+        with self._lock:
+            self._pending.append(score)
+        if len(self._pending) >= MAX_BATCH:
+            self._wake.set()
+
+    @property
+    def backlog(self) -> int:
+        return len(self._pending)
+
+    def _run(self):
+        conn = None
+        retries = 3  # after close(), before giving up on a locked database
+        while True:
+            self._wake.wait(FLUSH_INTERVAL)
+            self._wake.clear()
+            closed = self._closed
+            with self._lock:
+                batch, self._pending = self._pending[:MAX_BATCH], self._pending[MAX_BATCH:]
+            if batch:
+                try:
+                    if conn is None:
+                        conn = connect(self.path)
+                    write_scores(conn, batch)
+                    self.batches += 1
+                except sqlite3.OperationalError:
+                    # Still locked after BUSY_TIMEOUT_MS (or not openable yet):
+                    # put the batch back, retry next tick
+                    self.errors += 1
+                    with self._lock:
+                        self._pending[:0] = batch
+                    if closed:
+                        retries -= 1
+                except Exception:
+                    # Anything else would fail the same way again; drop the
+                    # batch rather than the thread
+                    self.errors += 1
+                    self.dropped += len(batch)
+            if closed and (not self._pending or retries <= 0):
+                break
+            if closed or len(self._pending) >= MAX_BATCH:
+                self._wake.set()
+        if conn is not None:
+            conn.close()
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+
+# ----------------------------- Queries -----------------------------
+class Leaderboard:
+    """Read side, plus a ScoreWriter for this process's own games. Reads use
+    their own connection and see other processes' commits as they land.
+
+    With ``connect_now=False`` nothing touches the database until
+    open_in_thread(); until then ``conn`` is None and the caller must not
+    query."""
+
+    def __init__(self, path: str, writer: bool = True, connect_now: bool = True):
+        self.path = path
+        self.closed = False
+        self._lock = threading.Lock()  # orders open_in_thread against close
+        self.conn: Optional[sqlite3.Connection] = connect(path) if connect_now else None
+        self.writer = ScoreWriter(path) if writer else None
+
+    def open_in_thread(self, done: Optional[Callable[[], None]] = None):
+        """Open the read connection (WAL setup and schema, which can wait
+        BUSY_TIMEOUT_MS on another kiosk's lock) on a thread; ``done`` is
+        called from that thread once ``conn`` is usable."""
+        def run():
+            try:
+                conn = connect(self.path)
+            except (sqlite3.Error, OSError):
+                return  # no board this session; scores still queue for the writer
+            conn.execute(f"PRAGMA busy_timeout = {READ_TIMEOUT_MS}")
+            with self._lock:
+                if not self.closed:
+                    self.conn = conn
+            if self.conn is not conn:  # closed meanwhile
+                conn.close()
+                return
+            if done is not None:
+                done()
+        threading.Thread(target=run, name="kbc-leaderboard-open", daemon=True).start()
+
+    def submit(self, score: Score):
+        self.writer.submit(score)
+
+    def version(self) -> int:
+        """Changes whenever another connection commits; cheap to poll."""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def top(self, k: int = 10, day: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """Best ``k`` games (player, amount, ts), all-time or on ``day``."""
+        if day is None:
+            return self.conn.execute("SELECT player, amount, ts FROM scores "
+                                     "ORDER BY amount DESC, ts LIMIT ?", (k,)).fetchall()
+        return self.conn.execute("SELECT player, amount, ts FROM scores WHERE day = ? "
+                                 "ORDER BY amount DESC, ts LIMIT ?", (day, k)).fetchall()
+
+    def top_players(self, k: int = 10) -> List[Tuple[str, int, int]]:
+        """Best ``k`` players by their best game (player, amount, games)."""
+        return self.conn.execute("SELECT player, amount, games FROM best "
+                                 "ORDER BY amount DESC, ts LIMIT ?", (k,)).fetchall()
+
+    def rank(self, amount: int, day: Optional[int] = None) -> Tuple[int, int]:
+        """(rank, games) a game winning ``amount`` has among all games, or
+        those on ``day``. Ties share a rank."""
+        if day is None:
+            sql, args = "SELECT amount, n FROM amount_counts", ()
+        else:
+            sql, args = "SELECT amount, n FROM day_counts WHERE day = ?", (day,)
+        above = total = 0
+        for a, n in self.conn.execute(sql, args):
+            total += n
+            if a > amount:
+                above += n
+        return above + 1, total
+
+    def player_rank(self, player: str) -> Optional[Tuple[int, int, int, int]]:
+        """(rank, players, best amount, games) of ``player``, or None."""
+        row = self.conn.execute("SELECT amount, games FROM best WHERE player = ?", (player,)).fetchone()
+        if row is None:
+            return None
+        above = total = 0
+        for a, n in self.conn.execute("SELECT amount, n FROM best_counts"):
+            total += n
+            if a > row[0]:
+                above += n
+        return above + 1, total, row[0], row[1]
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+            conn, self.conn = self.conn, None
+        if self.writer is not None:
+            self.writer.close()
+        if conn is not None:
+            conn.close()
+
+# ----------------------------- Stress test -----------------------------
+AMOUNTS = [0, 1000, 2000, 3000, 5000, 10000, 20000, 40000, 80000, 160000, 320000, 640000,
+           1250000, 2500000, 5000000, 10000000]
+
+def random_score(rng: random.Random, players: int, ts: int = 0) -> Score:
+    # Most games end early, as on a real ladder
+    k = min(len(AMOUNTS) - 1, int(rng.expovariate(0.45)))
+    return Score(f"player{rng.randrange(players)}", AMOUNTS[k], k == len(AMOUNTS) - 1, k, ts)
+
+def prefill(path: str, rows: int, players: int, days: int = 30, batch: int = 20000):
+    conn = connect(path)
+    rng = random.Random(1)
+    now = int(time.time() * 1000)
+    for start in range(0, rows, batch):
+        write_scores(conn, [random_score(rng, players, now - rng.randrange(days * 86400000))
+                            for _ in range(min(batch, rows - start))])
+    conn.close()
+
+def _writer_proc(path: str, seconds: float, rate: float, players: int, seed: int, out):
+    """One kiosk process: submits a game every 1/rate s through ScoreWriter."""
+    board = Leaderboard(path)
+    rng = random.Random(seed)
+    n, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        board.submit(random_score(rng, players))
+        n += 1
+        if rate:
+            time.sleep(max(0.0, start + n / rate - time.perf_counter()))
+        elif board.writer.backlog >= 2 * MAX_BATCH:
+            time.sleep(FLUSH_INTERVAL / 10)  # flat out, but only as fast as commits land
+    board.close()  # flushes what is still queued
+    out.put((n, board.writer.batches, board.writer.errors, time.perf_counter() - start))
+
+def stress(path: str, writers: int, seconds: float, rate: float, players: int, prefill_rows: int) -> str:
+    from multiprocessing import Process, Queue
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    t0 = time.perf_counter()
+    if prefill_rows:
+        prefill(path, prefill_rows, players)
+    t_prefill = time.perf_counter() - t0
+    board = Leaderboard(path, writer=False)
+    before = board.rank(-1)[1]
+
+    out = Queue()
+    procs = [Process(target=_writer_proc, args=(path, seconds, rate, players, i, out)) for i in range(writers)]
+    for p in procs:
+        p.start()
+    # Meanwhile, time the UI's queries against the moving database
+    queries = {"top10": lambda: board.top(10), "top10.day": lambda: board.top(10, today()),
+               "top_players": lambda: board.top_players(10), "rank": lambda: board.rank(20000),
+               "rank.day": lambda: board.rank(20000, today()), "player_rank": lambda: board.player_rank("player7")}
+    latency: Dict[str, List[float]] = {name: [] for name in queries}
+    start = time.perf_counter()
+    while any(p.is_alive() for p in procs) or time.perf_counter() - start < seconds:
+        for name, q in queries.items():
+            t = time.perf_counter()
+            q()
+            latency[name].append((time.perf_counter() - t) * 1000)
+        time.sleep(0.005)
+    results = [out.get() for _ in procs]
+    for p in procs:
+        p.join()
+    after = board.rank(-1)[1]
+    board.close()
+
+    submitted = sum(r[0] for r in results)
+    wall = max(r[3] for r in results)
+    lines = [f"{before:,} rows before ({t_prefill:.1f} s prefill), {writers} writer processes for {seconds:g} s",
+             f"  inserts  {submitted:,} submitted, {after - before:,} committed, "
+             f"{(after - before) / wall:,.0f} rows/s, {sum(r[1] for r in results):,} batches, "
+             f"{sum(r[2] for r in results)} lock timeouts",
+             f"  {'query':<14}{'n':>7}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}"]
+    for name, samples in latency.items():
+        s = sorted(samples)
+        lines.append(f"  {name:<14}{len(s):>7}{s[len(s) // 2]:>9.3f}{s[int(len(s) * 0.99)]:>9.3f}{s[-1]:>9.3f}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="KBC leaderboard")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    t = sub.add_parser("top", help="best games or players")
+    t.add_argument("--db", required=True)
+    t.add_argument("-k", type=int, default=10)
+    t.add_argument("--day", type=int, help="YYYYMMDD (default: all time)")
+    t.add_argument("--players", action="store_true", help="best game per player")
+    r = sub.add_parser("rank", help="a player's rank by best game")
+    r.add_argument("--db", required=True)
+    r.add_argument("player")
+    s = sub.add_parser("stress", help="concurrent writer processes vs. query latency")
+    s.add_argument("--db", default="stress-leaderboard.db", help="database to create")
+    s.add_argument("--prefill", type=int, default=1000000, help="rows inserted before the run")
+    s.add_argument("--writers", type=int, default=8, help="kiosk processes")
+    s.add_argument("--seconds", type=float, default=10)
+    s.add_argument("--rate", type=float, default=0, help="games per second per writer (0 = flat out)")
+    s.add_argument("--players", type=int, default=100000)
+    args = parser.parse_args()
+
+    if args.cmd == "stress":
+        print(stress(args.db, args.writers, args.seconds, args.rate, args.players, args.prefill))
+        sys.exit()
+    board = Leaderboard(args.db, writer=False)
+    if args.cmd == "top":
+        rows = board.top_players(args.k) if args.players else board.top(args.k, args.day)
+        for i, (player, amount, extra) in enumerate(rows, 1):
+            tail = f"{extra} games" if args.players else time.strftime("%Y-%m-%d %H:%M", time.localtime(extra / 1000))
+            print(f"{i:>4}. {player:<24} ₹{amount:>12,}  {tail}")
+    else:
+        found = board.player_rank(args.player)
+        if found is None:
+            sys.exit(f"{args.player}: no games")
+        rank, players, amount, games = found
+        print(f"{args.player}: #{rank:,} of {players:,} players, best ₹{amount:,} in {games:,} games")
+    board.close()
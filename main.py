@@ -1,18 +1,28 @@
 # KBC Tollywood Quiz — PyQt6
 # Features:
-# - 20 Qs (8 easy, 7 medium, 5 hard) on iconic Tollywood movies
+# - 20 Qs (8 easy, 7 medium, 5 hard) on iconic Tollywood movies, drawn per rung without repeats
 # - 2x2 answer grid with responsive layout & keyboard shortcuts (A-D)
-# - 3 lifelines: 50-50, Computer Assist, Extra Life
+# - 4 lifelines: 50-50, Computer Assist (searches a local Tollywood fact index),
+#   Audience Poll (10,000 simulated voters, charted), Extra Life
 # - Minimal dark theme, elegant animations (button glow, confetti, shake)
-# - Background music loop + correct/wrong SFX (auto-disables if assets missing)
-# - Price ladder with current highlight
+# - Gapless background music loop + pooled correct/wrong SFX (auto-disables if assets missing)
+# - Price ladder with current highlight and safe-level markers; long ladders scroll
 # - Safe fallbacks if media backends are unavailable
+# - Crash-safe session journal: an interrupted game resumes on next start
+# - Leaderboard shared by every kiosk on the machine (today's top scores, rank at game over)
+# - Kiosk mode (--kiosk): game over returns to an attract screen and the next game reuses the window
+# - Opt-in event tracing (--trace) exported as Chrome trace JSON
 #
 # How to run:
-#   pip install PyQt6
-#   python main.py
+#   pip install PyQt6 numpy   # NumPy: Computer Assist index and Audience Poll
+#   python main.py [--bank questions.db] [--player NAME] [--host [ADDR:PORT]] [--profile-startup] [--trace trace.json]
+#   python main.py --leaderboard /srv/kbc/leaderboard.db   # one board for every kiosk
+#   python main.py --polls polls.npy                        # precomputed polls (python audience.py batch)
+#   python main.py --kiosk                                  # full screen, never exits between players
+#   python main.py --soak 5000                              # headless leak check of kiosk resets
 #
 # Optional assets (put under assets/):
+#   assets/facts.txt         (facts Computer Assist searches, one per line)
 #   assets/bgm.mp3           (looped background track)
 #   assets/correct.wav       (SFX)
 #   assets/wrong.wav         (SFX)
@@ -25,99 +35,175 @@
 # NOTE: If fonts look too small/large, adjust BASE_FONT_SIZE below.
 
 from __future__ import annotations
-import sys, os, random, math
+import time
+_T_START = time.perf_counter()  # --profile-startup counts from here
+import sys, os, random, math, sqlite3
 from dataclasses import dataclass
-from typing import List, Tuple
+from functools import lru_cache
+import argparse
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
 from PyQt6.QtCore import (
-    Qt, QTimer, QEasingCurve, QPoint, QRect, pyqtSignal, QSize
+    Qt, QTimer, QEvent, QEasingCurve, QPoint, QRect, QRectF, pyqtSignal, QSize, QObject, QStandardPaths
 )
 from PyQt6.QtGui import (
     QAction, QFont, QIcon, QPalette, QColor, QPainter, QPixmap, QGuiApplication,
-    QMovie, QBrush, QFontMetricsF, QShortcut, QKeySequence, QCursor, QGuiApplication
+    QMovie, QBrush, QFontMetricsF, QImage, QShortcut, QKeySequence, QCursor, QGuiApplication, QRegion
 )
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QMainWindow, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
-    QGridLayout, QFrame, QMessageBox, QSizePolicy, QSpacerItem, QProgressBar, QGraphicsDropShadowEffect,
-    QGraphicsColorizeEffect, QScrollArea
+    QGridLayout, QFrame, QMessageBox, QSizePolicy, QProgressBar, QGraphicsBlurEffect,
+    QGraphicsColorizeEffect, QGraphicsScene, QScrollArea
 )
 
-# Media (optional): use QMediaPlayer if available; otherwise silent fallback
-try:
-    from PyQt6.QtMultimedia import QAudioOutput, QSoundEffect, QMediaPlayer
-    MULTIMEDIA_AVAILABLE = True
-except Exception:
-    MULTIMEDIA_AVAILABLE = False
+from bank import QA, QuestionBank, open_bank
+from engine import GameEngine, PRICE_LADDER, SAFE_LEVELS
+from leaderboard import Leaderboard, Score, today
+from scheduler import PlayerStore, Scheduler
+from tracing import Tracer
+
+if TYPE_CHECKING:
+    from audience import Audience
+
+# Media (optional): QtMultimedia is imported after the first frame is on
+# screen (see KBCWindow._setup_media); silent fallback if it is unavailable.
+MULTIMEDIA_AVAILABLE: Optional[bool] = None  # unknown until media setup runs
+
+class StartupProfile:
+    """Time-to-first-paint breakdown printed by --profile-startup. The
+    process-wide STARTUP covers imports and QApplication and is handed to
+    the first window; any other window gets a profile of its own, so
+    benchmarks that build many windows do not grow it."""
+    def __init__(self, t0: float):
+        self.last = t0
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self) -> str:
+        lines = ["Startup profile (ms):"]
+        total = 0.0
+        for phase, dt in self.phases:
+            total += dt
+            lines.append(f"  {phase:<22}{dt*1000:9.1f}{total*1000:10.1f}")
+        return "\n".join(lines)
+
+STARTUP = StartupProfile(_T_START)
+STARTUP.mark("imports")
 
 BASE_FONT_SIZE = 16  # adjusts globally with window size
+SCALE_STEP = 0.1     # window scale snaps to buckets of this size
+MIN_FONT_SIZE = 9    # text-fit never shrinks below this
+QUESTION_HEIGHT = 0.22  # share of the window height a question may take
 
-# ----------------------------- Data -----------------------------
-@dataclass
-class QA:
-    q: str
-    options: Tuple[str, str, str, str]
-    answer_idx: int  # 0..3
-    difficulty: str  # "easy" | "medium" | "hard"
-
-# 20 questions: 8 easy, 7 medium, 5 hard
-QUESTIONS: List[QA] = [
-    # Easy (1-8)
-    QA("In which movie did Mahesh Babu play the character 'Pokiri'?",
-       ("Athadu", "Pokiri", "Okkadu", "Businessman"), 1, "easy"),
-    QA("Which actor is known as 'Megastar' in Tollywood?",
-       ("Chiranjeevi", "Balakrishna", "Nagarjuna", "Pawan Kalyan"), 0, "easy"),
-    QA("The song 'Butta Bomma' is from which movie?",
-       ("Ala Vaikunthapurramuloo", "DJ", "Sarrainodu", "Race Gurram"), 0, "easy"),
-    QA("Who played the role of Baahubali in the Baahubali series?",
-       ("Rana Daggubati", "Prabhas", "NTR Jr.", "Allu Arjun"), 1, "easy"),
-    QA("In 'Arjun Reddy', who played the lead role?",
-       ("Vijay Deverakonda", "Nani", "Sharwanand", "Varun Tej"), 0, "easy"),
-    QA("'Pushpa: The Rise' stars which actor as Pushpa Raj?",
-       ("Mahesh Babu", "Allu Arjun", "Ram Charan", "NTR Jr."), 1, "easy"),
-    QA("The movie 'Magadheera' was directed by?",
-       ("S. S. Rajamouli", "Trivikram", "Puri Jagannadh", "Sukumar"), 0, "easy"),
-    QA("Which movie popularly uses the chant 'Jai Balayya'?",
-       ("Simha", "Legend", "Akhanda", "Gautamiputra Satakarni"), 2, "easy"),
-
-    # Medium (9-15)
-    QA("In 'Srimanthudu', Mahesh Babu's character name is?",
-       ("Harsha", "Ramesh", "Gopi", "Surya"), 0, "medium"),
-    QA("Which Tollywood movie was a major sleeper hit and praised in 2023 for its rural drama?",
-       ("RRR", "Dasara", "Balagam", "Karthikeya 2"), 2, "medium"),
-    QA("'Eega' features which actor as the main villain?",
-        ("Kichcha Sudeep", "Jagapathi Babu", "Sonu Sood", "Suman"), 0, "medium"),
-    QA("Who composed the music for 'RRR'?",
-       ("Devi Sri Prasad", "M. M. Keeravani", "Thaman S", "Anirudh"), 1, "medium"),
-    QA("In 'Temper', which actor played the antagonist Daya's foil?",
-       ("Prakash Raj", "Sonu Sood", "Posani", "Ajay"), 1, "medium"),
-    QA("'Legend' is a film of which actor?",
-       ("Chiranjeevi", "Nandamuri Balakrishna", "Venkatesh", "Ravi Teja"), 1, "medium"),
-    QA("In 'Sye', students clash using which sport?",
-       ("Cricket", "Football", "Rugby", "Kabaddi"), 2, "medium"),
-
-    # Hard (16-20)
-    QA("In which year was the classic 'Mayabazar' released?",
-       ("1955", "1957", "1960", "1962"), 1, "hard"),
-    QA("Who portrayed 'Kattappa' in Baahubali?",
-       ("Sathyaraj", "Nassar", "Prabhakar", "Subbaraju"), 0, "hard"),
-    QA("Which was among the earliest Telugu films to win National Award (Feature Film category) recognition?",
-       ("Shankarabharanam", "Maa Bhoomi", "Pathala Bhairavi", "Bhuvan Shome"), 1, "hard"),
-    QA("Who directed the classic 'Sankarabharanam'?",
-       ("K. Viswanath", "Bapu", "K. Raghavendra Rao", "Dasari Narayana Rao"), 0, "hard"),
-    QA("Which movie features the Brahmanandam character 'Galeejam'?",
-       ("Ready", "Dhee", "King", "Race Gurram"), 1, "hard"),
-]
-
-PRICE_LADDER = [
-    1000, 2000, 3000, 5000, 10000,
-    20000, 40000, 80000, 160000, 320000,
-    640000, 1250000, 2500000, 5000000, 10000000,
-    20000000, 30000000, 40000000, 50000000, 100000000
-]
-
-SAFE_LEVELS = {4, 9, 14}  # after Q5, Q10, Q15 (0-indexed) — optional checkpoints
+# ----------------------------- Tracing -----------------------------
+# Set by --trace. While None every hook below is a single global lookup.
+TRACER: Optional[Tracer] = None
+
+def single_shot(ms: int, fn, name: str):
+    """QTimer.singleShot that shows up by name (and lateness) in traces."""
+    if TRACER is None:
+        QTimer.singleShot(ms, fn)
+        return
+    due = time.perf_counter_ns() + ms * 1_000_000
+    def fire():
+        t0 = time.perf_counter_ns()
+        TRACER.timer_jitter(name, (t0 - due) / 1e6)
+        fn()
+        TRACER.complete(name, "timer", t0, time.perf_counter_ns())
+    QTimer.singleShot(ms, fire)
+
+def traced(fn):
+    """Record each call of a slot as a span named after it."""
+    name = fn.__name__
+    def wrapper(*args, **kwargs):
+        if TRACER is None:
+            return fn(*args, **kwargs)
+        t0 = time.perf_counter_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            TRACER.complete(name, "slot", t0, time.perf_counter_ns())
+    wrapper.__name__ = name
+    return wrapper
+
+class TracingApplication(QApplication):
+    """QApplication that times every dispatched event of interest."""
+    CATEGORIES = {
+        QEvent.Type.Timer: "timer", QEvent.Type.Paint: "paint", QEvent.Type.UpdateRequest: "frame",
+        QEvent.Type.LayoutRequest: "layout", QEvent.Type.Resize: "layout",
+        QEvent.Type.Polish: "polish", QEvent.Type.PolishRequest: "polish", QEvent.Type.StyleChange: "polish",
+        QEvent.Type.MetaCall: "slot", QEvent.Type.MouseButtonPress: "input",
+        QEvent.Type.MouseButtonRelease: "input", QEvent.Type.KeyPress: "input",
+    }
+
+    def __init__(self, argv: List[str], tracer: Tracer):
+        super().__init__(argv)
+        self.tracer = tracer
+        self._last_fire: Dict[int, int] = {}  # repeating QTimer -> previous timeout (ns)
+
+    def notify(self, receiver, event) -> bool:
+        cat = self.CATEGORIES.get(event.type())
+        if cat is None:
+            return super().notify(receiver, event)
+        t0 = time.perf_counter_ns()
+        name = type(receiver).__name__
+        if cat == "timer" and isinstance(receiver, QTimer):
+            name = receiver.objectName() or name
+            if not receiver.isSingleShot():
+                self._timer_jitter(receiver, name, t0)
+        elif cat == "input" or cat == "paint":
+            name = f"{name}#{receiver.objectName()}" if receiver.objectName() else name
+        try:
+            return super().notify(receiver, event)
+        finally:
+            self.tracer.complete(name, cat, t0, time.perf_counter_ns())
+
+    def _timer_jitter(self, timer: QTimer, name: str, now: int):
+        key = id(timer)
+        last = self._last_fire.get(key)
+        self._last_fire[key] = now
+        interval = timer.interval()
+        if last is not None and interval:
+            dt = (now - last) / 1e6
+            if dt < interval * 4:  # otherwise the timer was stopped and restarted
+                self.tracer.timer_jitter(name, dt - interval)
 
 # ----------------------------- UI Helpers -----------------------------
+@lru_cache(maxsize=4096)
+def fit_point_size(text: str, font_desc: str, max_pt: int, width: int, height: int, wrap: bool) -> int:
+    """Largest point size <= max_pt at which ``text`` fits in width x height
+    px. Binary search, memoized: re-fitting a seen text at a seen size is a
+    dict lookup."""
+    font = QFont()
+    font.fromString(font_desc)
+    flags = int(Qt.TextFlag.TextWordWrap.value) if wrap else 0
+    bounds = QRectF(0, 0, max(1, width), 1e6)
+    lo, hi = MIN_FONT_SIZE, max(MIN_FONT_SIZE, max_pt)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        font.setPointSize(mid)
+        r = QFontMetricsF(font).boundingRect(bounds, flags, text)
+        if r.width() <= width and r.height() <= height:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+@dataclass
+class PreparedQuestion:
+    """Texts and fitted fonts for one question, ready to swap in."""
+    idx: int
+    qa: QA
+    question: str
+    options: List[str]
+    question_font: QFont
+    option_font: QFont
+    size: QSize  # window size the fonts were fitted for
+
 DARK_BG = QColor("#0B132B")
 DARK_CARD = QColor("#1C2541")
 ACCENT = QColor("#F0C419")  # gold
@@ -126,52 +212,344 @@ WRONG = QColor("#D9534F")
 RIGHT = QColor("#4CAF50")
 NEUTRAL = QColor("#3A506B")
 
+CONFETTI_EMOJIS = ("🎉", "✨", "🎊", "🥳", "💥")
+CONFETTI_TILE = 64  # px; granularity of the dirty-region grid
+FLASH_STEP = 0.16   # s per on/off step of a button flash
+
+# Rasterized emoji sprites, keyed by (glyph, pixel size, device pixel ratio).
+# Shaping color emoji is the expensive part of drawText, so do it once.
+_SPRITE_CACHE: Dict[Tuple[str, int, float], QPixmap] = {}
+
+def emoji_sprite(ch: str, px: int, dpr: float = 1.0) -> QPixmap:
+    key = (ch, px, dpr)
+    pm = _SPRITE_CACHE.get(key)
+    if pm is None:
+        side = int(math.ceil(px * 1.4))
+        pm = QPixmap(int(side * dpr), int(side * dpr))
+        pm.setDevicePixelRatio(dpr)
+        pm.fill(Qt.GlobalColor.transparent)
+        p = QPainter(pm)
+        p.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.TextAntialiasing)
+        font = QFont()
+        font.setPixelSize(px)
+        p.setFont(font)
+        p.drawText(QRect(0, 0, side, side), Qt.AlignmentFlag.AlignCenter, ch)
+        p.end()
+        _SPRITE_CACHE[key] = pm
+    return pm
+
+class AnimationClock(QObject):
+    """One frame-aligned tick that drives every effect.
+
+    Effects register ``step(now)`` (monotonic seconds) and return False when
+    done. The timer runs only while something animates, slows down while the
+    window is in the background and stops while it is minimized or hidden.
+    """
+    BACKGROUND_MS = 50  # tick interval while the window is not active
+
+    def __init__(self, window: QWidget):
+        super().__init__(window)
+        self.window = window
+        self._steps: Dict[object, Callable[[float], bool]] = {}
+        self._watching_handle = False
+        self.ticks = 0
+        self.timer = QTimer(self)
+        self.timer.setObjectName("animation")
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._tick)
+        window.installEventFilter(self)
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def animate(self, key, step: Callable[[float], bool]):
+        """Call ``step`` every frame until it returns False; replaces any
+        animation already running under ``key``."""
+        self._steps[key] = step
+        self._wake()
+
+    def cancel(self, key):
+        self._steps.pop(key, None)
+
+    def clear(self):
+        self._steps.clear()
+        self.timer.stop()
+
+    def finish(self):
+        """Jump every effect to its end state (buttons back in place, glows
+        off), then stop."""
+        later = time.monotonic() + 3600
+        for step in list(self._steps.values()):
+            step(later)
+        self.clear()
+
+    def _interval(self) -> Optional[int]:
+        w = self.window
+        handle = w.windowHandle()
+        if not w.isVisible() or w.isMinimized() or (handle is not None and not handle.isExposed()):
+            return None
+        if not w.isActiveWindow():
+            return self.BACKGROUND_MS
+        screen = w.screen()
+        rate = screen.refreshRate() if screen is not None else 60.0
+        return max(8, round(1000 / (rate or 60.0)))
+
+    def _wake(self):
+        interval = self._interval() if self._steps else None
+        if interval is None:
+            self.timer.stop()
+        elif not self.timer.isActive() or self.timer.interval() != interval:
+            self.timer.start(interval)
+
+    def _tick(self):
+        self.ticks += 1
+        now = time.monotonic()
+        for key, step in list(self._steps.items()):
+            if not step(now) and self._steps.get(key) is step:
+                del self._steps[key]
+        if not self._steps:
+            self.timer.stop()
+
+    def eventFilter(self, obj, event) -> bool:
+        kind = event.type()
+        if kind == QEvent.Type.Show and not self._watching_handle and self.window.windowHandle():
+            # Occlusion is only reported to the QWindow, as expose events
+            self.window.windowHandle().installEventFilter(self)
+            self._watching_handle = True
+        if kind in (QEvent.Type.Show, QEvent.Type.Hide, QEvent.Type.WindowStateChange,
+                    QEvent.Type.WindowActivate, QEvent.Type.WindowDeactivate, QEvent.Type.Expose):
+            try:
+                self._wake()
+            except RuntimeError:  # the QWindow outlives the widget during teardown
+                self.timer.stop()
+        return False
+
 class ConfettiLayer(QFrame):
-    def __init__(self, parent=None):
+    """Transparent overlay that rains emoji.
+
+    Particle state lives in NumPy arrays (structure of arrays) so a tick is
+    a handful of whole-array operations, glyphs are blitted from a
+    pre-rendered sprite atlas, and only the tiles particles touched are
+    repainted. NumPy is imported on the first burst, long after the first
+    frame (the audience model has usually loaded it by then).
+    """
+    def __init__(self, clock: AnimationClock, parent=None):
         super().__init__(parent)
+        self.clock = clock
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground)
         self.setStyleSheet("background: transparent;")
-        self.particles: List[Tuple[float, float, float, float, str]] = []
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_particles)
+        self.xs = self.ys = self.vxs = self.vys = ()
+        self.kinds = ()  # index into self.sprites
+        self.sprites: List[QPixmap] = []
+        self.sprite_side = 0
+        self._last_step = 0.0
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def _load_sprites(self):
+        px = max(12, int(self.height() * 0.04 * 96 / 72))  # pt -> px, as before
+        dpr = self.devicePixelRatioF()
+        self.sprites = [emoji_sprite(ch, px, dpr) for ch in CONFETTI_EMOJIS]
+        self.sprite_side = int(self.sprites[0].width() / dpr)
 
     def start(self, bursts: int = 40):
-        self.particles.clear()
-        w, h = self.width(), self.height()
-        emojis = ["🎉", "✨", "🎊", "🥳", "💥"]
-        for _ in range(bursts):
-            x = random.uniform(0, w)
-            y = -random.uniform(0, 120)
-            vy = random.uniform(2.0, 5.0)
-            vx = random.uniform(-1.5, 1.5)
-            ch = random.choice(emojis)
-            self.particles.append([x, y, vx, vy, ch])
-        self.timer.start(16)
+        import numpy as np
+        self._load_sprites()
+        rng = np.random.default_rng(random.getrandbits(64))
+        uniform = lambda lo, hi: rng.uniform(lo, hi, bursts).astype(np.float32)
+        self.xs = uniform(0.0, self.width())
+        self.ys = uniform(-120.0, 0.0)
+        self.vxs = uniform(-1.5, 1.5)
+        self.vys = uniform(2.0, 5.0)
+        self.kinds = rng.integers(len(CONFETTI_EMOJIS), size=bursts, dtype=np.uint8)
+        self._last_step = time.monotonic()
+        self.clock.animate(self, self._step)
         self.show()
+        self.update()
 
-    def update_particles(self):
-        w, h = self.width(), self.height()
-        alive = []
-        for p in self.particles:
-            p[0] += p[2]
-            p[1] += p[3]
-            p[2] *= 0.99
-            if p[1] < h + 40:
-                alive.append(p)
-        self.particles = alive
-        if not self.particles:
-            self.timer.stop()
+    def _step(self, now: float) -> bool:
+        # Velocities are per 60 Hz frame; scale by the time actually elapsed
+        frames = min(4.0, (now - self._last_step) * 60)
+        self._last_step = now
+        return self.update_particles(frames)
+
+    def update_particles(self, frames: float = 1.0) -> bool:
+        """Advance by ``frames``; returns False once every particle is gone."""
+        import numpy as np
+        if not len(self.xs):
             self.hide()
-        self.update()
+            return False
+        before = self._tiles(self.xs, self.ys)
+        xs = self.xs + self.vxs * np.float32(frames)
+        ys = self.ys + self.vys * np.float32(frames)
+        alive = ys < self.height() + 40
+        if not alive.any():
+            self.xs = self.ys = self.vxs = self.vys = self.kinds = ()
+            self.hide()
+            return False
+        if not alive.all():
+            xs, ys = xs[alive], ys[alive]
+            self.vxs, self.vys, self.kinds = self.vxs[alive], self.vys[alive], self.kinds[alive]
+        self.xs, self.ys = xs, ys
+        self.vxs *= np.float32(0.99 ** frames)  # drag
+        keys = np.unique(np.concatenate((before, self._tiles(xs, ys))))
+        tx, ty = (keys & 0xFFFF) - 0x8000, (keys >> 16) - 0x8000
+        self.update(self._dirty_region(zip(tx.tolist(), ty.tolist())))
+        return True
+
+    def _tiles(self, xs, ys):
+        """Tile of each particle's top-left corner, packed as one int64 key
+        (row << 16 | column, both offset to stay positive) so np.unique is a
+        plain sort."""
+        import numpy as np
+        # Truncate then floor-divide, as int(x) // tile does
+        tx = xs.astype(np.int64) // CONFETTI_TILE + 0x8000
+        ty = (ys.astype(np.int64) - self.sprite_side) // CONFETTI_TILE + 0x8000
+        return ty << 16 | tx
+
+    def _dirty_region(self, tiles) -> QRegion:
+        # Each sprite can straddle into the neighbouring tile; merge horizontal
+        # runs per tile row so the region stays a handful of rectangles.
+        tile = CONFETTI_TILE
+        span = 1 + self.sprite_side // tile
+        rows: Dict[int, set] = {}
+        for tx, ty in tiles:
+            cols = rows.setdefault(ty, set())
+            cols.update(range(tx, tx + span + 1))
+        region = QRegion()
+        for ty, cols in rows.items():
+            cols = sorted(cols)
+            run_start = prev = cols[0]
+            for c in cols[1:] + [None]:
+                if c is not None and c == prev + 1:
+                    prev = c
+                    continue
+                region += QRect(run_start * tile, ty * tile, (prev - run_start + 1) * tile, tile * (span + 1))
+                if c is not None:
+                    run_start = prev = c
+        return region
 
     def paintEvent(self, e):
+        if not len(self.xs):
+            return
+        import numpy as np
+        clip = e.rect()
+        side = self.sprite_side
+        xs = self.xs.astype(np.int32)
+        ys = self.ys.astype(np.int32) - side
+        # Only the particles inside the repainted area reach the Python loop
+        seen = ((ys <= clip.bottom()) & (ys + side >= clip.top()) &
+                (xs <= clip.right()) & (xs + side >= clip.left()))
+        sprites = self.sprites
         painter = QPainter(self)
-        painter.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.TextAntialiasing)
-        font = painter.font()
-        font.setPointSize(int(self.height() * 0.04))
-        painter.setFont(font)
-        for x, y, _, _, ch in self.particles:
-            painter.drawText(QPoint(int(x), int(y)), ch)
+        for x, y, k in zip(xs[seen].tolist(), ys[seen].tolist(), self.kinds[seen].tolist()):
+            painter.drawPixmap(x, y, sprites[k])
+        painter.end()
+
+# ----------------------------- Styles -----------------------------
+# Every visual state is a dynamic-property selector in one stylesheet that is
+# parsed once, when it is installed on the window. Switching state flips the
+# property and re-polishes that single widget; no CSS text is regenerated.
+BUTTON_INSET = (2 * (2 + 18), 2 * (2 + 14))  # border + padding of the button QSS (x, y)
+BUTTON_RADIUS = 14
+SHADOW_COLOR = QColor(0, 0, 0, 140)
+SHADOW_BLUR, SHADOW_OFFSET = 24, 6  # resting drop shadow (px)
+GLOW_BLUR = 40                      # halo at full glow (px)
+BLUR_MATCH = 0.4  # QGraphicsBlurEffect spreads wider than a drop shadow of the same radius
+BUTTON_STATES = {"neutral": NEUTRAL, "right": RIGHT, "wrong": WRONG, "accent": ACCENT}
+TAG_STATES = {"neutral": (NEUTRAL, TEXT, 600), "accent": (ACCENT, TEXT, 600),
+              "easy": (RIGHT, DARK_BG, 800), "medium": (ACCENT, DARK_BG, 800), "hard": (WRONG, DARK_BG, 800)}
+
+def _compile_stylesheet() -> str:
+    rules = [
+        f"QFrame#card {{ background:{DARK_CARD.name()}; border-radius:16px; }}",
+        f"QLabel#question {{ color:{TEXT.name()}; font-weight:700; }}",
+        f"QLabel#info {{ color:{TEXT.name()}; }}",
+        f"QFrame#attract {{ background:rgba({DARK_BG.red()}, {DARK_BG.green()}, {DARK_BG.blue()}, 235); }}",
+        f"""QPushButton[kbcState] {{
+                color: {TEXT.name()};
+                border: 2px solid #2E4372;
+                border-radius: {BUTTON_RADIUS}px;
+                padding: 14px 18px;
+                font-weight: 600;
+            }}""",
+    ]
+    for state, bg in BUTTON_STATES.items():
+        rules.append(f'QPushButton[kbcState="{state}"] {{ background-color:{bg.name()}; }}')
+    rules += [
+        f"QPushButton[kbcState]:hover {{ border-color:{ACCENT.name()}; }}",
+        "QPushButton[kbcState]:disabled { background-color:#2B3A55; color:#9BAEC8; }",
+        "QLabel[tag] { padding:6px 10px; border-radius:10px; }",
+    ]
+    for state, (bg, fg, weight) in TAG_STATES.items():
+        rules.append(f'QLabel[tag="{state}"] {{ background:{bg.name()}; color:{fg.name()}; font-weight:{weight}; }}')
+    return "\n".join(rules)
+
+APP_STYLESHEET = _compile_stylesheet()
+
+def set_style_state(widget: QWidget, prop: str, state: str) -> bool:
+    """Switch ``widget`` to a precompiled state; no-op if already there."""
+    if widget.property(prop) == state:
+        return False
+    widget.setProperty(prop, state)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    return True
+
+# Button shadows: a blurred rounded rect is rendered once per (color, blur,
+# dpr) into a small tile, nine-sliced to each button size and cached on the
+# button. The card behind the buttons blits them, so a repaint costs a
+# couple of drawPixmap calls instead of a live blur.
+_SHADOW_TILES: Dict[Tuple[int, int, float], QPixmap] = {}
+
+def shadow_tile(color: QColor, blur: int, dpr: float) -> QPixmap:
+    """Blurred rounded rect with a 2 px stretchable middle; slice margin is
+    ``blur + BUTTON_RADIUS + 1``."""
+    key = (color.rgba(), blur, dpr)
+    tile = _SHADOW_TILES.get(key)
+    if tile is None:
+        face = 2 * BUTTON_RADIUS + 4
+        px = math.ceil((face + 2 * blur) * dpr)
+        fmt = QImage.Format.Format_ARGB32_Premultiplied
+        src = QImage(px, px, fmt)
+        src.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(src)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(color)
+        painter.drawRoundedRect(QRectF(blur * dpr, blur * dpr, face * dpr, face * dpr),
+                                BUTTON_RADIUS * dpr, BUTTON_RADIUS * dpr)
+        painter.end()
+        # Qt's blur is only reachable through a graphics effect; use it once, offscreen
+        scene = QGraphicsScene()
+        item = scene.addPixmap(QPixmap.fromImage(src))
+        blur_effect = QGraphicsBlurEffect()
+        blur_effect.setBlurRadius(blur * dpr * BLUR_MATCH)
+        blur_effect.setBlurHints(QGraphicsBlurEffect.BlurHint.QualityHint)
+        item.setGraphicsEffect(blur_effect)
+        out = QImage(px, px, fmt)
+        out.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(out)
+        scene.render(painter, QRectF(0, 0, px, px), QRectF(0, 0, px, px))
+        painter.end()
+        tile = _SHADOW_TILES[key] = QPixmap.fromImage(out)
+        tile.setDevicePixelRatio(dpr)
+    return tile
+
+def nine_slice(painter: QPainter, target: QRectF, tile: QPixmap, margin: float):
+    """Draw ``tile`` stretched to ``target``, keeping its corners intact."""
+    dpr = tile.devicePixelRatio()
+    sm, sw, sh = margin * dpr, tile.width(), tile.height()
+    xt = (target.left(), target.left() + margin, target.right() - margin, target.right())
+    yt = (target.top(), target.top() + margin, target.bottom() - margin, target.bottom())
+    xs, ys = (0, sm, sw - sm, sw), (0, sm, sh - sm, sh)
+    for i in range(3):
+        for j in range(3):
+            painter.drawPixmap(QRectF(xt[i], yt[j], xt[i+1] - xt[i], yt[j+1] - yt[j]), tile,
+                               QRectF(xs[i], ys[j], xs[i+1] - xs[i], ys[j+1] - ys[j]))
 
 class GlowButton(QPushButton):
     def __init__(self, text: str):
@@ -179,66 +557,460 @@ class GlowButton(QPushButton):
         self.setCursor(Qt.CursorShape.PointingHandCursor)
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.setMinimumHeight(56)
-        self.setStyleSheet(self.base_stylesheet(NEUTRAL))
-        # Shadow
-        shadow = QGraphicsDropShadowEffect(self)
-        shadow.setBlurRadius(24)
-        shadow.setColor(QColor(0, 0, 0, 140))
-        shadow.setOffset(0, 6)
-        self.setGraphicsEffect(shadow)
-
-    def base_stylesheet(self, bg: QColor) -> str:
-        return f"""
-            QPushButton {{
-                background-color: {bg.name()};
-                color: {TEXT.name()};
-                border: 2px solid #2E4372;
-                border-radius: 14px;
-                padding: 14px 18px;
-                font-weight: 600;
-            }}
-            QPushButton:hover {{
-                filter: brightness(1.06);
-                border-color: {ACCENT.name()};
-            }}
-            QPushButton:disabled {{
-                background-color: #2B3A55;
-                color: #9BAEC8;
-            }}
-        """
-
-    def set_bg(self, color: QColor):
-        self.setStyleSheet(self.base_stylesheet(color))
+        self.setProperty("kbcState", "neutral")
+        self.glow = 0.0
+        self.glow_color = ACCENT
+        self._shadows: Dict[Tuple[int, int, float], QPixmap] = {}  # (rgba, blur, dpr) -> shadow at this size
+
+    def set_state(self, state: str) -> bool:
+        return set_style_state(self, "kbcState", state)
+
+    def set_glow(self, level: float, color: QColor = ACCENT):
+        """0 is the resting drop shadow, 1 a full halo in ``color``."""
+        level = round(level, 2)
+        if level == self.glow and color == self.glow_color:
+            return
+        self.glow, self.glow_color = level, color
+        self._update_shadow(self.geometry())
+
+    # -------------- Shadow --------------
+    def _shadow(self, color: QColor, blur: int) -> QPixmap:
+        dpr = self.devicePixelRatioF()
+        key = (color.rgba(), blur, dpr)
+        pm = self._shadows.get(key)
+        if pm is None:
+            w, h = self.width() + 2 * blur, self.height() + 2 * blur
+            pm = QPixmap(math.ceil(w * dpr), math.ceil(h * dpr))
+            pm.setDevicePixelRatio(dpr)
+            pm.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pm)
+            nine_slice(painter, QRectF(0, 0, w, h), shadow_tile(color, blur, dpr), blur + BUTTON_RADIUS + 1)
+            painter.end()
+            self._shadows[key] = pm
+        return pm
+
+    def paint_shadow(self, painter: QPainter):
+        """Called by the ShadowCard behind the button, in its coordinates."""
+        x, y = self.x(), self.y()
+        if self.glow < 1:
+            painter.setOpacity(1 - self.glow)
+            painter.drawPixmap(x - SHADOW_BLUR, y - SHADOW_BLUR + SHADOW_OFFSET, self._shadow(SHADOW_COLOR, SHADOW_BLUR))
+        if self.glow > 0:
+            painter.setOpacity(self.glow)
+            painter.drawPixmap(x - GLOW_BLUR, y - GLOW_BLUR, self._shadow(self.glow_color, GLOW_BLUR))
+        painter.setOpacity(1)
+
+    def shadow_rect(self, geometry: QRect) -> QRect:
+        pad = max(GLOW_BLUR, SHADOW_BLUR + SHADOW_OFFSET)
+        return geometry.adjusted(-pad, -pad, pad, pad)
+
+    def _update_shadow(self, geometry: QRect):
+        parent = self.parentWidget()
+        if parent is not None:
+            parent.update(self.shadow_rect(geometry))
+
+    def moveEvent(self, e):
+        super().moveEvent(e)
+        self._update_shadow(QRect(e.oldPos(), self.size()))
+        self._update_shadow(self.geometry())
+
+    def resizeEvent(self, e):
+        super().resizeEvent(e)
+        self._shadows.clear()  # only a new size (or dpr) needs new shadows
+        self._update_shadow(QRect(self.pos(), e.oldSize()))
+        self._update_shadow(self.geometry())
+
+class ShadowCard(QFrame):
+    """Card that paints the shadows of its GlowButtons beneath them."""
+    def __init__(self):
+        super().__init__()
+        self.setObjectName("card")
+        self.buttons: List[GlowButton] = []
+
+    def paintEvent(self, e):
+        super().paintEvent(e)
+        clip = e.rect()
+        painter = None
+        for b in self.buttons:
+            if b.isVisible() and b.shadow_rect(b.geometry()).intersects(clip):
+                if painter is None:
+                    painter = QPainter(self)
+                b.paint_shadow(painter)
+        if painter is not None:
+            painter.end()
 
 class Tag(QLabel):
-    def __init__(self, text: str, bg: QColor = NEUTRAL):
+    def __init__(self, text: str, state: str = "neutral"):
         super().__init__(text)
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.setStyleSheet(f"background:{bg.name()};color:{TEXT.name()};padding:6px 10px;border-radius:10px;font-weight:600;")
+        self.setProperty("tag", state)
+
+    def set_state(self, state: str) -> bool:
+        return set_style_state(self, "tag", state)
+
+@lru_cache(maxsize=64)
+def poll_pixmap(percent: Tuple[int, ...], width: int, height: int, dpr: float, font_desc: str) -> QPixmap:
+    """An audience poll as four labelled bars, the leader in gold. Memoized,
+    so repaints of a shown poll are a single blit."""
+    pm = QPixmap(max(1, math.ceil(width * dpr)), max(1, math.ceil(height * dpr)))
+    pm.setDevicePixelRatio(dpr)
+    pm.fill(Qt.GlobalColor.transparent)
+    p = QPainter(pm)
+    p.setRenderHints(QPainter.RenderHint.Antialiasing | QPainter.RenderHint.TextAntialiasing)
+    font = QFont()
+    font.fromString(font_desc)
+    p.setFont(font)
+    line = QFontMetricsF(font).height()
+    slot = width / 4
+    bar_w = slot * 0.6
+    top, bottom = line + 4, height - line - 4  # percent above, letter below
+    leader = max(range(4), key=lambda i: percent[i])
+    for i, pct in enumerate(percent):
+        x = i * slot
+        h = (bottom - top) * pct / 100
+        p.setPen(Qt.PenStyle.NoPen)
+        p.setBrush(ACCENT if i == leader else NEUTRAL)
+        p.drawRoundedRect(QRectF(x + (slot - bar_w) / 2, bottom - h, bar_w, h), 3, 3)
+        p.setPen(TEXT)
+        p.drawText(QRectF(x, bottom - h - line - 2, slot, line), Qt.AlignmentFlag.AlignCenter, f"{pct}%")
+        p.drawText(QRectF(x, bottom + 4, slot, line), Qt.AlignmentFlag.AlignCenter, "ABCD"[i])
+    p.end()
+    return pm
+
+class AudiencePoll(QWidget):
+    """Bar chart of the Ask-the-Audience poll; hidden until one is taken."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.percent: Optional[Tuple[int, ...]] = None
+        self.setMinimumSize(160, 140)
+        self.hide()
+
+    def set_poll(self, percent: Optional[List[int]]):
+        self.percent = tuple(percent) if percent is not None else None
+        self.setVisible(self.percent is not None)
+        self.update()
+
+    def paintEvent(self, e):
+        if self.percent is None:
+            return
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, poll_pixmap(self.percent, self.width(), self.height(),
+                                             self.devicePixelRatioF(), self.font().toString()))
+        painter.end()
+
+class PrizeLadder(QWidget):
+    """Prize ladder painted from one cached pixmap of every rung.
+
+    Only the visible slice of the cache is blitted; moving the highlight
+    re-renders two rows of it and repaints just those. Ladders taller than
+    the widget scroll with the wheel and follow the current rung.
+    """
+    ROW_PAD = 4  # px above and below the text
+    ROW_GAP = 4  # px between rows
+    INDENT = 12  # px before the text; safe rungs draw their marker in it
+
+    def __init__(self, amounts: List[int], safe_levels, parent=None):
+        super().__init__(parent)
+        self.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Expanding)
+        self._backing: Optional[QPixmap] = None
+        self.rows_rendered = 0  # rows drawn into the cache so far
+        self.set_levels(amounts, safe_levels)
+
+    def set_levels(self, amounts: List[int], safe_levels):
+        self.amounts = list(amounts)
+        self.safe = set(safe_levels)
+        self.current = -1
+        self.offset = 0  # px scrolled from the top rung
+        self._digits = max(2, len(str(len(self.amounts))))
+        self._backing = None
+        self.updateGeometry()
+        self.update()
+
+    def label(self, index: int) -> str:
+        return f"{index+1:0{self._digits}d}. ₹{self.amounts[index]:,}"
+
+    # -------------- Geometry --------------
+    def _pitch(self) -> int:
+        return self.fontMetrics().height() + 2 * self.ROW_PAD + self.ROW_GAP
+
+    def _row_rect(self, index: int) -> QRect:
+        """Rung ``index`` in content coordinates (top rung first)."""
+        pitch = self._pitch()
+        return QRect(0, (len(self.amounts) - 1 - index) * pitch, self.width(), pitch - self.ROW_GAP)
+
+    def _content_height(self) -> int:
+        return max(0, len(self.amounts) * self._pitch() - self.ROW_GAP)
+
+    def _scroll_to(self, offset: int) -> bool:
+        offset = max(0, min(offset, self._content_height() - self.height()))
+        if offset == self.offset:
+            return False
+        self.offset = offset
+        self.update()
+        return True
+
+    def sizeHint(self) -> QSize:
+        bold = QFont(self.font())
+        bold.setBold(True)
+        widest = max((self.label(i) for i in range(len(self.amounts))), key=len, default="")
+        width = QFontMetricsF(bold).horizontalAdvance(widest) + 2 * self.INDENT
+        return QSize(math.ceil(width), min(len(self.amounts), 20) * self._pitch())
+
+    def minimumSizeHint(self) -> QSize:
+        return QSize(self.sizeHint().width(), 5 * self._pitch())
+
+    # -------------- Highlight --------------
+    def set_current(self, index: int):
+        prev = self.current
+        if index == prev:
+            return
+        self.current = index
+        if self._backing is not None:
+            for i in (prev, index):
+                if 0 <= i < len(self.amounts):
+                    self._render_row(i)
+        # Keep the current rung in view, with one row of context
+        if 0 <= index < len(self.amounts):
+            row, pitch = self._row_rect(index), self._pitch()
+            if row.top() - pitch < self.offset:
+                moved = self._scroll_to(row.top() - pitch)
+            elif row.bottom() + pitch > self.offset + self.height():
+                moved = self._scroll_to(row.bottom() + pitch - self.height())
+            else:
+                moved = False
+            if moved:
+                return  # whole widget repaints
+        for i in (prev, index):
+            if 0 <= i < len(self.amounts):
+                self.update(self._row_rect(i).translated(0, -self.offset))
+
+    # -------------- Painting --------------
+    def _ensure_backing(self):
+        dpr = self.devicePixelRatioF()
+        pm = self._backing
+        if pm is not None and pm.devicePixelRatio() == dpr and pm.width() == math.ceil(self.width() * dpr):
+            return
+        pm = self._backing = QPixmap(math.ceil(self.width() * dpr), max(1, math.ceil(self._content_height() * dpr)))
+        pm.setDevicePixelRatio(dpr)
+        pm.fill(Qt.GlobalColor.transparent)
+        for i in range(len(self.amounts)):
+            self._render_row(i)
+
+    def _render_row(self, index: int):
+        rect = QRectF(self._row_rect(index))
+        painter = QPainter(self._backing)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        painter.fillRect(rect, Qt.GlobalColor.transparent)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+        font = QFont(self.font())
+        if index == self.current:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(ACCENT)
+            painter.drawRoundedRect(rect, 8, 8)
+            font.setWeight(QFont.Weight.Bold)
+            color = DARK_BG
+        elif index in self.safe:
+            # Safe-level marker: a short gold bar in the indent
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(ACCENT)
+            painter.drawRoundedRect(QRectF(rect.left() + 3, rect.top() + 5, 3, rect.height() - 10), 1.5, 1.5)
+            font.setWeight(QFont.Weight.DemiBold)
+            color = ACCENT
+        else:
+            color = TEXT
+        painter.setFont(font)
+        painter.setPen(color)
+        painter.drawText(rect.adjusted(self.INDENT, 0, -self.INDENT, 0),
+                         Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft, self.label(index))
+        painter.end()
+        self.rows_rendered += 1
+
+    def paintEvent(self, e):
+        if not self.amounts:
+            return
+        self._ensure_backing()
+        dpr = self._backing.devicePixelRatio()
+        r = QRectF(e.rect())
+        painter = QPainter(self)
+        painter.drawPixmap(r, self._backing, QRectF(r.x() * dpr, (r.y() + self.offset) * dpr,
+                                                    r.width() * dpr, r.height() * dpr))
+        content = self._content_height()
+        if content > self.height():  # slim scroll indicator
+            h = max(16, self.height() * self.height() / content)
+            y = (self.height() - h) * self.offset / (content - self.height())
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(255, 255, 255, 60))
+            painter.drawRoundedRect(QRectF(self.width() - 4, y, 3, h), 1.5, 1.5)
+        painter.end()
+
+    def wheelEvent(self, e):
+        if not self._scroll_to(self.offset - e.angleDelta().y() * self._pitch() // 120):
+            e.ignore()
+
+    def resizeEvent(self, e):
+        super().resizeEvent(e)
+        self._scroll_to(self.offset)  # re-clamp
+
+    def changeEvent(self, e):
+        super().changeEvent(e)
+        if e.type() == QEvent.Type.FontChange:
+            self._backing = None
+            self.updateGeometry()
+
+# ----------------------------- Kiosk -----------------------------
+class AttractScreen(QFrame):
+    """Overlay shown between kiosk games: the last result, today's best
+    scores and a prompt. Any click or key starts the next game."""
+    start = pyqtSignal()
+
+    def __init__(self, parent: QWidget):
+        super().__init__(parent)
+        self.setObjectName("attract")
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        layout = QVBoxLayout(self)
+        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.setSpacing(24)
+        self.title = QLabel("KBC — Tollywood Edition")
+        self.title.setObjectName("question")
+        font = QFont(self.title.font())
+        font.setPointSize(BASE_FONT_SIZE * 2)
+        self.title.setFont(font)
+        self.result = QLabel()
+        self.board = QLabel()
+        for label in (self.result, self.board):
+            label.setObjectName("info")
+            label.setWordWrap(True)
+        self.prompt = Tag("Press any key or tap to play", state="accent")
+        for w in (self.title, self.result, self.board, self.prompt):
+            w.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            layout.addWidget(w, 0, Qt.AlignmentFlag.AlignHCenter)
+        self.hide()
+
+    def present(self, result: str = "", board: str = ""):
+        self.result.setText(result)
+        self.result.setVisible(bool(result))
+        self.board.setText(board)
+        self.board.setVisible(bool(board))
+        self.setGeometry(self.parentWidget().rect())
+        self.show()
+        self.raise_()
+        self.setFocus()
+
+    def mousePressEvent(self, e):
+        self.start.emit()
+
+    def keyPressEvent(self, e):
+        if e.key() not in (Qt.Key.Key_Shift, Qt.Key.Key_Control, Qt.Key.Key_Alt, Qt.Key.Key_Meta):
+            self.start.emit()
+
+# ----------------------------- Host Mode -----------------------------
+class HostBridge(QObject):
+    """Runs host.HostServer on its own asyncio thread. Game events are handed
+    to the server loop thread-safely and audience updates come back to the
+    GUI thread through a queued signal, so neither side blocks the other."""
+    updated = pyqtSignal(dict)
+
+    def __init__(self, address: str, parent=None):
+        super().__init__(parent)
+        from host import DEFAULT_PORT, HostServer
+        host, _, port = address.rpartition(":") if ":" in address else (address, "", "")
+        self.server = HostServer(host or "0.0.0.0", int(port or DEFAULT_PORT), on_update=self.updated.emit)
+        self.server.start_in_thread()
+
+    def open_question(self, index: int, qa: QA):
+        self.server.call(self.server.open_question, index, qa)
+
+    def close_question(self):
+        self.server.call(self.server.close_question)
+
+    def shutdown(self):
+        self.server.shutdown()
+
+# ----------------------------- Leaderboard -----------------------------
+class LeaderboardCache:
+    """Leaderboard query results, reused until any kiosk commits a score
+    (PRAGMA data_version moves), so repaints and dialogs never re-query.
+    Until the board has opened, after it is closed, or while another kiosk
+    holds it, queries answer None instead of waiting or raising."""
+
+    def __init__(self, board: Leaderboard):
+        self.board = board
+        self._version = None
+        self._results: Dict[tuple, object] = {}
+        self.hits = self.misses = 0
+
+    def get(self, query: str, *args):
+        if self.board.conn is None:
+            return None
+        try:
+            version = self.board.version()
+        except sqlite3.Error:
+            return None
+        if version != self._version:
+            self._results.clear()
+            self._version = version
+        key = (query,) + args
+        if key in self._results:
+            self.hits += 1
+            return self._results[key]
+        self.misses += 1
+        try:
+            result = self._results[key] = getattr(self.board, query)(*args)
+        except sqlite3.Error:
+            return None
+        return result
 
 # ----------------------------- Main Window -----------------------------
 class KBCWindow(QMainWindow):
-    def __init__(self):
+    media_loaded = pyqtSignal()
+    leaderboard_opened = pyqtSignal()
+
+    def __init__(self, bank: Optional[QuestionBank] = None, host: Optional[str] = None,
+                 journal_path: Optional[str] = None, media: bool = True,
+                 scheduler: Optional[Scheduler] = None, leaderboard: Optional[Leaderboard] = None,
+                 player: str = "guest", kiosk: bool = False, assist_index: Optional[str] = None,
+                 audience: Optional[Audience] = None, profile: Optional[StartupProfile] = None):
         super().__init__()
+        self.startup = profile or StartupProfile(time.perf_counter())
+        self.engine = GameEngine(bank, scheduler=scheduler, audience=audience)
+        self.player = player
+        self.kiosk = kiosk  # game over returns to the attract screen instead of quitting
+        self.games_played = 0
+        self.leaderboard = leaderboard
+        self.scores = LeaderboardCache(leaderboard) if leaderboard is not None else None
         self.setWindowTitle("KBC — Tollywood Edition")
         self.resize(1100, 720)
         self.setMinimumSize(900, 620)
         self.setPalette(self._palette())
-        self.extra_life_available = True
-        self.lifelines = {
-            "5050": True,
-            "assist": True,
-            "extra": True,
-        }
-        self.current_index = 0
-        self.total_amount = 0
-        self.safe_amount = 0
-
-        # Media
-        self.bgm_player = None
-        self.sfx_correct = None
-        self.sfx_wrong = None
-        self._setup_media()
+        self.setStyleSheet(APP_STYLESHEET)
+        # Responsive fonts: resize bursts are coalesced into one relayout per frame
+        self.relayout_count = 0
+        self._font_scale = None
+        self._font_cache: Dict[Tuple[str, int], QFont] = {}
+        self._font_desc: Dict[str, str] = {}
+        self._prepared: Optional[PreparedQuestion] = None  # next question, laid out ahead
+        self._relayout_timer = QTimer(self)
+        self._relayout_timer.setObjectName("relayout")
+        self._relayout_timer.setSingleShot(True)
+        self._relayout_timer.setInterval(16)
+        self._relayout_timer.timeout.connect(self._apply_font_scale)
+        # One handle for the reveal delay, so a new game can cancel it
+        self._next_timer = QTimer(self)
+        self._next_timer.setObjectName("next_question")
+        self._next_timer.setSingleShot(True)
+        self._next_timer.setInterval(1200)
+        self._next_timer.timeout.connect(self._next)
+        # Every effect (confetti, flash, shake, glow) runs off this one tick
+        self.animations = AnimationClock(self)
+
+        # Media: loaded after the first paint so the question shows immediately
+        self.audio = None
+        self.media_enabled = media  # False: stay silent (benchmarks, soak tests)
+        self.media_ready = False
+        self.assist_index = assist_index  # fact index for Computer Assist; None: canned guess
+        self._first_paint = False
 
         # Central Layout
         central = QWidget()
@@ -248,28 +1020,23 @@ class KBCWindow(QMainWindow):
         root.setSpacing(16)
 
         # Left: Price ladder
-        self.ladder = QVBoxLayout()
-        self.ladder.setSpacing(6)
         self.ladder_box = QFrame()
-        self.ladder_box.setStyleSheet(f"background:{DARK_CARD.name()}; border-radius:16px;")
+        self.ladder_box.setObjectName("card")
         ladder_wrap = QVBoxLayout(self.ladder_box)
         ladder_wrap.setContentsMargins(12, 12, 12, 12)
         ladder_wrap.addWidget(QLabel("Prize Ladder"))
-        self.ladder_area = QVBoxLayout()
-        ladder_wrap.addLayout(self.ladder_area)
-        ladder_spacer = QSpacerItem(10, 10, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
-        ladder_wrap.addItem(ladder_spacer)
-        self._build_ladder()
+        self.ladder = PrizeLadder(PRICE_LADDER, SAFE_LEVELS)
+        ladder_wrap.addWidget(self.ladder, 1)
+        self._highlight_ladder(0)
 
         # Center: Question + Answers
-        center_box = QFrame()
-        center_box.setStyleSheet(f"background:{DARK_CARD.name()}; border-radius:16px;")
+        center_box = ShadowCard()
         center = QVBoxLayout(center_box)
         center.setContentsMargins(16, 16, 16, 16)
         center.setSpacing(12)
 
-        self.difficulty_tag = Tag("Easy", bg=RIGHT)
-        self.amount_tag = Tag("₹0", bg=ACCENT)
+        self.difficulty_tag = Tag("Easy", state="easy")
+        self.amount_tag = Tag("₹0", state="accent")
 
         header = QHBoxLayout()
         header.addWidget(self.difficulty_tag)
@@ -279,7 +1046,7 @@ class KBCWindow(QMainWindow):
         self.question_label = QLabel()
         self.question_label.setWordWrap(True)
         self.question_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.question_label.setStyleSheet(f"color:{TEXT.name()}; font-weight:700;")
+        self.question_label.setObjectName("question")
 
         self.grid = QGridLayout()
         self.grid.setHorizontalSpacing(12)
@@ -298,20 +1065,24 @@ class KBCWindow(QMainWindow):
         self.grid.addWidget(self.btnD, 1, 1)
 
         # Lifelines
-        life_box = QHBoxLayout()
+        life_box = QGridLayout()
         life_box.setSpacing(8)
         self.life_5050 = GlowButton("50-50")
         self.life_5050.clicked.connect(self.use_5050)
         self.life_assist = GlowButton("Computer Assist")
         self.life_assist.clicked.connect(self.use_assist)
+        self.life_audience = GlowButton("Audience Poll")
+        self.life_audience.clicked.connect(self.use_audience)
         self.life_extra = GlowButton("Extra Life")
         self.life_extra.clicked.connect(self.use_extra)
-        for b in (self.life_5050, self.life_assist, self.life_extra):
+        for i, b in enumerate((self.life_5050, self.life_assist, self.life_audience, self.life_extra)):
             b.setMinimumHeight(44)
-        life_box.addWidget(self.life_5050)
-        life_box.addWidget(self.life_assist)
-        life_box.addWidget(self.life_extra)
+            # Equal columns; _apply_font_scale fits the labels to them
+            b.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Expanding)
+            life_box.addWidget(b, i // 2, i % 2)
 
+        center_box.buttons = [self.btnA, self.btnB, self.btnC, self.btnD,
+                              self.life_5050, self.life_assist, self.life_audience, self.life_extra]
         center.addLayout(header)
         center.addWidget(self.question_label)
         center.addLayout(self.grid)
@@ -320,249 +1091,449 @@ class KBCWindow(QMainWindow):
 
         # Right: Status/Info
         right_box = QFrame()
-        right_box.setStyleSheet(f"background:{DARK_CARD.name()}; border-radius:16px;")
+        right_box.setObjectName("card")
         right = QVBoxLayout(right_box)
         right.setContentsMargins(12, 12, 12, 12)
         self.info_label = QLabel("Welcome to KBC — Tollywood Edition!\nAnswer wisely.")
         self.info_label.setWordWrap(True)
-        self.info_label.setStyleSheet(f"color:{TEXT.name()};")
+        self.info_label.setObjectName("info")
         right.addWidget(self.info_label)
+        self.poll_chart = AudiencePoll()
+        right.addWidget(self.poll_chart)
+        self.audience_label = QLabel()
+        self.audience_label.setWordWrap(True)
+        self.audience_label.setObjectName("info")
+        self.audience_label.hide()
+        right.addWidget(self.audience_label)
         right.addStretch(1)
+        self.leaderboard_label = QLabel()
+        self.leaderboard_label.setWordWrap(True)
+        self.leaderboard_label.setObjectName("info")
+        self.leaderboard_label.hide()
+        right.addWidget(self.leaderboard_label)
 
         root.addWidget(self.ladder_box, 1)
         root.addWidget(center_box, 2)
         root.addWidget(right_box, 1)
 
         # Confetti overlay
-        self.confetti = ConfettiLayer(self)
+        self.confetti = ConfettiLayer(self.animations, self)
         self.confetti.setGeometry(self.rect())
         self.confetti.hide()
 
+        # Kiosk: attract screen between games
+        self.attract = None
+        if kiosk:
+            self.attract = AttractScreen(self)
+            self.attract.start.connect(self.new_game)
+
         # Keyboard shortcuts
-        QShortcut(QKeySequence("A"), self, activated=lambda: self.select_option(0))
-        QShortcut(QKeySequence("B"), self, activated=lambda: self.select_option(1))
-        QShortcut(QKeySequence("C"), self, activated=lambda: self.select_option(2))
-        QShortcut(QKeySequence("D"), self, activated=lambda: self.select_option(3))
+        # (off while the attract screen is up, so A-D start a game there)
+        self._answer_keys = [QShortcut(QKeySequence(letter), self, activated=lambda i=i: self.select_option(i))
+                             for i, letter in enumerate("ABCD")]
 
-        self.load_question(0)
+        # Host mode: audience answers from phones over the LAN
+        self.host_bridge = None
+        if host is not None:
+            try:
+                self.host_bridge = HostBridge(host, self)
+            except OSError as e:  # e.g. the port is already in use
+                self.audience_label.setText(f"Host mode unavailable: {e.strerror or e}")
+            else:
+                self.host_bridge.updated.connect(self._on_audience_update)
+                self.audience_label.setText(f"Host mode on port {self.host_bridge.server.port}")
+            self.audience_label.show()
+
+        self.startup.mark("widget construction")
+        # Session journal: resume a game the previous process did not finish
+        self.journal = None
+        resumed = False
+        if journal_path:
+            from journal import JournalWriter, read_last_game, replay
+            self.journal = JournalWriter(journal_path)
+            try:
+                resumed = replay(self.engine, read_last_game(journal_path))
+            except Exception:
+                resumed = False  # unreadable game: start afresh rather than fail every launch
+            self.engine.listener = self.journal.append
+            if not resumed:
+                self.journal.rotate()
+                self.engine.reset()
+        if resumed:
+            self._resume()
+        else:
+            self.load_question(0)
+        self._show_leaderboard()
+        if leaderboard is not None and leaderboard.conn is None:
+            # Opening runs WAL setup and the schema, which may wait on
+            # another kiosk's lock; the queued signal fills the panel in
+            self.leaderboard_opened.connect(self._show_leaderboard)
+            leaderboard.open_in_thread(self.leaderboard_opened.emit)
+        if kiosk and not resumed:
+            self._show_attract()
+        self.startup.mark("first load_question")
 
     # -------------- Media --------------
+    def paintEvent(self, e):
+        super().paintEvent(e)
+        if not self._first_paint:
+            self._first_paint = True
+            self.startup.mark("show + first paint")
+            single_shot(0, self._setup_media, "setup_media")
+            single_shot(0, self._setup_assist, "setup_assist")
+            single_shot(0, self._setup_audience, "setup_audience")
+
     def _setup_media(self):
-        if not MULTIMEDIA_AVAILABLE:
+        global MULTIMEDIA_AVAILABLE
+        try:
+            if not self.media_enabled:
+                raise ImportError("media disabled")
+            from audio import AudioEngine
+            self.audio = AudioEngine(os.path.join(os.path.dirname(__file__), "assets"), self)
+            self.audio.start_bgm()
+            MULTIMEDIA_AVAILABLE = True
+        except Exception:
+            self.audio = None
+            MULTIMEDIA_AVAILABLE = False
+        self.media_ready = True
+        self.startup.mark("media")
+        self.media_loaded.emit()
+
+    def _setup_assist(self):
+        # Opening the index maps a few files (building it first if the fact
+        # corpus changed); done after the first frame like media
+        if self.assist_index is None:
             return
-        assets = os.path.join(os.path.dirname(__file__), "assets")
-        bgm = os.path.join(assets, "bgm.mp3")
-        self.bgm_player = QMediaPlayer()
-        if os.path.exists(bgm):
-            try:
-                from PyQt6.QtCore import QUrl
-                self.audio_out = QAudioOutput()
-                self.bgm_player.setAudioOutput(self.audio_out)
-                self.bgm_player.setSource(QUrl.fromLocalFile(bgm))
-                self.audio_out.setVolume(0.35)
-                self.bgm_player.play()
-                # loop timer
-                self.loop_timer = QTimer(self)
-                self.loop_timer.timeout.connect(lambda: self.bgm_player.play())
-                self.loop_timer.start(60_000)  # naive loop; adjust to your track length
-            except Exception:
-                self.bgm_player = None
-        # SFX
-        assets = os.path.join(os.path.dirname(__file__), "assets")
-        correct = os.path.join(assets, "correct.wav")
-        wrong = os.path.join(assets, "wrong.wav")
-        if os.path.exists(correct):
-            self.sfx_correct = QSoundEffect()
-            from PyQt6.QtCore import QUrl
-            self.sfx_correct.setSource(QUrl.fromLocalFile(correct))
-            self.sfx_correct.setVolume(0.8)
-        if os.path.exists(wrong):
-            self.sfx_wrong = QSoundEffect()
-            from PyQt6.QtCore import QUrl
-            self.sfx_wrong.setSource(QUrl.fromLocalFile(wrong))
-            self.sfx_wrong.setVolume(0.8)
+        try:
+            from assist import open_assistant
+            self.engine.assistant = open_assistant(self.assist_index)
+        except Exception:
+            self.engine.assistant = None  # canned assist still works
 
-    # -------------- Ladder --------------
-    def _build_ladder(self):
-        # Clear
-        while self.ladder_area.count():
-            item = self.ladder_area.takeAt(0)
-            w = item.widget()
-            if w:
-                w.deleteLater()
-        self.ladder_labels: List[QLabel] = []
-        for i, amt in enumerate(reversed(PRICE_LADDER)):
-            idx = len(PRICE_LADDER) - 1 - i
-            lab = QLabel(f"{idx+1:02d}. ₹{amt:,}")
-            lab.setStyleSheet(f"color:{TEXT.name()}; padding:4px 6px; border-radius:8px;")
-            self.ladder_area.addWidget(lab)
-            self.ladder_labels.append(lab)
-        self._highlight_ladder(0)
+    def _setup_audience(self):
+        # NumPy and the crowd model load here rather than on the first poll
+        if self.engine.audience is None:
+            from audience import Audience
+            self.engine.audience = Audience(self.engine.rng.getrandbits(64))
 
+    # -------------- Ladder --------------
     def _highlight_ladder(self, q_index: int):
-        # Reset all
-        total = len(PRICE_LADDER)
-        for i, lab in enumerate(self.ladder_labels):
-            lab.setStyleSheet(f"color:{TEXT.name()}; padding:4px 6px; border-radius:8px;")
-        # Highlight current
-        ri = total - 1 - q_index
-        if 0 <= ri < len(self.ladder_labels):
-            self.ladder_labels[ri].setStyleSheet(
-                f"color:{DARK_BG.name()}; background:{ACCENT.name()}; padding:4px 6px; border-radius:8px; font-weight:700;"
-            )
+        self.ladder.set_current(q_index)
 
     # -------------- Core --------------
+    @traced
     def load_question(self, idx: int):
-        self.current_index = idx
-        qa = QUESTIONS[idx]
-        self.question_label.setText(f"Q{idx+1}. {qa.q}")
-        self.btnA.setText(f"A) {qa.options[0]}")
-        self.btnB.setText(f"B) {qa.options[1]}")
-        self.btnC.setText(f"C) {qa.options[2]}")
-        self.btnD.setText(f"D) {qa.options[3]}")
-        for b in (self.btnA, self.btnB, self.btnC, self.btnD):
+        self.engine.current_index = idx
+        self.engine.mark_shown()
+        prepared = self._prepared
+        self._prepared = None
+        if prepared is None or prepared.idx != idx or prepared.size != self.size():
+            prepared = self._prepare(idx)
+        qa = prepared.qa
+        # Fonts were fitted ahead of time, so this is just the swap
+        self._apply_fonts(prepared)
+        self.question_label.setText(prepared.question)
+        for b, text in zip((self.btnA, self.btnB, self.btnC, self.btnD), prepared.options):
+            b.setText(text)
             b.setEnabled(True)
-            b.set_bg(NEUTRAL)
+            b.set_state("neutral")
         # lifeline buttons reflect availability
-        self.life_5050.setEnabled(self.lifelines["5050"]) 
-        self.life_assist.setEnabled(self.lifelines["assist"]) 
-        self.life_extra.setEnabled(self.lifelines["extra"]) 
+        lifelines = self.engine.lifelines
+        self.life_5050.setEnabled(lifelines["5050"])
+        self.life_assist.setEnabled(lifelines["assist"])
+        self.life_audience.setEnabled(lifelines["audience"])
+        self.life_extra.setEnabled(lifelines["extra"])
+        self.poll_chart.set_poll(self.engine.poll)
         # difficulty tag
-        diff = qa.difficulty.capitalize()
-        color = RIGHT if qa.difficulty == "easy" else (ACCENT if qa.difficulty == "medium" else WRONG)
-        self.difficulty_tag.setText(diff)
-        self.difficulty_tag.setStyleSheet(f"background:{color.name()};color:{DARK_BG.name()};padding:6px 10px;border-radius:10px;font-weight:800;")
+        self.difficulty_tag.setText(qa.difficulty.capitalize())
+        self.difficulty_tag.set_state(qa.difficulty)
         # amount tag
-        self.amount_tag.setText(f"₹{self.total_amount:,}")
+        self.amount_tag.setText(f"₹{self.engine.total_amount:,}")
         self._highlight_ladder(idx)
         self.info_label.setText("Choose your answer or use a lifeline.")
+        if self.host_bridge:
+            self.host_bridge.open_question(idx, qa)
 
+    @traced
     def select_option(self, idx: int):
         # Ignore if disabled
         buttons = [self.btnA, self.btnB, self.btnC, self.btnD]
-        if not buttons[idx].isEnabled():
+        if not buttons[idx].isEnabled() or self._attract_up():
+            return
+        result = self.engine.answer(idx)
+        if result is None:
             return
-        qa = QUESTIONS[self.current_index]
+        if self.host_bridge:
+            self.host_bridge.close_question()
         for b in buttons:
             b.setEnabled(False)
-        is_correct = (idx == qa.answer_idx)
-        if is_correct:
-            buttons[idx].set_bg(RIGHT)
+        if result.correct:
+            buttons[idx].set_state("right")
             self._play_correct()
+            self._glow(buttons[idx], RIGHT)
             self._confetti()
-            self.total_amount += PRICE_LADDER[self.current_index]
-            self.amount_tag.setText(f"₹{self.total_amount:,}")
-            if self.current_index in SAFE_LEVELS:
-                self.safe_amount = self.total_amount
-            QTimer.singleShot(1200, self._next)
+            self.amount_tag.setText(f"₹{self.engine.total_amount:,}")
+            self._schedule_next()
         else:
-            buttons[idx].set_bg(WRONG)
-            buttons[qa.answer_idx].set_bg(RIGHT)
+            buttons[idx].set_state("wrong")
+            buttons[result.answer_idx].set_state("right")
             self._play_wrong()
-            if self.lifelines["extra"] is False and self.extra_life_available is False:
-                # consumed already, fall through
-                pass
-            if self.lifelines["extra"] is False and self.extra_life_available is True:
-                # shouldn't happen; flag safety
-                pass
-            # Extra life logic
-            if self.lifelines["extra"] is False:
-                # already used earlier, no protection now
-                self._end_game(False)
+            self._shake(buttons[idx], self.grid)
+            if result.extra_life_used:
+                self.life_extra.setEnabled(False)
+                self.info_label.setText("Extra Life consumed! You may continue.")
+                self._schedule_next()
             else:
-                # consume extra life if available
-                if self.extra_life_available:
-                    self.extra_life_available = False
-                    self.lifelines["extra"] = False
-                    self.life_extra.setEnabled(False)
-                    self.info_label.setText("Extra Life consumed! You may continue.")
-                    QTimer.singleShot(1200, self._next)
-                else:
-                    self._end_game(False)
+                self._end_game(False)
+
+    def _resume(self):
+        engine = self.engine
+        self.load_question(engine.current_index)
+        buttons = [self.btnA, self.btnB, self.btnC, self.btnD]
+        for i in engine.removed:
+            buttons[i].setEnabled(False)
+            buttons[i].setText("—")
+        self.life_5050.setEnabled(engine.lifelines["5050"])
+        self.life_assist.setEnabled(engine.lifelines["assist"])
+        self.life_audience.setEnabled(engine.lifelines["audience"])
+        self.info_label.setText("Welcome back! Your game has been restored.")
+        if engine.answered:
+            # Crashed between answering and the next question
+            for b in buttons:
+                b.setEnabled(False)
+            self._schedule_next()
+
+    def _schedule_next(self):
+        """Advance after the reveal delay, preparing the next question meanwhile."""
+        single_shot(0, self._prefetch, "prefetch")
+        self._next_timer.start()
 
+    @traced
+    def _prefetch(self):
+        idx = self.engine.current_index + 1
+        if idx < self.engine.num_questions and not self.engine.finished:
+            self._prepared = self._prepare(idx)
+
+    @traced
     def _next(self):
-        if self.current_index + 1 >= len(QUESTIONS):
+        if not self.engine.answered or self.engine.finished:
+            return  # fired after game over, or in a game that has since been replaced
+        if not self.engine.advance():
             self._end_game(True)
             return
-        self.load_question(self.current_index + 1)
+        self.load_question(self.engine.current_index)
 
     def _end_game(self, completed: bool):
-        msg = QMessageBox(self)
-        msg.setWindowTitle("Game Over")
+        amount = self.engine.total_amount
+        self.games_played += 1
         if completed:
-            msg.setText(f"🏆 Congratulations! You completed all questions!\nTotal Winnings: ₹{self.total_amount:,}")
+            text = f"🏆 Congratulations! You completed all questions!\nTotal Winnings: ₹{amount:,}"
         else:
-            fallback = max(self.safe_amount, 0)
-            msg.setText(f"❌ Wrong Answer!\nYou take home: ₹{fallback:,}")
-            self.total_amount = fallback
+            text = f"❌ Wrong Answer!\nYou take home: ₹{amount:,}"
+        if self.leaderboard is not None:
+            # Ranked against the games already stored; this one is still queued
+            ranked = self.scores.get("rank", amount, today())
+            if ranked is not None:
+                rank, games = ranked
+                text += f"\nToday's rank: #{rank:,} of {games + 1:,} games"
+            self.leaderboard.submit(Score(self.player, amount, completed,
+                                          self.engine.current_index + int(completed)))
+        if self.kiosk:
+            self._show_attract(text)
+            return
+        msg = QMessageBox(self)
+        msg.setWindowTitle("Game Over")
+        msg.setText(text)
         msg.setStandardButtons(QMessageBox.StandardButton.Ok)
         msg.exec()
         self.close()
 
+    # -------------- Kiosk --------------
+    def _show_attract(self, result: str = ""):
+        self._next_timer.stop()
+        for key in self._answer_keys:
+            key.setEnabled(False)
+        self.attract.present(result, self._top_scores_text())
+
+    def _attract_up(self) -> bool:
+        """True while the attract screen covers the game; the hidden
+        question must not take answers or lifelines."""
+        return self.attract is not None and self.attract.isVisible()
+
+    def keyPressEvent(self, e):
+        # Keys land here when focus sits on a widget under the attract screen
+        if self._attract_up():
+            self.attract.keyPressEvent(e)
+        else:
+            super().keyPressEvent(e)
+
+    @traced
+    def new_game(self):
+        """Start the next game in place: the widgets, media players, fitted
+        fonts and shadow caches all carry over."""
+        self.attract.hide()
+        self._next_timer.stop()
+        for key in self._answer_keys:
+            key.setEnabled(True)
+        engine = self.engine
+        untouched = (engine.current_index == 0 and not engine.answered and not engine.finished
+                     and all(engine.lifelines.values()))
+        if untouched:
+            return  # the game drawn while the attract screen was up is still fresh
+        self.animations.finish()
+        self.confetti.hide()
+        self._prepared = None
+        if self.journal:
+            self.journal.rotate()
+        engine.reset()
+        self.load_question(0)
+        self._show_leaderboard()
+
     # -------------- Lifelines --------------
+    @traced
     def use_5050(self):
-        if not self.lifelines["5050"]:
+        if self._attract_up():
+            return
+        remove = self.engine.use_5050()
+        if remove is None:
             return
-        qa = QUESTIONS[self.current_index]
-        wrongs = [i for i in range(4) if i != qa.answer_idx]
-        remove = random.sample(wrongs, 2)
         buttons = [self.btnA, self.btnB, self.btnC, self.btnD]
         for i in remove:
             buttons[i].setEnabled(False)
             buttons[i].setText("—")
-        self.lifelines["5050"] = False
         self.life_5050.setEnabled(False)
         self.info_label.setText("50-50 used: Two wrong options removed.")
 
+    @traced
     def use_assist(self):
-        if not self.lifelines["assist"]:
+        if self._attract_up():
+            return
+        hint = self.engine.use_assist()
+        if hint is None:
             return
-        qa = QUESTIONS[self.current_index]
-        # Weighted suggestion: easier → higher certainty
-        base = {"easy": 0.75, "medium": 0.6, "hard": 0.5}[qa.difficulty]
-        probs = [ (1-base)/3 ] * 4
-        probs[qa.answer_idx] = base
-        # Convert to percentage-like and pick suggestion index
-        suggestion = max(range(4), key=lambda i: probs[i] + random.uniform(0, 0.05))
+        suggestion, pct = hint
         letters = ['A','B','C','D']
-        pct = int(probs[suggestion]*100)
         self.info_label.setText(f"Computer suggests: Option {letters[suggestion]} (~{pct}%).")
         # Subtle flash on suggested button
-        self._flash_button(suggestion, ACCENT)
-        self.lifelines["assist"] = False
+        self._flash_button(suggestion, "accent")
         self.life_assist.setEnabled(False)
 
+    @traced
+    def use_audience(self):
+        if self._attract_up():
+            return
+        poll = self.engine.use_audience()
+        if poll is None:
+            return
+        self.poll_chart.set_poll(poll)
+        leader = max(range(4), key=lambda i: poll[i])
+        self.info_label.setText(f"The audience has voted: {poll[leader]}% say Option {'ABCD'[leader]}.")
+        self.life_audience.setEnabled(False)
+
+    @traced
     def use_extra(self):
-        if not self.lifelines["extra"]:
+        if self._attract_up() or not self.engine.use_extra():
             return
-        self.extra_life_available = True
-        self.lifelines["extra"] = True  # mark as armed; will be consumed on wrong
         self.life_extra.setEnabled(False)
         self.info_label.setText("Extra Life armed: one wrong answer will be forgiven.")
 
+    # -------------- Leaderboard --------------
+    def _top_scores_text(self, k: int = 5) -> str:
+        if self.scores is None:
+            return ""
+        rows = self.scores.get("top", k, today())
+        if not rows:
+            return ""
+        lines = ["Today's top scores"]
+        lines += [f"{i}. {player}  ₹{amount:,}" for i, (player, amount, _) in enumerate(rows, 1)]
+        return "\n".join(lines)
+
+    def _show_leaderboard(self):
+        text = self._top_scores_text()
+        self.leaderboard_label.setText(text)
+        self.leaderboard_label.setVisible(bool(text))
+
+    # -------------- Host Mode --------------
+    @traced
+    def _on_audience_update(self, snap: dict):
+        tally = snap["tally"]
+        total = max(1, sum(tally))
+        bars = "  ".join(f"{l} {n*100//total}%" for l, n in zip("ABCD", tally))
+        text = f"Audience: {snap['players']:,} players, {snap['answers']:,} answers\n{bars}"
+        result = snap.get("result")
+        if result and result["top"]:
+            text += "\nTop: " + ", ".join(f"{p} ₹{s:,}" for p, s in result["top"][:3])
+        self.audience_label.setText(text)
+
+    def closeEvent(self, e):
+        if self.host_bridge:
+            self.host_bridge.shutdown()
+        if self.engine.scheduler is not None:
+            self.engine.scheduler.save()  # questions shown so far count as seen
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+        if self.leaderboard is not None:
+            try:
+                self.leaderboard_opened.disconnect(self._show_leaderboard)
+            except TypeError:
+                pass  # opened synchronously; never connected
+            self.scores = None
+            self.leaderboard.close()  # commits scores still queued
+            self.leaderboard = None
+        super().closeEvent(e)
+
     # -------------- Effects --------------
-    def _flash_button(self, idx: int, color: QColor):
+    def _flash_button(self, idx: int, state: str):
         btn = [self.btnA, self.btnB, self.btnC, self.btnD][idx]
-        original = NEUTRAL
-        def seq(step=0):
-            btn.set_bg(color if step % 2 == 0 else original)
-            if step < 5:
-                QTimer.singleShot(160, lambda: seq(step+1))
-            else:
-                btn.set_bg(original)
-        seq(0)
+        start = time.monotonic()
+        def step(now: float) -> bool:
+            k = int((now - start) / FLASH_STEP)
+            if k > 5:
+                btn.set_state("neutral")
+                return False
+            btn.set_state(state if k % 2 == 0 else "neutral")  # no-op unless it changed
+            return True
+        step(start)
+        self.animations.animate((btn, "flash"), step)
+
+    def _shake(self, widget: QWidget, layout, amplitude: int = 10, duration: float = 0.4):
+        """Damped horizontal shake around the position ``layout`` gives it."""
+        start = time.monotonic()
+        def step(now: float) -> bool:
+            item = layout.itemAt(layout.indexOf(widget))
+            home = item.geometry().topLeft() if item is not None else widget.pos()
+            t = (now - start) / duration
+            if t >= 1:
+                widget.move(home)
+                return False
+            widget.move(home.x() + int(amplitude * (1 - t) * math.sin(t * 6 * math.pi)), home.y())
+            return True
+        self.animations.animate((widget, "shake"), step)
+
+    def _glow(self, btn: "GlowButton", color: QColor, duration: float = 1.0):
+        """Two soft pulses of a coloured halo around ``btn``."""
+        start = time.monotonic()
+        def step(now: float) -> bool:
+            t = (now - start) / duration
+            if t >= 1:
+                btn.set_glow(0.0)
+                return False
+            btn.set_glow(abs(math.sin(t * 2 * math.pi)), color)
+            return True
+        self.animations.animate((btn, "glow"), step)
 
     def _confetti(self):
         self.confetti.setGeometry(self.rect())
         self.confetti.start(50)
 
     def _play_correct(self):
-        if MULTIMEDIA_AVAILABLE and self.sfx_correct:
-            self.sfx_correct.play()
+        if self.audio:
+            self.audio.play("correct")
 
     def _play_wrong(self):
-        if MULTIMEDIA_AVAILABLE and self.sfx_wrong:
-            self.sfx_wrong.play()
+        if self.audio:
+            self.audio.play("wrong")
 
     # -------------- Theming --------------
     def _palette(self):
@@ -577,23 +1548,256 @@ class KBCWindow(QMainWindow):
     def resizeEvent(self, e):
         super().resizeEvent(e)
         self.confetti.setGeometry(self.rect())
-        # responsive font scaling
-        w = self.width()
-        h = self.height()
-        scale = max(0.8, min(1.6, (w*h)/(1100*720)))
-        qf = self.question_label.font()
-        qf.setPointSize(int(BASE_FONT_SIZE*1.2*scale))
-        self.question_label.setFont(qf)
-        for b in [self.btnA, self.btnB, self.btnC, self.btnD, self.life_5050, self.life_assist, self.life_extra]:
-            f = b.font()
-            f.setPointSize(int(BASE_FONT_SIZE*scale))
-            b.setFont(f)
+        if self.attract is not None:
+            self.attract.setGeometry(self.rect())
+        if self._font_scale is None:
+            self._apply_font_scale()  # first show: no stale frame
+        elif not self._relayout_timer.isActive():
+            self._relayout_timer.start()
+
+    def _scale_bucket(self) -> float:
+        scale = max(0.8, min(1.6, (self.width()*self.height())/(1100*720)))
+        return round(round(scale / SCALE_STEP) * SCALE_STEP, 2)
+
+    def _font(self, role: str, pt: int) -> QFont:
+        key = (role, pt)
+        font = self._font_cache.get(key)
+        if font is None:
+            font = QFont(self.question_label.font() if role == "question" else self.btnA.font())
+            font.setPointSize(pt)
+            self._font_cache[key] = font
+        return font
+
+    def _font_key(self, role: str) -> str:
+        # Family and weight after the stylesheet is applied; keys fit_point_size
+        desc = self._font_desc.get(role)
+        if desc is None:
+            widget = self.question_label if role == "question" else self.btnA
+            widget.ensurePolished()
+            font = QFont(widget.font())
+            font.setPointSize(BASE_FONT_SIZE)
+            desc = self._font_desc[role] = font.toString()
+        return desc
+
+    def _prepare(self, idx: int) -> PreparedQuestion:
+        """Fetch question ``idx`` and fit its texts to the current layout:
+        the question may shrink below its bucket size to stay within
+        QUESTION_HEIGHT, options to stay on one line."""
+        qa = self.engine.question_at(idx)
+        question = f"Q{idx+1}. {qa.q}"
+        options = [f"{letter}) {text}" for letter, text in zip("ABCD", qa.options)]
+        scale = self._scale_bucket()
+        q_pt = fit_point_size(question, self._font_key("question"), int(BASE_FONT_SIZE*1.2*scale),
+                              self.question_label.contentsRect().width(),
+                              int(self.height() * QUESTION_HEIGHT), True)
+        width, height = self.btnA.width() - BUTTON_INSET[0], self.btnA.height() - BUTTON_INSET[1]
+        desc, max_pt = self._font_key("button"), int(BASE_FONT_SIZE*scale)
+        o_pt = min(fit_point_size(text, desc, max_pt, width, height, False) for text in options)
+        return PreparedQuestion(idx, qa, question, options, self._font("question", q_pt),
+                                self._font("button", o_pt), self.size())
+
+    def _apply_fonts(self, prepared: PreparedQuestion) -> bool:
+        changed = False
+        targets = [(self.question_label, prepared.question_font)]
+        targets += [(b, prepared.option_font) for b in (self.btnA, self.btnB, self.btnC, self.btnD)]
+        for widget, font in targets:
+            if widget.font().pointSize() != font.pointSize():
+                widget.setFont(font)
+                changed = True
+        return changed
+
+    @traced
+    def _apply_font_scale(self):
+        # responsive fonts: SCALE_STEP buckets cap the size, text-fit shrinks long texts
+        self._font_scale = self._scale_bucket()
+        self._prepared = None  # fitted for the old size
+        changed = self._apply_fonts(self._prepare(self.engine.current_index))
+        lifelines = (self.life_5050, self.life_assist, self.life_audience, self.life_extra)
+        desc, max_pt = self._font_key("button"), int(BASE_FONT_SIZE*self._font_scale)
+        lf = self._font("button", min(fit_point_size(b.text(), desc, max_pt, b.width() - BUTTON_INSET[0],
+                                                     b.height() - BUTTON_INSET[1], False) for b in lifelines))
+        for b in lifelines:
+            if b.font().pointSize() != lf.pointSize():
+                b.setFont(lf)
+                changed = True
+        if changed:
+            self.relayout_count += 1
+
+# ----------------------------- Kiosk soak test -----------------------------
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:  # not Linux: peak RSS is the best we get
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+def soak(app: QApplication, win: KBCWindow, games: int, seed: int = 1) -> Tuple[str, bool]:
+    """Play ``games`` kiosk games back to back as fast as the UI allows and
+    track memory, live Qt objects and the in-place reset time per game.
+    Returns the report and whether anything kept growing."""
+    import gc
+    from simulate import DEFAULT_ACCURACY
+    rng = random.Random(seed)
+    engine = win.engine
+    buttons = [win.btnA, win.btnB, win.btnC, win.btnD]
+    resets: List[float] = []
+    samples = []  # (games, rss MB, QObjects under the window, widgets, Python objects)
+    every = max(1, games // 20)
+    ended = win.games_played
+    t_start = time.perf_counter()
+    for g in range(games):
+        t0 = time.perf_counter()
+        win.new_game()
+        resets.append((time.perf_counter() - t0) * 1000)
+        while not engine.finished:
+            if engine.lifelines["5050"] and rng.random() < 0.1:
+                win.use_5050()
+            if engine.lifelines["assist"] and rng.random() < 0.1:
+                win.use_assist()
+            if engine.lifelines["audience"] and rng.random() < 0.1:
+                win.use_audience()
+            qa = engine.question
+            if rng.random() < DEFAULT_ACCURACY[qa.difficulty]:
+                pick = qa.answer_idx
+            else:
+                pick = rng.choice([i for i in range(4) if buttons[i].isEnabled()])
+            win.select_option(pick)
+            win.animations.finish()
+            if win._next_timer.isActive():  # skip the reveal delay
+                win._next_timer.stop()
+                win._next()
+        app.processEvents()
+        if g % every == 0 or g == games - 1:
+            gc.collect()
+            app.processEvents()
+            samples.append((g + 1, _rss_mb(), len(win.findChildren(QObject)), len(QApplication.allWidgets()),
+                            len(gc.get_objects())))
+    wall = time.perf_counter() - t_start
+
+    resets.sort()
+    pick = lambda q: resets[min(len(resets) - 1, int(len(resets) * q))]
+    ended = win.games_played - ended  # one game over per game, or stale timers are ending games
+    lines = [f"{games:,} kiosk games in {wall:.1f} s ({games / wall:.1f} games/s), {ended:,} game overs",
+             f"  reset   p50 {pick(0.5):.2f} ms  p99 {pick(0.99):.2f} ms  max {resets[-1]:.2f} ms",
+             f"  {'games':>8}{'RSS MB':>9}{'QObjects':>10}{'widgets':>9}{'py objects':>12}"]
+    lines += [f"  {n:>8,}{rss:>9.1f}{objs:>10,}{widgets:>9,}{py:>12,}" for n, rss, objs, widgets, py in samples]
+    # The first sample is taken after game one warms every cache; judge growth from the second on.
+    base = samples[min(1, len(samples) - 1)]
+    last = samples[-1]
+    growth = {"QObjects": last[2] - base[2], "widgets": last[3] - base[3],
+              "RSS MB": last[1] - base[1], "py objects": last[4] - base[4]}
+    leaked = ended != games or growth["QObjects"] > 0 or growth["widgets"] > 0 or growth["RSS MB"] > 20 \
+        or growth["py objects"] > 0.05 * base[4]
+    lines.append("  growth since game {:,}: ".format(base[0]) +
+                 ", ".join(f"{k} {v:+,.1f}" if k == "RSS MB" else f"{k} {v:+,}" for k, v in growth.items()) +
+                 ("  <- LEAK?" if leaked else "  (flat)"))
+    return "\n".join(lines), leaked
 
 # ----------------------------- App Entry -----------------------------
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="KBC — Tollywood Edition")
+    parser.add_argument("--bank", metavar="PATH", help="question bank file (see bank.py); default: built-in questions")
+    parser.add_argument("--profile-startup", nargs="?", const="-", metavar="FILE",
+                        help="print a time-to-first-paint breakdown (to FILE if given) and exit")
+    parser.add_argument("--host", nargs="?", const="", metavar="ADDR:PORT",
+                        help="host mode: accept audience answers over the LAN (see host.py)")
+    parser.add_argument("--journal", metavar="PATH",
+                        help="session journal used to resume after a crash (default: in the app data folder)")
+    parser.add_argument("--no-journal", action="store_true", help="do not record or resume sessions")
+    parser.add_argument("--player", default="guest",
+                        help="player name; questions this player has seen are not asked again (see scheduler.py)")
+    parser.add_argument("--seed", type=int, help="make each game's question draw reproducible")
+    parser.add_argument("--fixed-order", action="store_true", help="play the bank in order, as before")
+    parser.add_argument("--leaderboard", metavar="PATH",
+                        help="leaderboard shared by the kiosks on this machine (default: in the app data folder)")
+    parser.add_argument("--no-leaderboard", action="store_true", help="do not record or show scores")
+    parser.add_argument("--assist-index", metavar="DIR",
+                        help="fact index Computer Assist searches, built from assets/facts.txt when missing "
+                             "or stale (default: in the app data folder; see assist.py)")
+    parser.add_argument("--canned-assist", action="store_true",
+                        help="Computer Assist guesses from the difficulty alone, as before")
+    parser.add_argument("--polls", metavar="NPY",
+                        help="precomputed Ask-the-Audience polls for the bank (python audience.py batch)")
+    parser.add_argument("--audience-answers", metavar="JSON",
+                        help="analytics.py checkpoint; live polls lean towards the answers players really gave")
+    parser.add_argument("--kiosk", action="store_true",
+                        help="full screen; game over returns to an attract screen and the next game starts in place")
+    parser.add_argument("--soak", type=int, metavar="GAMES",
+                        help="headless kiosk soak test: play GAMES games back to back, report RSS, "
+                             "Qt object counts and reset latency, then exit (1 if anything grew)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="record timers, paints, layout and slots; write Chrome trace JSON to FILE "
+                             "on exit or on Ctrl+Shift+T (see tracing.py)")
+    args, qt_args = parser.parse_known_args()
+    if args.soak:
+        # Headless, with throwaway journal, leaderboard and player history
+        import tempfile
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        soak_dir = tempfile.mkdtemp(prefix="kbc-soak-")
+        args.kiosk = True
+        args.journal = args.journal or os.path.join(soak_dir, "session.kbcj")
+        args.leaderboard = args.leaderboard or os.path.join(soak_dir, "leaderboard.db")
+
+    if args.trace:
+        TRACER = Tracer()
+        app = TracingApplication(sys.argv[:1] + qt_args, TRACER)
+    else:
+        app = QApplication(sys.argv[:1] + qt_args)
     app.setApplicationName("KBC Tollywood Quiz")
+    STARTUP.mark("QApplication")
 
-    win = KBCWindow()
-    win.show()
+    data_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppLocalDataLocation)
+    if args.soak:
+        data_dir = soak_dir
+    journal_path = None
+    if not args.no_journal:
+        journal_path = args.journal or os.path.join(data_dir, "session.kbcj")
+    bank = open_bank(args.bank)
+    scheduler = None
+    if not args.fixed_order:
+        scheduler = Scheduler(bank, args.player, PlayerStore(os.path.join(data_dir, "players.db")), args.seed)
+    leaderboard = None
+    if not args.no_leaderboard:
+        leaderboard = Leaderboard(args.leaderboard or os.path.join(data_dir, "leaderboard.db"), connect_now=False)
+    assist_index = None
+    if not args.canned_assist:
+        assist_index = args.assist_index or os.path.join(data_dir, "assist-index")
+    audience = None
+    if args.polls or args.audience_answers:
+        from audience import Audience, load_answers, load_polls
+        try:
+            polls = load_polls(args.polls, bank) if args.polls else None
+        except ValueError as e:
+            sys.exit(str(e))
+        audience = Audience(answers=load_answers(args.audience_answers) if args.audience_answers else None,
+                            polls=polls)
+    win = KBCWindow(bank, host=args.host, journal_path=journal_path, scheduler=scheduler,
+                    leaderboard=leaderboard, player=args.player, kiosk=args.kiosk, media=not args.soak,
+                    assist_index=assist_index, audience=audience, profile=STARTUP)
+    if args.soak:
+        win.show()
+        app.processEvents()
+        report, leaked = soak(app, win, args.soak, args.seed or 1)
+        print(report)
+        win.close()
+        sys.exit(1 if leaked else 0)
+    if args.profile_startup:
+        def _dump_profile():
+            text = win.startup.report()
+            if args.profile_startup == "-":
+                print(text)
+            else:
+                with open(args.profile_startup, "w", encoding="utf-8") as f:
+                    f.write(text + "\n")
+            app.quit()
+        win.media_loaded.connect(_dump_profile)
+    if args.trace:
+        QShortcut(QKeySequence("Ctrl+Shift+T"), win, activated=lambda: TRACER.dump(args.trace))
+        app.aboutToQuit.connect(lambda: TRACER.dump(args.trace))
+    if args.kiosk:
+        win.showFullScreen()
+    else:
+        win.show()
     sys.exit(app.exec())
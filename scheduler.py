@@ -0,0 +1,234 @@
+# Question scheduling for KBC Tollywood Quiz (no Qt imports).
+#
+# Each game draws its questions rung by rung from the difficulty pool that
+# matches the rung, never repeating a question the player has already been
+# shown. A rung whose pool is used up borrows from the nearest other pool,
+# so easy rungs can get medium or hard questions (and the reverse) once a
+# player has seen every question of their own difficulty. Draws are random
+# picks from the pool (bank.nth), rejected if seen, so cost does not depend
+# on the bank size. A player's history is one bit per question,
+# zlib-compressed into a row of an SQLite file between games.
+#
+#   python scheduler.py bench --bank questions.db --players 20000 --games 3
+
+from __future__ import annotations
+import os, time, zlib, random, sqlite3, argparse
+from typing import Dict, List, Optional, Tuple
+
+from bank import DIFFICULTIES, QA, QuestionBank, open_bank
+
+# Share of the ladder played at each difficulty, as in the built-in game
+# (8 easy, 7 medium, 5 hard out of 20 rungs)
+RUNG_SHARES = (("easy", 0.40), ("medium", 0.75), ("hard", 1.0))
+SAMPLE_TRIES = 32  # random picks before walking the pool for an unseen question
+
+def rung_difficulty(rung: int, rungs: int) -> str:
+    frac = rung / max(1, rungs)
+    for difficulty, upto in RUNG_SHARES:
+        if frac < upto:
+            return difficulty
+    return RUNG_SHARES[-1][0]
+
+def fallback_order(difficulty: str) -> List[str]:
+    """The rung's own pool, then the others from nearest to farthest."""
+    i = DIFFICULTIES.index(difficulty)
+    return sorted(DIFFICULTIES, key=lambda d: (abs(DIFFICULTIES.index(d) - i), DIFFICULTIES.index(d)))
+
+def bank_fingerprint(bank: QuestionBank) -> str:
+    return f"{len(bank)}:" + ",".join(str(bank.count(d)) for d in DIFFICULTIES)
+
+# ----------------------------- Seen sets -----------------------------
+class SeenSet:
+    """One bit per question id, plus a count per difficulty pool."""
+
+    def __init__(self, size: int, bits: Optional[bytes] = None, counts: Optional[List[int]] = None):
+        self.size = size
+        self.bits = bytearray(bits) if bits is not None else bytearray((size + 7) // 8)
+        self.counts = list(counts) if counts is not None else [0] * len(DIFFICULTIES)
+
+    def __contains__(self, qid: int) -> bool:
+        return bool(self.bits[qid >> 3] >> (qid & 7) & 1)
+
+    def add(self, qa: QA) -> bool:
+        byte, bit = qa.qid >> 3, 1 << (qa.qid & 7)
+        if self.bits[byte] & bit:
+            return False
+        self.bits[byte] |= bit
+        self.counts[DIFFICULTIES.index(qa.difficulty)] += 1
+        return True
+
+    def clear(self):
+        self.bits = bytearray(len(self.bits))
+        self.counts = [0] * len(DIFFICULTIES)
+
+    def __len__(self) -> int:
+        return sum(self.counts)
+
+    def pack(self) -> bytes:
+        # Histories are sparse, so the bitmap compresses to a few hundred bytes
+        header = ",".join(map(str, self.counts)).encode() + b";"
+        return zlib.compress(header + bytes(self.bits), 6)
+
+    @classmethod
+    def unpack(cls, size: int, blob: bytes) -> "SeenSet":
+        header, _, bits = zlib.decompress(blob).partition(b";")
+        return cls(size, bits, [int(c) for c in header.split(b",")])
+
+# ----------------------------- Storage -----------------------------
+PLAYER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    bank TEXT NOT NULL,      -- bank_fingerprint(); history resets if the bank changes
+    games INTEGER NOT NULL,
+    seen BLOB NOT NULL,
+    updated INTEGER NOT NULL
+);
+"""
+
+class PlayerStore:
+    """Per-player history in one SQLite file; one small row per player."""
+
+    def __init__(self, path: str):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(PLAYER_SCHEMA)
+
+    def load(self, name: str, bank: QuestionBank) -> Tuple[int, SeenSet]:
+        row = self.conn.execute("SELECT bank, games, seen FROM players WHERE name = ?", (name,)).fetchone()
+        if row is None or row[0] != bank_fingerprint(bank):
+            return 0, SeenSet(len(bank))
+        return row[1], SeenSet.unpack(len(bank), row[2])
+
+    def save(self, name: str, bank: QuestionBank, games: int, seen: SeenSet):
+        self.conn.execute("INSERT OR REPLACE INTO players VALUES (?, ?, ?, ?, ?)",
+                          (name, bank_fingerprint(bank), games, seen.pack(), int(time.time())))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+# ----------------------------- Scheduler -----------------------------
+class Scheduler:
+    """Draws a game's questions for one player. With a ``seed`` the draws of
+    the player's n-th game are reproducible."""
+
+    def __init__(self, bank: QuestionBank, player: str = "", store: Optional[PlayerStore] = None,
+                 seed: Optional[int] = None):
+        self.bank = bank
+        self.player = player
+        self.store = store
+        self.seed = seed
+        self.games, self.seen = store.load(player, bank) if store else (0, SeenSet(len(bank)))
+        self.rng = random.Random()
+        self._drawn: set = set()      # drawn this game but maybe not shown yet
+        self._shown: Dict[int, QA] = {}  # shown this game, by qid
+        self._started = False
+        self.tries = 0                # random picks so far, for benchmarks
+
+    def new_game(self):
+        # A game in which nothing was shown (the engine's reset at startup,
+        # or one replaced before its first question) keeps its number, so
+        # seeded draws stay reproducible
+        if self._shown or not self._started:
+            self.games += 1
+        self._started = True
+        if self.seed is not None:
+            self.rng.seed(f"{self.seed}:{self.player}:{self.games}")
+        self._drawn.clear()
+        self._shown.clear()
+
+    def draw(self, rung: int, rungs: int) -> QA:
+        """A question for ``rung`` the player has not seen. Borrows from the
+        nearest other pool when the rung's pool is used up; only when every
+        pool is, the history is forgotten and repeats begin (never of a
+        question already in this game)."""
+        for difficulty in fallback_order(rung_difficulty(rung, rungs)):
+            qa = self._sample(difficulty)
+            if qa is not None:
+                return qa
+        self.seen.clear()
+        for qa in self._shown.values():
+            self.seen.add(qa)
+        for difficulty in fallback_order(rung_difficulty(rung, rungs)):
+            qa = self._sample(difficulty)
+            if qa is not None:
+                return qa
+        raise ValueError("question bank is empty")
+
+    def _sample(self, difficulty: str) -> Optional[QA]:
+        n = self.bank.count(difficulty)
+        drawn = sum(1 for d, _ in self._drawn if d == difficulty)
+        if self.seen.counts[DIFFICULTIES.index(difficulty)] + drawn >= n:
+            return None  # nothing unseen left in this pool
+        seen, rng = self.seen, self.rng
+        for _ in range(SAMPLE_TRIES):
+            self.tries += 1
+            qa = self.bank.nth(difficulty, rng.randrange(n))
+            if qa.qid not in seen and (difficulty, qa.qid) not in self._drawn:
+                return self._take(qa)
+        # Almost everything seen: walk the pool once from a random start
+        start = rng.randrange(n)
+        for k in range(n):
+            qa = self.bank.nth(difficulty, (start + k) % n)
+            if qa.qid not in seen and (difficulty, qa.qid) not in self._drawn:
+                return self._take(qa)
+        return None
+
+    def _take(self, qa: QA) -> QA:
+        self._drawn.add((qa.difficulty, qa.qid))
+        return qa
+
+    def mark(self, qa: QA):
+        """Record that the player was shown ``qa``."""
+        if 0 <= qa.qid < self.seen.size:
+            self.seen.add(qa)
+            self._shown[qa.qid] = qa
+            self._drawn.discard((qa.difficulty, qa.qid))  # now counted as seen
+
+    def save(self):
+        if self.store is not None:
+            self.store.save(self.player, self.bank, self.games, self.seen)
+
+# ----------------------------- Benchmark -----------------------------
+def bench(bank: QuestionBank, path: str, players: int, games: int, rungs: int, seed: int) -> str:
+    if os.path.exists(path):
+        os.remove(path)
+    store = PlayerStore(path)
+    t_draw = t_io = 0.0
+    draws = tries = 0
+    for p in range(players):
+        t0 = time.perf_counter()
+        sched = Scheduler(bank, f"player{p}", store, seed)
+        t1 = time.perf_counter()
+        for _ in range(games):
+            sched.new_game()
+            shown = [sched.draw(r, rungs) for r in range(rungs)]
+            for qa in shown:
+                sched.mark(qa)
+            draws += rungs
+        t2 = time.perf_counter()
+        sched.save()
+        t_io += (t1 - t0) + (time.perf_counter() - t2)
+        t_draw += t2 - t1
+        tries += sched.tries
+    store.close()
+    size = os.path.getsize(path)
+    return (f"{players:,} players x {games} games x {rungs} rungs on a {len(bank):,}-question bank\n"
+            f"  draw   {t_draw / draws * 1e6:8.1f} us/question ({tries / draws:.2f} picks each)\n"
+            f"  store  {t_io / players * 1e3:8.2f} ms/player load+save, {size / players:,.0f} bytes/player on disk")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="No-repeat question scheduler")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("bench", help="time draws and history storage")
+    b.add_argument("--bank", metavar="PATH", help="question bank (default: built-in)")
+    b.add_argument("--players", type=int, default=1000)
+    b.add_argument("--games", type=int, default=3)
+    b.add_argument("--rungs", type=int, default=20)
+    b.add_argument("--seed", type=int, default=1)
+    b.add_argument("--store", default="bench-players.db", help="player history file to create")
+    args = parser.parse_args()
+    print(bench(open_bank(args.bank), args.store, args.players, args.games, args.rungs, args.seed))
@@ -0,0 +1,140 @@
+# Monte Carlo simulator for KBC Tollywood Quiz ladder economics.
+#
+# Plays many games headlessly on the GameEngine with a pluggable player
+# strategy, spread over a process pool, and reports the payout
+# distribution and throughput.
+#
+#   python simulate.py --games 1000000 --strategy skill --workers 8
+#   python simulate.py --strategy mymodule:MyPlayer --bank questions.db
+#
+# A strategy is any class with ``play_turn(engine, rng) -> int`` that may use
+# the engine's lifelines and returns the option to answer.
+
+from __future__ import annotations
+import os, time, random, argparse, importlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+from bank import open_bank
+from engine import GameEngine
+
+DEFAULT_ACCURACY = {"easy": 0.85, "medium": 0.6, "hard": 0.35}
+
+# ----------------------------- Strategies -----------------------------
+class RandomPlayer:
+    """Guesses among the open options and never uses a lifeline."""
+    def __init__(self, accuracy: Optional[Dict[str, float]] = None):
+        pass
+
+    def play_turn(self, engine: GameEngine, rng: random.Random) -> int:
+        return rng.choice([i for i in range(4) if engine.is_open(i)])
+
+class SkillPlayer:
+    """Knows the answer with a per-difficulty probability; otherwise spends
+    lifelines (50-50 first, then Computer Assist) and guesses."""
+    def __init__(self, accuracy: Optional[Dict[str, float]] = None):
+        self.accuracy = accuracy or DEFAULT_ACCURACY
+
+    def play_turn(self, engine: GameEngine, rng: random.Random) -> int:
+        qa = engine.question
+        if rng.random() < self.accuracy[qa.difficulty]:
+            return qa.answer_idx
+        engine.use_5050()
+        hint = engine.use_assist()
+        if hint is not None and engine.is_open(hint[0]):
+            return hint[0]
+        return rng.choice([i for i in range(4) if engine.is_open(i)])
+
+class CautiousPlayer(SkillPlayer):
+    """Like SkillPlayer, but holds lifelines back for medium and hard questions."""
+    def play_turn(self, engine: GameEngine, rng: random.Random) -> int:
+        qa = engine.question
+        if rng.random() < self.accuracy[qa.difficulty]:
+            return qa.answer_idx
+        if qa.difficulty != "easy":
+            return super().play_turn(engine, rng)
+        return rng.choice([i for i in range(4) if engine.is_open(i)])
+
+STRATEGIES = {"random": RandomPlayer, "skill": SkillPlayer, "cautious": CautiousPlayer}
+
+def load_strategy(name: str):
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    module, _, attr = name.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+# ----------------------------- Simulation -----------------------------
+def play_game(engine: GameEngine, player, rng: random.Random) -> int:
+    engine.reset()
+    while True:
+        choice = player.play_turn(engine, rng)
+        result = engine.answer(choice)
+        if result is None:
+            raise ValueError(f"{type(player).__name__} chose option {choice!r} on question "
+                             f"{engine.current_index + 1}; open options are {[i for i in range(4) if engine.is_open(i)]}")
+        if result.game_over or not engine.advance():
+            return engine.total_amount
+
+def run_chunk(args) -> Counter:
+    games, seed, strategy, accuracy, bank_path = args
+    rng = random.Random(seed)
+    engine = GameEngine(open_bank(bank_path), rng)
+    player = load_strategy(strategy)(accuracy)
+    payouts = Counter()
+    for _ in range(games):
+        payouts[play_game(engine, player, rng)] += 1
+    return payouts
+
+def simulate(games: int, strategy: str = "skill", accuracy: Optional[Dict[str, float]] = None,
+             workers: Optional[int] = None, seed: int = 0, bank_path: Optional[str] = None,
+             chunk: int = 50_000) -> Counter:
+    """Play ``games`` games and return a Counter of payout -> games."""
+    jobs = []
+    for i, start in enumerate(range(0, games, chunk)):
+        jobs.append((min(chunk, games - start), seed * 1_000_003 + i, strategy, accuracy, bank_path))
+    payouts = Counter()
+    if workers == 1:
+        for job in jobs:
+            payouts.update(run_chunk(job))
+        return payouts
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(run_chunk, jobs):
+            payouts.update(part)
+    return payouts
+
+def report(payouts: Counter, elapsed: float) -> str:
+    games = sum(payouts.values())
+    mean = sum(p * n for p, n in payouts.items()) / games
+    lines = [f"games: {games:,}   {games / elapsed:,.0f} games/s   mean payout: ₹{mean:,.0f}"]
+    running = 0
+    marks = iter((0.5, 0.9, 0.99))
+    mark = next(marks)
+    for amount in sorted(payouts):
+        running += payouts[amount]
+        while mark is not None and running >= mark * games:
+            lines.append(f"p{int(mark * 100)}: ₹{amount:,}")
+            mark = next(marks, None)
+    lines.append("payout distribution:")
+    for amount in sorted(payouts):
+        share = payouts[amount] / games
+        lines.append(f"  ₹{amount:>13,}  {share:8.4%}  {'#' * int(share * 50)}")
+    return "\n".join(lines)
+
+def parse_accuracy(text: str) -> Dict[str, float]:
+    easy, medium, hard = (float(x) for x in text.split(","))
+    return {"easy": easy, "medium": medium, "hard": hard}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte Carlo simulator for the prize ladder")
+    parser.add_argument("--games", type=int, default=1_000_000)
+    parser.add_argument("--strategy", default="skill", help=f"one of {', '.join(STRATEGIES)} or module:Class")
+    parser.add_argument("--accuracy", type=parse_accuracy, help="easy,medium,hard probabilities, e.g. 0.85,0.6,0.35")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bank", metavar="PATH", help="question bank file (see bank.py)")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    result = simulate(args.games, args.strategy, args.accuracy, args.workers, args.seed, args.bank)
+    print(report(result, time.perf_counter() - t0))
@@ -0,0 +1,171 @@
+# Optimal-strategy solver for KBC Tollywood Quiz prize ladders (needs NumPy).
+#
+# Backward induction over (question index, 50-50 left, Computer Assist
+# left, Extra Life armed, question skipped by the Extra Life). The money
+# rules match GameEngine: a right answer adds the rung's prize, safe levels
+# lock in the running total, a forgiven wrong answer moves on without
+# adding the prize, and an unprotected wrong answer pays the safe amount.
+#
+# Every quantity carries a leading batch axis, so thousands of candidate
+# ladders and accuracy profiles are solved together in one call:
+#
+#   python solver.py                         # default ladder, policy table
+#   python solver.py --batch 10000           # timing for 10k random ladders
+#
+# Player model: with probability p (per difficulty) the player knows the
+# answer; otherwise they guess among 4 options, among 2 after 50-50, or
+# follow Computer Assist, which is right with probability c. With both
+# lifelines a wrong assist still leaves a coin flip: c + (1-c)/2. GameEngine's
+# canned assist always suggests the right option (it only reports a
+# confidence), so c defaults to 1; pass --assist-accuracy to model a fallible
+# assistant such as the fact index of assist.py.
+
+from __future__ import annotations
+import time, argparse
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from bank import DIFFICULTIES, QUESTIONS
+from engine import PRICE_LADDER, SAFE_LEVELS
+from simulate import DEFAULT_ACCURACY, parse_accuracy
+
+ACTIONS = ("answer", "answer+5050", "answer+assist", "answer+both", "walk")
+WALK = 4
+CANNED_ASSIST_ACCURACY = {d: 1.0 for d in DIFFICULTIES}  # GameEngine.use_assist without an assistant
+
+ArrayLike = Union[Sequence, np.ndarray]
+
+@dataclass
+class Solution:
+    value: np.ndarray   # (B,) expected payout from the first question
+    policy: np.ndarray  # (N, 2, 2, 2, B) best action index per (i, 5050, assist, extra) before any skip
+
+    def path(self, b: int = 0) -> list:
+        """Best action per question for scenario ``b`` while the player keeps
+        answering correctly and has not touched a lifeline yet."""
+        out = []
+        f = a = e = 1
+        for i in range(self.policy.shape[0]):
+            act = int(self.policy[i, f, a, e, b])
+            out.append(ACTIONS[act])
+            if act == WALK:
+                break
+            f -= act in (1, 3)
+            a -= act in (2, 3)
+        return out
+
+def _per_question(values, difficulties: Sequence[str]) -> np.ndarray:
+    """Expand a per-difficulty dict or (B, 3)/(B, N) array to (B, N)."""
+    n = len(difficulties)
+    if isinstance(values, dict):
+        values = [values[d] for d in DIFFICULTIES]
+    arr = np.asarray(values, dtype=np.float64)
+    if arr.shape[-1] == len(DIFFICULTIES) and n != len(DIFFICULTIES):
+        cols = np.array([DIFFICULTIES.index(d) for d in difficulties])
+        arr = arr[..., cols]
+    return np.atleast_2d(arr)
+
+def solve(ladders: ArrayLike = PRICE_LADDER,
+          accuracy: Union[Dict[str, float], ArrayLike] = DEFAULT_ACCURACY,
+          safe_levels: Union[Iterable[int], ArrayLike] = SAFE_LEVELS,
+          difficulties: Optional[Sequence[str]] = None,
+          assist_accuracy: Union[Dict[str, float], ArrayLike] = CANNED_ASSIST_ACCURACY,
+          allow_walk: bool = True, use_lifelines: bool = True, extra_life: bool = True) -> Solution:
+    """Solve a batch of scenarios.
+
+    ``ladders`` is (N,) or (B, N). ``accuracy`` and ``assist_accuracy`` are
+    dicts by difficulty or arrays shaped (B, 3) in DIFFICULTIES order or
+    (B, N) per question. ``safe_levels`` is a set of indices or a (B, N)
+    boolean mask. ``difficulties`` names each rung's pool and defaults to
+    the built-in question order.
+    """
+    ladders = np.atleast_2d(np.asarray(ladders, dtype=np.float64))
+    n = ladders.shape[1]
+    if difficulties is None:
+        difficulties = [qa.difficulty for qa in QUESTIONS[:n]]
+        difficulties += [DIFFICULTIES[-1]] * (n - len(difficulties))
+    if isinstance(safe_levels, (set, frozenset)) or not np.ndim(safe_levels):
+        mask = np.zeros(n, dtype=bool)
+        mask[[s for s in safe_levels if s < n]] = True
+        safe = mask[None, :]
+    else:
+        safe = np.atleast_2d(np.asarray(safe_levels, dtype=bool))
+    know = _per_question(accuracy, difficulties)
+    conf = _per_question(assist_accuracy, difficulties)
+    b = np.broadcast_shapes(ladders.shape[:1], safe.shape[:1], know.shape[:1], conf.shape[:1])[0]
+    ladders, safe = np.broadcast_to(ladders, (b, n)), np.broadcast_to(safe, (b, n))
+    know, conf = np.broadcast_to(know, (b, n)), np.broadcast_to(conf, (b, n))
+
+    # Running total T and safe amount S on entering question i, for every
+    # skip position j (j == n: nothing skipped yet). Shapes (n+1, B, n+1).
+    j_is_i = np.eye(n, n + 1, dtype=bool)
+    T = np.zeros((n + 1, b, n + 1))
+    S = np.zeros((n + 1, b, n + 1))
+    for i in range(n):
+        gain = np.where(j_is_i[i], 0.0, ladders[:, i:i+1])
+        T[i+1] = T[i] + gain
+        S[i+1] = np.where(safe[:, i:i+1] & ~j_is_i[i], T[i+1], S[i])
+
+    # Extra Life still armed implies nothing was skipped, so those states
+    # only need the j == n column; spent-extra states need every j.
+    combos = [(0, 0), (1, 0), (0, 1), (1, 1)] if use_lifelines else [(0, 0)]
+    policy = np.full((n, 2, 2, 2, b), WALK, dtype=np.int8)
+    nxt = {(f, a, e): T[n][:, n:] if e else T[n] for f in (0, 1) for a in (0, 1) for e in (0, 1)}
+    for i in reversed(range(n)):
+        p, c = know[:, i:i+1], conf[:, i:i+1]
+        guess = 1 - p
+        acc = {(0, 0): p + guess / 4, (1, 0): p + guess / 2,
+               (0, 1): p + guess * c, (1, 1): p + guess * (c + (1 - c) / 2)}
+        cur = {}
+        for e in (0, 1):
+            walk = T[i][:, n:] if e else T[i]
+            for f in (0, 1):
+                for a in (0, 1):
+                    best = walk if allow_walk else np.full(walk.shape, -np.inf)
+                    act = np.full(walk.shape, WALK, dtype=np.int8)
+                    for uf, ua in combos:
+                        if uf > f or ua > a:
+                            continue
+                        nf, na = f - uf, a - ua
+                        win = nxt[(nf, na, e)]
+                        lose = nxt[(nf, na, 0)][:, i:i+1] if e else S[i]
+                        q = lose + acc[(uf, ua)] * (win - lose)
+                        better = q > best
+                        best = np.where(better, q, best)
+                        act = np.where(better, np.int8(uf + 2 * ua), act)
+                    cur[(f, a, e)] = best
+                    policy[i, f, a, e] = act[:, -1]
+        nxt = cur
+    start = nxt[(1, 1, int(extra_life))] if use_lifelines else nxt[(0, 0, int(extra_life))]
+    return Solution(start[:, -1], policy)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Expected payout of answer / walk-away / lifeline policies")
+    parser.add_argument("--accuracy", type=parse_accuracy, default=DEFAULT_ACCURACY,
+                        help="easy,medium,hard probabilities, e.g. 0.85,0.6,0.35")
+    parser.add_argument("--assist-accuracy", type=parse_accuracy, default=CANNED_ASSIST_ACCURACY,
+                        help="easy,medium,hard chance Computer Assist is right (default: always)")
+    parser.add_argument("--batch", type=int, default=0, help="also time a batch of this many random ladders")
+    args = parser.parse_args()
+
+    for label, kw in (("always answer, no lifelines", dict(allow_walk=False, use_lifelines=False)),
+                      ("always answer, best lifeline timing", dict(allow_walk=False)),
+                      ("optimal (walk-away allowed)", {})):
+        sol = solve(accuracy=args.accuracy, assist_accuracy=args.assist_accuracy, **kw)
+        print(f"{label:<38} ₹{sol.value[0]:>14,.0f}")
+    print("optimal plan while answering correctly:")
+    for i, act in enumerate(solve(accuracy=args.accuracy, assist_accuracy=args.assist_accuracy).path()):
+        print(f"  Q{i+1:02d} ₹{PRICE_LADDER[i]:>11,}  {act}")
+
+    if args.batch:
+        rng = np.random.default_rng(0)
+        ladders = np.array(PRICE_LADDER) * rng.uniform(0.5, 1.5, size=(args.batch, len(PRICE_LADDER)))
+        ladders.sort(axis=1)
+        accuracy = rng.uniform(0.2, 0.95, size=(args.batch, len(DIFFICULTIES)))
+        t0 = time.perf_counter()
+        sol = solve(ladders, accuracy, assist_accuracy=args.assist_accuracy)
+        dt = time.perf_counter() - t0
+        print(f"solved {args.batch:,} scenarios in {dt*1000:.0f} ms; "
+              f"mean optimal payout ₹{sol.value.mean():,.0f}")
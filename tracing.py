@@ -0,0 +1,138 @@
+# Low-overhead event tracing for KBC Tollywood Quiz (no Qt imports).
+#
+# A Tracer keeps the last `capacity` events in a fixed ring buffer, so it can
+# stay on for a whole session: recording is a perf_counter_ns() call and one
+# list store. main.py feeds it Qt event dispatch (timers, paints, layout and
+# polish passes, input), named slot calls and timer jitter; the buffer dumps
+# as Chrome trace JSON for chrome://tracing or https://ui.perfetto.dev.
+#
+#   python main.py --trace trace.json        # record, written on exit
+#   python tracing.py trace.json             # summarize a dump
+
+from __future__ import annotations
+import sys, os, json, time, threading
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_CAPACITY = 1 << 17  # events kept; older ones are overwritten
+
+# Event phases, as in the Chrome trace format
+PH_COMPLETE, PH_INSTANT, PH_COUNTER = "X", "i", "C"
+
+class Tracer:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._buf: List[Optional[tuple]] = [None] * capacity
+        self._n = 0  # events recorded so far (ring position = _n % capacity)
+        self._t0 = time.perf_counter_ns()
+        self.pid = os.getpid()
+        # Per-timer jitter: name -> [count, sum_ms, sum_abs_ms, max_abs_ms]
+        self.jitter: Dict[str, List[float]] = {}
+
+    now = staticmethod(time.perf_counter_ns)
+
+    def complete(self, name: str, cat: str, t0: int, t1: int, args: Optional[dict] = None):
+        """Record a span that ran from t0 to t1 (perf_counter_ns)."""
+        self._buf[self._n % self.capacity] = (PH_COMPLETE, name, cat, t0, t1 - t0, args, threading.get_ident())
+        self._n += 1
+
+    def instant(self, name: str, cat: str, args: Optional[dict] = None):
+        self._buf[self._n % self.capacity] = (PH_INSTANT, name, cat, time.perf_counter_ns(), 0, args,
+                                             threading.get_ident())
+        self._n += 1
+
+    def counter(self, name: str, values: dict):
+        self._buf[self._n % self.capacity] = (PH_COUNTER, name, "counter", time.perf_counter_ns(), 0, values,
+                                             threading.get_ident())
+        self._n += 1
+
+    def timer_jitter(self, name: str, late_ms: float):
+        """Record how far a timer fired from its requested time (+ late)."""
+        s = self.jitter.get(name)
+        if s is None:
+            s = self.jitter[name] = [0, 0.0, 0.0, 0.0]
+        s[0] += 1
+        s[1] += late_ms
+        s[2] += abs(late_ms)
+        s[3] = max(s[3], abs(late_ms))
+        self.counter("timer jitter (ms)", {name: round(late_ms, 3)})
+
+    def span(self, name: str, cat: str = "slot") -> "_Span":
+        return _Span(self, name, cat)
+
+    def __len__(self) -> int:
+        return min(self._n, self.capacity)
+
+    @property
+    def dropped(self) -> int:
+        return max(0, self._n - self.capacity)
+
+    def events(self) -> List[tuple]:
+        """Buffered events, oldest first."""
+        if self._n <= self.capacity:
+            return self._buf[:self._n]
+        i = self._n % self.capacity
+        return self._buf[i:] + self._buf[:i]
+
+    # -------------- Export --------------
+    def to_chrome(self) -> dict:
+        out = []
+        for ph, name, cat, t, dur, args, tid in self.events():
+            ev = {"ph": ph, "name": name, "cat": cat, "ts": (t - self._t0) / 1000,
+                  "pid": self.pid, "tid": tid}
+            if ph == PH_COMPLETE:
+                ev["dur"] = dur / 1000
+            elif ph == PH_INSTANT:
+                ev["s"] = "t"
+            if args:
+                ev["args"] = args
+            out.append(ev)
+        meta = {"dropped": self.dropped,
+                "jitter": {k: {"n": int(n), "mean_ms": s / n, "mean_abs_ms": a / n, "max_abs_ms": m}
+                           for k, (n, s, a, m) in self.jitter.items()}}
+        return {"traceEvents": out, "displayTimeUnit": "ms", "otherData": meta}
+
+    def dump(self, path: str):
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_chrome(), f)
+        os.replace(tmp, path)
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "t0")
+
+    def __init__(self, tracer: Tracer, name: str, cat: str):
+        self.tracer, self.name, self.cat = tracer, name, cat
+
+    def __enter__(self):
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.cat, self.t0, time.perf_counter_ns())
+        return False
+
+# ----------------------------- Summary -----------------------------
+def summarize(trace: dict, top: int = 15) -> str:
+    spans: Dict[Tuple[str, str], List[float]] = {}
+    for ev in trace["traceEvents"]:
+        if ev["ph"] == PH_COMPLETE:
+            spans.setdefault((ev["cat"], ev["name"]), []).append(ev["dur"] / 1000)
+    lines = [f"{sum(len(v) for v in spans.values()):,} spans, {trace.get('otherData', {}).get('dropped', 0):,} dropped",
+             f"{'category':<10}{'name':<34}{'n':>7}{'total ms':>11}{'p50':>9}{'max':>9}"]
+    rows = sorted(spans.items(), key=lambda kv: -sum(kv[1]))
+    for (cat, name), durs in rows[:top]:
+        durs.sort()
+        lines.append(f"{cat:<10}{name[:33]:<34}{len(durs):>7}{sum(durs):>11.2f}"
+                     f"{durs[len(durs) // 2]:>9.3f}{durs[-1]:>9.3f}")
+    jitter = trace.get("otherData", {}).get("jitter", {})
+    if jitter:
+        lines.append(f"{'timer':<44}{'n':>7}{'mean late':>11}{'mean |j|':>9}{'max |j|':>9}")
+        for name, j in sorted(jitter.items()):
+            lines.append(f"{name[:43]:<44}{j['n']:>7}{j['mean_ms']:>11.3f}{j['mean_abs_ms']:>9.3f}{j['max_abs_ms']:>9.3f}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python tracing.py TRACE.json")
+    with open(sys.argv[1]) as f:
+        print(summarize(json.load(f)))